@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Memory benchmark of loaded status documents.
+
+Builds a mod and an author status document holding --entries entries each,
+writes them out, and loads each one in a fresh process twice: as the plain
+dicts json.loads() returns, and compacted into the records and shared
+strings of status_model. Per load it records how much the resident set
+size grew and how many bytes Python allocated for the document:
+
+    python benchmarks/bench_memory.py --entries 200000
+    python benchmarks/bench_memory.py --storage sqlite --output memory.json
+
+The resident size is read from /proc where there is one; elsewhere only
+the allocated bytes are reported.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import status_json
+import status_sqlite
+from bench_scale import build_author_document, build_mod_document
+
+RESULTS_VERSION = 1
+MODES = ("dicts", "compact")
+KINDS = {
+    "mod": (build_mod_document, status_sqlite.MOD_DOCUMENT),
+    "author": (build_author_document, status_sqlite.AUTHOR_DOCUMENT),
+}
+
+
+def resident_size():
+    """Return the resident set size of this process in bytes, or None if unknown"""
+    try:
+        with open("/proc/self/statm", 'r', encoding='utf-8') as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def open_storage(storage, path, kind):
+    """Return the storage a document written to path is loaded from"""
+    if storage == "sqlite":
+        return status_sqlite.SqliteStatusStore(f"{os.path.splitext(path)[0]}.sqlite3", KINDS[kind][1], path)
+    return status_json.StatusFile(path)
+
+
+def measure(kind, path, mode, storage, trace):
+    """Load one document and return the memory it took; run in a fresh process"""
+    status_file = open_storage(storage, path, kind)
+    gc.collect()
+    if trace:
+        tracemalloc.start()
+    before = resident_size()
+    data = status_file.load(compact=(mode == "compact"))
+    gc.collect()
+    after = resident_size()
+    result = {}
+    if trace:
+        result["allocated_bytes"] = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    elif before is not None and after is not None:
+        result["resident_bytes"] = after - before
+    # The document is still referenced here, so all of it was counted
+    del data
+    return result
+
+
+def run_measure(kind, path, mode, storage, trace):
+    """Run measure() in a child process, so each load starts from a clean heap"""
+    command = [sys.executable, os.path.abspath(__file__), "--measure", kind, path, mode, "--storage", storage]
+    if trace:
+        command.append("--trace")
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def benchmark(kind, args):
+    """Write one kind's document and return the memory of each load mode"""
+    data = KINDS[kind][0](args.entries, random.Random(args.seed))
+    directory = tempfile.mkdtemp(prefix="bench_memory_")
+    try:
+        path = os.path.join(directory, f"{kind}-status.json")
+        status_json.StatusFile(path).save(data)
+        del data
+        if args.storage == "sqlite":
+            store = open_storage(args.storage, path, kind)
+            store.import_json()
+            store.close()
+        results = {}
+        for mode in MODES:
+            results[mode] = run_measure(kind, path, mode, args.storage, False)
+            results[mode].update(run_measure(kind, path, mode, args.storage, True))
+        return results
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def _megabytes(value):
+    return "-" if value is None else f"{value / 1e6:.1f} MB"
+
+
+def _reduction(old, new):
+    return "-" if not old or new is None else f"{1 - new / old:.0%}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the memory of loaded status documents, as plain dicts "
+                                                 "and as compact records.")
+    parser.add_argument("--entries", type=int, default=200000, help="Mods or authors per document")
+    parser.add_argument("--kinds", nargs="+", choices=sorted(KINDS), default=sorted(KINDS),
+                        help="Document kinds to run")
+    parser.add_argument("--storage", choices=["json", "sqlite"], default="json", help="Storage backend to load from")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the documents")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--measure", nargs=3, metavar=("KIND", "PATH", "MODE"), help=argparse.SUPPRESS)
+    parser.add_argument("--trace", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        kind, path, mode = args.measure
+        print(json.dumps(measure(kind, path, mode, args.storage, args.trace)))
+        return 0
+
+    results = {}
+    for kind in args.kinds:
+        results[kind] = benchmark(kind, args)
+        dicts, compact = results[kind]["dicts"], results[kind]["compact"]
+        for name in ("resident_bytes", "allocated_bytes"):
+            old, new = dicts.get(name), compact.get(name)
+            print(f"{kind}/{name.split('_')[0]}: dicts {_megabytes(old)}, compact {_megabytes(new)} "
+                  f"({_reduction(old, new)} smaller)")
+
+    if args.output:
+        document = {
+            "version": RESULTS_VERSION,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "settings": {"entries": args.entries, "storage": args.storage, "seed": args.seed},
+            "results": results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+            f.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for the report field parsers.
+
+Generates a synthetic corpus in the thread copier's format and reports how
+many records per second the mod and author parsers get through, serially or
+with worker processes. Before timing, it checks that the live preview's
+incremental parser splits the corpus like the parsers do, including when
+the text starts with blank lines and a report holds a double blank line:
+
+    python benchmarks/bench_parse.py --reports 100000
+    python benchmarks/bench_parse.py --reports 500000 --jobs 1 2 4 8
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import status_preview
+import status_updater_core as core
+
+SEPARATOR_LINE = "----------------------------------------"
+# Characters of each corpus the preview check parses
+PREVIEW_CHECK_SIZE = 200000
+GAMES = ["baldursgate3", "skyrimspecialedition", "newvegas", "cyberpunk2077", "starfield"]
+STATUSES = ["BROKEN", "LAME", "ABANDONED", "CAUTION", "INFORMATIVE"]
+LABELS = ["Bug Ignorer", "Flight Risk", "Copystriker", "Paywaller", "Incident"]
+PLACEHOLDERS = ["null", "-", "ㅤ", ""]
+
+
+def build_mod_corpus(count, rng):
+    """Build a dash-separated corpus of mod reports"""
+    reports = []
+    for i in range(count):
+        game = rng.choice(GAMES)
+        reason = rng.choice([
+            "Outdated and causes crashes",
+            "Breaks saves.\nUse the fixed version instead.",
+            "Abandoned by the author",
+        ])
+        alternative = rng.choice(PLACEHOLDERS + [f"https://www.nexusmods.com/{game}/mods/{i + 1}"])
+        reports.append(f"Game Shortname: {game}\n"
+                       f"Mod ID: {i}\n"
+                       f"Status: {rng.choice(STATUSES)}\n"
+                       f"Reason: {reason}\n"
+                       f"Alternative: {alternative}")
+    return f"\n\n{SEPARATOR_LINE}\n\n".join(reports)
+
+
+def build_author_corpus(count, rng):
+    """Build a dash-separated corpus of author reports"""
+    reports = []
+    for i in range(count):
+        labels = rng.sample(LABELS, rng.randint(1, 3))
+        report = f"Username: Author{i}\nLabels: {', '.join(labels)}\n"
+        for label in labels:
+            reference = rng.choice(PLACEHOLDERS + ["https://rpghq.org/forums/viewtopic.php?t=3511"])
+            report += f"\n{label}:\n  Label: Reported for {label.lower()}\n  Reference: {reference}\n"
+        reports.append(report.strip())
+    return f"\n\n{SEPARATOR_LINE}\n\n".join(reports)
+
+
+def check_preview(name, parse, preview_parser, text):
+    """Check that the incremental preview parser and the core parser agree on text"""
+    text = text[:PREVIEW_CHECK_SIZE]
+    # Blank lines before the first report, and a double blank line inside the second one
+    second = text.find(SEPARATOR_LINE) + len(SEPARATOR_LINE) + 2
+    line_end = text.find("\n", second)
+    text = "\n\n" + text[:line_end] + "\n\n" + text[line_end:]
+    live_parser = preview_parser()
+    live_parser.update(text)
+    if live_parser.reports() != parse(text):
+        raise SystemExit(f"{name}: the live preview splits the corpus differently from the parser")
+
+
+def measure(name, parse, text, expected, repeat, workers=1):
+    """Time a parser over the corpus and print its best throughput"""
+    elapsed = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        reports = parse(text, workers=workers)
+        run_time = time.perf_counter() - start
+        if elapsed is None or run_time < elapsed:
+            elapsed = run_time
+
+    if len(reports) != expected:
+        raise SystemExit(f"{name}: parsed {len(reports)} reports, expected {expected}")
+    print(f"{name}: {expected} reports in {elapsed:.3f}s ({expected / elapsed:,.0f} records/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the report field parsers.")
+    parser.add_argument("--reports", type=int, default=100000, help="Number of reports per corpus")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the corpus")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per parser; the fastest is reported")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1],
+                        help="Worker process counts to measure; 1 parses serially")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    mod_corpus = build_mod_corpus(args.reports, rng)
+    author_corpus = build_author_corpus(args.reports, rng)
+    check_preview("mod", core.parse_mod_reports, status_preview.mod_report_parser, mod_corpus)
+    check_preview("author", core.parse_author_reports, status_preview.author_report_parser, author_corpus)
+    for workers in args.jobs:
+        suffix = f" ({workers} workers)" if workers > 1 else ""
+        measure("mod" + suffix, core.parse_mod_reports, mod_corpus, args.reports, args.repeat, workers)
+        measure("author" + suffix, core.parse_author_reports, author_corpus, args.reports, args.repeat, workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""Synthetic-scale benchmark of the whole ingestion pipeline.
+
+Builds a status document already holding scale x --existing entries and a
+report corpus of scale x --reports reports in the thread copier's format,
+then measures each stage: split, parse, duplicate check, merge and
+serialize. Per stage it records throughput, latency percentiles and peak
+memory, and writes them as JSON that a later run can be compared against:
+
+    python benchmarks/bench_scale.py --scales 1 10 100 --output results.json
+    python benchmarks/bench_scale.py --scales 1 10 100 --baseline results.json
+
+The corpus is split into batches, as if pasted from several threads; half
+of them separate reports with dash lines and half with blank lines, and
+reports mix the null / - / filler placeholders, multi-line reasons,
+duplicates of stored entries and a few invalid reports. With --baseline,
+the exit status is 1 if any stage got slower, more memory hungry or had
+worse tail latency than the tolerance allows.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import status_json
+import status_sqlite
+import status_updater_core as core
+
+RESULTS_VERSION = 1
+STAGES = ("split", "parse", "duplicate check", "merge", "serialize")
+# Options that change what is measured; results are only comparable when they match
+SETTINGS = ("reports", "existing", "batches", "storage", "seed")
+
+SEPARATOR_LINE = "----------------------------------------"
+GAMES = ["baldursgate3", "skyrimspecialedition", "newvegas", "cyberpunk2077", "starfield",
+         "fallout4", "witcher3", "stardewvalley"]
+STATUSES = ["BROKEN", "LAME", "ABANDONED", "CAUTION", "INFORMATIVE"]
+LABELS = ["Bug Ignorer", "Flight Risk", "Copystriker", "Paywaller", "Incident", "Harasser"]
+PLACEHOLDERS = ["null", "-", core.FILLER_CHARACTER, ""]
+REASONS = [
+    "Outdated and causes crashes",
+    "Breaks saves.\nUse the fixed version instead.",
+    "Abandoned by the author",
+    "Overwrites the vanilla scripts.\nConflicts with most UI mods.\nSee the forum thread for details.",
+    "null",
+]
+
+
+def mod_report_text(rng, game, mod_id, status=None, reason=None):
+    """Render one mod report as the thread copier writes it"""
+    alternative = rng.choice(PLACEHOLDERS + [f"https://www.nexusmods.com/{game}/mods/{rng.randint(1, 99999)}"])
+    return (f"Game Shortname: {game}\n"
+            f"Mod ID: {mod_id}\n"
+            f"Status: {status or rng.choice(STATUSES)}\n"
+            f"Reason: {reason or rng.choice(REASONS)}\n"
+            f"Alternative: {alternative}")
+
+
+def author_report_text(rng, username, labels):
+    """Render one author report as the thread copier writes it"""
+    text = f"Username: {username}\nLabels: {', '.join(labels)}\n"
+    for label in labels:
+        label_text = rng.choice(PLACEHOLDERS + [f"Reported for {label.lower()}",
+                                                f"{core.FILLER_CHARACTER}Repeat offender"])
+        reference = rng.choice(PLACEHOLDERS + ["https://rpghq.org/forums/viewtopic.php?t=3511"])
+        text += f"\n{label}:\n  Label: {label_text}\n  Reference: {reference}\n"
+    return text.strip()
+
+
+def build_mod_document(count, rng):
+    """Build a mod status document holding count mods"""
+    data = core.empty_mod_status_data()
+    index = core.ModStatusIndex(data)
+    for mod_id in range(count):
+        game = GAMES[mod_id % len(GAMES)]
+        index.add(game, str(mod_id), rng.choice(STATUSES), {"reason": rng.choice(REASONS)})
+    return data
+
+
+def build_author_document(count, rng):
+    """Build an author status document holding count authors"""
+    data = core.empty_author_status_data()
+    index = core.AuthorStatusIndex(data)
+    for i in range(count):
+        username = f"Author{i}"
+        for label in rng.sample(LABELS, rng.randint(1, 3)):
+            index.add(username, label)
+            index.set_tooltip(username, label, {"label": f"Reported for {label.lower()}", "referenceLink": None})
+    index.sort_labels()
+    return data
+
+
+def build_mod_batches(count, existing, batch_count, rng):
+    """Build mod report batches; about one report in five repeats a stored mod"""
+    reports = []
+    for i in range(count):
+        if existing and rng.random() < 0.2:
+            mod_id = rng.randrange(existing)
+            reports.append(mod_report_text(rng, GAMES[mod_id % len(GAMES)], mod_id))
+        elif rng.random() < 0.01:
+            reports.append(f"Game Shortname: {rng.choice(GAMES)}\nReason: Missing its mod ID and status")
+        else:
+            reports.append(mod_report_text(rng, rng.choice(GAMES), existing + i))
+    return _join_batches(reports, batch_count)
+
+
+def build_author_batches(count, existing, batch_count, rng):
+    """Build author report batches; about one report in five repeats a stored author"""
+    reports = []
+    for i in range(count):
+        if existing and rng.random() < 0.2:
+            username = f"Author{rng.randrange(existing)}"
+        else:
+            username = f"Author{existing + i}"
+        reports.append(author_report_text(rng, username, rng.sample(LABELS, rng.randint(1, 3))))
+    return _join_batches(reports, batch_count)
+
+
+def _join_batches(reports, batch_count):
+    """Split reports into batches, alternating dash and blank line separators"""
+    size = max(1, -(-len(reports) // batch_count))
+    batches = []
+    for start in range(0, len(reports), size):
+        separator = f"\n\n{SEPARATOR_LINE}\n\n" if len(batches) % 2 == 0 else "\n\n\n"
+        batches.append(separator.join(reports[start:start + size]))
+    return batches
+
+
+class StageStats:
+    """Latencies of one stage: per report, or per batch for merge and serialize"""
+
+    def __init__(self):
+        self.latencies = []
+        self.items = 0
+        self.peak_memory = 0
+
+    def add(self, seconds, items=1):
+        self.latencies.append(seconds)
+        self.items += items
+
+    def summary(self):
+        latencies = sorted(self.latencies)
+        total = sum(latencies)
+
+        def percentile(fraction):
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000
+
+        return {
+            "items": self.items,
+            "seconds": round(total, 6),
+            "throughput": round(self.items / total, 1) if total else None,
+            "p50_ms": round(percentile(0.50), 6),
+            "p90_ms": round(percentile(0.90), 6),
+            "p99_ms": round(percentile(0.99), 6),
+            "max_ms": round(latencies[-1] * 1000, 6) if latencies else 0.0,
+            "peak_memory_bytes": self.peak_memory,
+        }
+
+
+def mod_duplicate_check(index, report):
+    return index.lookup(report["game"], report["id"])
+
+
+def author_duplicate_check(index, report):
+    return [index.has_label(report["username"], label) for label in report["label_list"]]
+
+
+KINDS = {
+    "mod": (build_mod_document, build_mod_batches, core.parse_mod_report, core.is_valid_mod_report,
+            core.ModStatusIndex, mod_duplicate_check, core.merge_mod_reports, status_sqlite.MOD_DOCUMENT),
+    "author": (build_author_document, build_author_batches, core.parse_author_report, core.is_valid_author_report,
+               core.AuthorStatusIndex, author_duplicate_check, core.merge_author_reports,
+               status_sqlite.AUTHOR_DOCUMENT),
+}
+
+
+def open_storage(storage, directory, kind, data):
+    """Write the pre-populated document and return the storage to save it with"""
+    json_path = os.path.join(directory, f"{kind}-status.json")
+    status_json.StatusFile(json_path).save(data)
+    if storage == "sqlite":
+        store = status_sqlite.SqliteStatusStore(os.path.join(directory, "status.sqlite3"),
+                                                KINDS[kind][7], json_path)
+        store.import_json()
+        return store
+    status_file = status_json.StatusFile(json_path)
+    status_file.load()
+    return status_file
+
+
+def run_pipeline(kind, batches, data, status_file, stats, track_memory):
+    """Push every batch through the stages, recording into stats"""
+    _, _, parse_report, is_valid, index_class, duplicate_check, merge, _ = KINDS[kind]
+    clock = time.perf_counter
+    index = index_class(data)
+
+    def begin(stage):
+        if track_memory:
+            tracemalloc.reset_peak()
+        return stage
+
+    def end(stage):
+        if track_memory:
+            stats[stage].peak_memory = max(stats[stage].peak_memory, tracemalloc.get_traced_memory()[1])
+
+    for batch in batches:
+        begin("split")
+        blocks = []
+        iter_blocks = core.iter_report_blocks(batch)
+        while True:
+            start = clock()
+            block = next(iter_blocks, None)
+            if block is None:
+                break
+            stats["split"].add(clock() - start)
+            blocks.append(block)
+        end("split")
+
+        begin("parse")
+        reports = []
+        for block in blocks:
+            start = clock()
+            report = parse_report(block)
+            valid = is_valid(report)
+            stats["parse"].add(clock() - start)
+            if valid:
+                reports.append(report)
+        end("parse")
+
+        begin("duplicate check")
+        for report in reports:
+            start = clock()
+            duplicate_check(index, report)
+            stats["duplicate check"].add(clock() - start)
+        end("duplicate check")
+
+        # Merging and saving work on whole batches, as the GUI and CLI call them
+        begin("merge")
+        start = clock()
+        merge(data, reports, index)
+        stats["merge"].add(clock() - start, len(reports))
+        end("merge")
+
+        begin("serialize")
+        start = clock()
+        status_file.save(data, index.pop_changed(), index.pop_operations())
+        stats["serialize"].add(clock() - start, len(reports))
+        end("serialize")
+
+
+def benchmark(kind, scale, args):
+    """Run one kind at one scale and return its per-stage summaries"""
+    build_document, build_batches = KINDS[kind][:2]
+    results = {}
+    for track_memory in (False, True):
+        # Identical inputs for the timed and the memory-tracking pass
+        rng = random.Random(args.seed)
+        data = build_document(args.existing * scale, rng)
+        batches = build_batches(args.reports * scale, args.existing * scale, args.batches, rng)
+        directory = tempfile.mkdtemp(prefix="bench_scale_")
+        try:
+            status_file = open_storage(args.storage, directory, kind, data)
+            stats = {stage: StageStats() for stage in STAGES}
+            gc.collect()
+            if track_memory:
+                tracemalloc.start()
+            try:
+                run_pipeline(kind, batches, data, status_file, stats, track_memory)
+            finally:
+                if track_memory:
+                    tracemalloc.stop()
+            if hasattr(status_file, "close"):
+                status_file.close()
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+        for stage in STAGES:
+            if track_memory:
+                results[stage]["peak_memory_bytes"] = stats[stage].peak_memory
+            else:
+                results[stage] = stats[stage].summary()
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """List the regressions of results against a baseline"""
+    regressions = []
+    for name, stage in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        if old.get("throughput") and stage["throughput"] and stage["throughput"] < old["throughput"] / (1 + tolerance):
+            regressions.append(f"{name}: throughput {stage['throughput']:,.0f}/s, was {old['throughput']:,.0f}/s")
+        for key, unit in (("p99_ms", "ms"), ("peak_memory_bytes", " bytes")):
+            if old.get(key) and stage[key] > old[key] * (1 + tolerance):
+                regressions.append(f"{name}: {key} {stage[key]:,.3f}{unit}, was {old[key]:,.3f}{unit}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark split, parse, duplicate check, merge and serialize "
+                                                 "at synthetic scales.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10], help="Scale factors to run")
+    parser.add_argument("--reports", type=int, default=1000, help="Reports per kind at scale 1")
+    parser.add_argument("--existing", type=int, default=2000, help="Stored entries per kind at scale 1")
+    parser.add_argument("--batches", type=int, default=10, help="Batches the reports are pasted in")
+    parser.add_argument("--kinds", nargs="+", choices=sorted(KINDS), default=sorted(KINDS),
+                        help="Report kinds to run")
+    parser.add_argument("--storage", choices=["json", "sqlite"], default="json", help="Storage backend to save to")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the documents and corpora")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against results written earlier by --output")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed relative slowdown or growth before a stage counts as a regression")
+    args = parser.parse_args()
+
+    settings = {key: getattr(args, key) for key in SETTINGS}
+    results = {}
+    for scale in args.scales:
+        for kind in args.kinds:
+            for stage, summary in benchmark(kind, scale, args).items():
+                name = f"{kind}/x{scale}/{stage}"
+                results[name] = summary
+                throughput = f"{summary['throughput']:,.0f}/s" if summary["throughput"] else "-"
+                print(f"{name}: {summary['items']} items in {summary['seconds']:.3f}s ({throughput}), "
+                      f"p50 {summary['p50_ms']:.3f}ms, p99 {summary['p99_ms']:.3f}ms, "
+                      f"peak {summary['peak_memory_bytes'] / 1e6:.1f} MB")
+
+    if args.output:
+        document = {
+            "version": RESULTS_VERSION,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "settings": settings,
+            "results": results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+            f.write("\n")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get("settings") != settings:
+            print(f"\nWarning: {args.baseline} was run with different settings: {baseline.get('settings')}")
+        regressions = compare(results, baseline.get("results", {}), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regressions against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"\nNo regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
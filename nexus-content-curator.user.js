@@ -25,6 +25,13 @@
   const MOD_STATUS_URL =
     "https://github.com/loregamer/nexus-content-curator/raw/refs/heads/main/Resources/mod-status.json";
 
+  // Per-game shards of mod-status.json, listed with their hashes in a manifest
+  const MOD_STATUS_MANIFEST_URL =
+    "https://github.com/loregamer/nexus-content-curator/raw/refs/heads/main/Resources/mod-status-manifest.json";
+
+  const MOD_STATUS_SHARD_BASE_URL =
+    "https://github.com/loregamer/nexus-content-curator/raw/refs/heads/main/Resources/mod-status-shards/";
+
   const AUTHOR_STATUS_URL =
     "https://github.com/loregamer/nexus-content-curator/raw/refs/heads/main/Resources/author-status.json";
 
@@ -39,6 +46,7 @@
     LAST_UPDATE: "nexus_data_last_update",
     HIDDEN_MODS: "nexus_hidden_mods",
     HIDDEN_AUTHORS: "nexus_hidden_authors",
+    MOD_STATUS_SHARD_PREFIX: "nexus_mod_status_shard_",
   };
 
   // Cache duration in milliseconds (24 hours)
@@ -105,6 +113,83 @@
     });
   }
 
+  // Function to fetch the mod status data for a single game
+  // Downloads the small manifest and that game's shard (reusing the stored
+  // shard while its hash is unchanged), and hands the callback data shaped
+  // like mod-status.json. Falls back to the full file if anything fails.
+  function fetchModStatusForGame(gameId, callback) {
+    const fallback = (reason) => {
+      console.log(`[Debug] Using full mod status file: ${reason}`);
+      fetchAndStoreJSON(MOD_STATUS_URL, STORAGE_KEYS.MOD_STATUS, callback);
+    };
+
+    if (!gameId) {
+      fallback("no game on this page");
+      return;
+    }
+
+    GM_xmlhttpRequest({
+      method: "GET",
+      url: MOD_STATUS_MANIFEST_URL,
+      onload: function (response) {
+        let manifest;
+        try {
+          manifest = JSON.parse(response.responseText);
+        } catch (error) {
+          fallback("could not parse the manifest");
+          return;
+        }
+        if (!manifest || manifest.version !== 1 || !manifest.shards) {
+          fallback("unsupported manifest");
+          return;
+        }
+
+        const buildData = (shard) => ({
+          "Mod Statuses": shard["Mod Statuses"] || {},
+          "Mod Descriptors": shard["Mod Descriptors"] || {},
+          "Keyword Rules": Object.assign({}, manifest["Keyword Rules"], shard["Keyword Rules"]),
+        });
+
+        const entry = manifest.shards[gameId];
+        if (!entry) {
+          // A game added since the manifest was last published, e.g. by a hand edit
+          fallback(`${gameId} is not in the manifest`);
+          return;
+        }
+
+        const storageKey = STORAGE_KEYS.MOD_STATUS_SHARD_PREFIX + gameId;
+        const stored = getStoredData(storageKey);
+        if (stored && stored.sha256 === entry.sha256) {
+          console.log(`[Debug] Using stored mod status shard for ${gameId}`);
+          callback(buildData(stored.data));
+          return;
+        }
+
+        GM_xmlhttpRequest({
+          method: "GET",
+          url: MOD_STATUS_SHARD_BASE_URL + encodeURIComponent(entry.file),
+          onload: function (shardResponse) {
+            let shard;
+            try {
+              shard = JSON.parse(shardResponse.responseText);
+            } catch (error) {
+              fallback(`could not parse the shard for ${gameId}`);
+              return;
+            }
+            GM_setValue(storageKey, JSON.stringify({ sha256: entry.sha256, data: shard }));
+            callback(buildData(shard));
+          },
+          onerror: function () {
+            fallback(`could not fetch the shard for ${gameId}`);
+          },
+        });
+      },
+      onerror: function () {
+        fallback("could not fetch the manifest");
+      },
+    });
+  }
+
   // Enhanced warning styles
   const styles = `
     .tiles .author {
@@ -3241,12 +3326,8 @@
       }, 100);
     }
 
-    // Always fetch fresh data first
-    fetchAndStoreJSON(
-      MOD_STATUS_URL,
-      STORAGE_KEYS.MOD_STATUS,
-      processModStatus
-    );
+    // Always fetch fresh data first, but only this game's part of it
+    fetchModStatusForGame(gameId, processModStatus);
   }
 
   // Create form HTML
@@ -1,4 +1,6 @@
 @echo off
 cd /d G:\Modding\_Github\nexus-content-curator
+rem Each start's time to first paint is appended here
+set STATUS_UPDATER_STARTUP_LOG=startup-times.log
 python status_updater_gui.py
 pause 
\ No newline at end of file
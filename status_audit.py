@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""Consistency audit of the mod and author status documents.
+
+Merging only ever looks at the entries a report names, so inconsistencies
+in the stored data otherwise show up as puzzling skip messages. An audit
+finds them all:
+
+- mod descriptors that no status category lists the mod for
+- mods listed under two status categories, or twice under one
+- tooltips for labels the author is not listed under
+- authors listed under a label without a tooltip for it
+- authors listed twice under a label
+- filler characters (\\u3164) and "null" strings left in descriptors and tooltips
+
+The document is indexed in one pass and every check is a dict or set
+lookup, so an audit takes linear time and can run after every save,
+limited to the games or authors the save touched. Each issue comes with
+the operations fixing it, in the merge journal's format, so fixes are saved
+incrementally and can be undone like a merge batch.
+"""
+import copy
+from collections.abc import Mapping
+
+import status_journal
+from status_updater_core import FILLER_CHARACTER
+
+ORPHAN_DESCRIPTOR = "orphan-descriptor"
+DUPLICATE_STATUS = "duplicate-status"
+ORPHAN_TOOLTIP = "orphan-tooltip"
+MISSING_TOOLTIP = "missing-tooltip"
+DUPLICATE_AUTHOR = "duplicate-author"
+STRAY_VALUE = "stray-value"
+
+# Headings of the checks, in the order they are reported
+CHECKS = {
+    ORPHAN_DESCRIPTOR: "Descriptors of mods without a status",
+    DUPLICATE_STATUS: "Mods listed more than once in Mod Statuses",
+    ORPHAN_TOOLTIP: "Tooltips for labels the author is not listed under",
+    MISSING_TOOLTIP: "Authors listed under a label without a tooltip",
+    DUPLICATE_AUTHOR: "Authors listed twice under a label",
+    STRAY_VALUE: "Filler characters and \"null\" strings",
+}
+
+
+class AuditReport:
+    """Issues found in a status document, and the operations fixing them"""
+
+    def __init__(self, kind):
+        self.kind = kind
+        # (check, "game/mod_id" or "username/label", description)
+        self.issues = []
+        self.fixes = []
+        self.checked = 0
+
+    def add(self, check, name, description, *fixes):
+        """Record one issue and any operations fixing it"""
+        self.issues.append((check, name, description))
+        self.fixes.extend(fixes)
+
+    def __len__(self):
+        return len(self.issues)
+
+
+def clean_value(value):
+    """Return a stored value without filler characters, or None if it was only a placeholder"""
+    if not isinstance(value, str) or (FILLER_CHARACTER not in value and value.strip().lower() != "null"):
+        return value
+    cleaned = value.replace(FILLER_CHARACTER, "")
+    if not cleaned.strip() or cleaned.strip().lower() == "null":
+        return None
+    return cleaned
+
+
+def _show(value):
+    """Quote a value for an issue description, making filler characters visible"""
+    return repr(value).replace(FILLER_CHARACTER, "\\u3164")
+
+
+def _check_values(report, name, path, entry):
+    """Check the values of a descriptor or tooltip for stray placeholders"""
+    # Checking dict first skips the slower abstract Mapping check for most entries
+    if not isinstance(entry, (dict, Mapping)):
+        return
+    stray = [key for key, value in entry.items() if clean_value(value) is not value]
+    if stray:
+        description = ", ".join(f"{key} {_show(entry[key])}" for key in stray)
+        cleaned = {key: clean_value(value) for key, value in entry.items()}
+        report.add(STRAY_VALUE, name, description, {"op": "set", "path": path, "value": cleaned, "old": entry})
+
+
+def audit_mods(mod_status_data, games=None):
+    """Audit a mod status document, or only the given games of it"""
+    report = AuditReport("mod")
+    statuses = mod_status_data.get("Mod Statuses", {})
+    descriptors = mod_status_data.get("Mod Descriptors", {})
+    if games is None:
+        games = list(statuses) + [game for game in descriptors if game not in statuses]
+
+    for game in games:
+        game_statuses = statuses.get(game, {})
+        game_descriptors = descriptors.get(game, {})
+        if not isinstance(game_statuses, Mapping):
+            game_statuses = {}
+        if not isinstance(game_descriptors, Mapping):
+            game_descriptors = {}
+
+        # mod_id -> the first status category listing it, which is the one merging sees
+        first_status = {}
+        for status, mod_ids in game_statuses.items():
+            if not isinstance(mod_ids, list):
+                continue
+            kept = []
+            for mod_id in mod_ids:
+                if mod_id not in first_status:
+                    first_status[mod_id] = status
+                    kept.append(mod_id)
+                elif first_status[mod_id] == status:
+                    report.add(DUPLICATE_STATUS, f"{game}/{mod_id}", f"listed twice under {status}")
+                else:
+                    report.add(DUPLICATE_STATUS, f"{game}/{mod_id}",
+                               f"listed under {first_status[mod_id]} and {status}")
+            if len(kept) != len(mod_ids):
+                # Later copies are dropped, keeping the status merging already reports
+                report.fixes.append({"op": "set", "path": ["Mod Statuses", game, status], "value": kept,
+                                     "old": list(mod_ids)})
+        report.checked += len(first_status)
+
+        for mod_id, descriptor in game_descriptors.items():
+            path = ["Mod Descriptors", game, mod_id]
+            if mod_id not in first_status:
+                report.checked += 1
+                report.add(ORPHAN_DESCRIPTOR, f"{game}/{mod_id}", "has a descriptor but no status",
+                           {"op": "delete", "path": path, "old": descriptor})
+            else:
+                _check_values(report, f"{game}/{mod_id}", path, descriptor)
+    return report
+
+
+def _label_authors(label_data):
+    """Return a label's author list, or an empty one if it is malformed"""
+    authors = label_data.get("authors", []) if isinstance(label_data, Mapping) else []
+    return authors if isinstance(authors, list) else []
+
+
+def _check_label(report, label_name, authors, wanted, author_labels):
+    """Check a label's author list for repeats, indexing its authors into author_labels"""
+    seen = set()
+    kept = []
+    reported = False
+    for username in authors:
+        if username not in seen:
+            seen.add(username)
+            kept.append(username)
+            author_labels.setdefault(username, []).append(label_name)
+        elif wanted is None or username in wanted:
+            report.add(DUPLICATE_AUTHOR, f"{username}/{label_name}", "listed twice")
+            reported = True
+    if reported:
+        report.fixes.append({"op": "set", "path": ["Labels", label_name, "authors"], "value": kept,
+                             "old": list(authors)})
+
+
+def audit_authors(author_status_data, usernames=None, index=None):
+    """Audit an author status document, or only the given authors of it
+
+    Every label list is indexed to find the labels of the authors, unless
+    the AuthorStatusIndex kept for the document is passed along with the
+    usernames. Then only lists longer than the index's set of their authors
+    are read, as only those can list an author twice.
+    """
+    report = AuditReport("author")
+    labels = author_status_data.get("Labels", {})
+    tooltips = author_status_data.get("Tooltips", {})
+    wanted = None if usernames is None else set(usernames)
+
+    # username -> the labels listing it, in document order
+    author_labels = {}
+    if index is None or usernames is None:
+        for label_name, label_data in labels.items():
+            _check_label(report, label_name, _label_authors(label_data), wanted, author_labels)
+    else:
+        touched = set()
+        for username in wanted:
+            touched.update(index.labels_for(username))
+        for label_name in labels:
+            if label_name not in touched:
+                continue
+            authors = _label_authors(labels[label_name])
+            if len(authors) != len(index.label_authors.get(label_name, set())):
+                _check_label(report, label_name, authors, wanted, {})
+            for username in index.label_authors.get(label_name, set()) & wanted:
+                author_labels.setdefault(username, []).append(label_name)
+
+    if usernames is None:
+        usernames = list(author_labels) + [username for username in tooltips if username not in author_labels]
+    tooltips_missing = "Tooltips" not in author_status_data
+    for username in usernames:
+        author_tooltips = tooltips.get(username, {})
+        if not isinstance(author_tooltips, Mapping):
+            continue
+        report.checked += 1
+        listed = author_labels.get(username, [])
+        listed_set = set(listed)
+
+        stale = [label_name for label_name in author_tooltips if label_name not in listed_set]
+        for label_name in stale:
+            report.add(ORPHAN_TOOLTIP, f"{username}/{label_name}", "has a tooltip but is not listed under the label")
+            if listed:
+                report.fixes.append({"op": "delete", "path": ["Tooltips", username, label_name],
+                                     "old": author_tooltips[label_name]})
+        if stale and not listed:
+            # The author is under no label at all, so the whole entry goes
+            report.fixes.append({"op": "delete", "path": ["Tooltips", username], "old": author_tooltips})
+
+        missing = [label_name for label_name in listed if label_name not in author_tooltips]
+        for label_name in missing:
+            report.add(MISSING_TOOLTIP, f"{username}/{label_name}", "is listed under the label but has no tooltip")
+        if missing:
+            # The empty tooltip a report without label details is saved with
+            if tooltips_missing:
+                report.fixes.append({"op": "set", "path": ["Tooltips"], "value": {}})
+                tooltips_missing = False
+            if username not in tooltips:
+                report.fixes.append({"op": "set", "path": ["Tooltips", username],
+                                     "value": {label_name: {"label": None, "referenceLink": None}
+                                               for label_name in missing}})
+            else:
+                report.fixes.extend({"op": "set", "path": ["Tooltips", username, label_name],
+                                     "value": {"label": None, "referenceLink": None}} for label_name in missing)
+
+        for label_name, tooltip in author_tooltips.items():
+            if label_name in listed_set:
+                _check_values(report, f"{username}/{label_name}", ["Tooltips", username, label_name], tooltip)
+    return report
+
+
+def audit(kind, data, names=None, index=None):
+    """Audit a "mod" or "author" status document, or only the named games or authors of it"""
+    if kind == "mod":
+        return audit_mods(data, names)
+    return audit_authors(data, names, index)
+
+
+def apply_fixes(data, report):
+    """Fix the issues of an audit in the document it was run on
+
+    Returns (changed, operations) to save the document with, as from an
+    index's pop_changed() and pop_operations().
+    """
+    operations = []
+    for operation in report.fixes:
+        # A copy goes into the document, so later fixes never change what is journaled
+        applied = dict(operation)
+        if "value" in applied:
+            applied["value"] = copy.deepcopy(applied["value"])
+        status_journal.apply_operation(data, applied)
+        operations.append(operation)
+    return status_journal.changed_entries(operations), operations
+
+
+def format_audit_report(report, path, limit=None):
+    """Describe the issues an audit found, at most limit per check"""
+    noun = "mods" if report.kind == "mod" else "authors"
+    if not report.issues:
+        return f"No issues found in {report.checked} {noun} of {path}"
+
+    by_check = {}
+    for check, name, description in report.issues:
+        by_check.setdefault(check, []).append(f"  {name}: {description}")
+    lines = [f"Found {len(report.issues)} issues in {report.checked} {noun} of {path}"]
+    for check, heading in CHECKS.items():
+        found = by_check.get(check)
+        if not found:
+            continue
+        lines.append("")
+        lines.append(f"{heading} ({len(found)}):")
+        lines.extend(found if limit is None else found[:limit])
+        if limit is not None and len(found) > limit:
+            lines.append(f"  ... and {len(found) - limit} more")
+    return "\n".join(lines)
+
+
+def format_audit_note(report):
+    """Describe an audit of the entries a batch of reports touched, for the save summaries"""
+    if not report.issues:
+        return ""
+    return (f"\n\nFound {len(report.issues)} inconsistencies in the entries these reports touched; "
+            "audit the file to list and fix them.")
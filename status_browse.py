@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""Rows and search for browsing the status documents.
+
+Every mod, with its status and descriptor, and every author under each of
+their labels, with the tooltip, is one row. A row only keeps the keys of
+its entry; cells are read from the document through the status index when
+they are shown, and edits go through the index too, so they are journaled
+and saved like merged reports.
+
+A BrowseIndex keeps the casefolded text of every row, and the key columns
+sorted, so that a search is a bisect or one scan over prepared strings:
+
+    skyrim           rows containing "skyrim" in any column
+    game:sky         rows whose game starts with "sky"
+    reason:*crash    rows whose reason contains "crash"
+
+Terms separated by spaces must all match, and a term whose field is not a
+known column name, such as a link, is searched for in every column.
+"""
+import bisect
+from collections.abc import Mapping
+
+MOD_COLUMNS = ("Game", "Mod ID", "Status", "Reason", "Alternative")
+AUTHOR_COLUMNS = ("Username", "Label", "Details", "Reference")
+
+# Query field -> column
+MOD_FIELDS = {"game": 0, "id": 1, "status": 2, "reason": 3, "alternative": 4}
+AUTHOR_FIELDS = {"user": 0, "username": 0, "label": 1, "details": 2, "reference": 3}
+
+# Columns kept sorted for prefix queries; the others are scanned
+MOD_KEY_COLUMNS = (0, 1, 2)
+AUTHOR_KEY_COLUMNS = (0, 1)
+
+# Columns that can be edited, and the descriptor or tooltip key they hold
+MOD_EDITABLE = {2: "status", 3: "reason", 4: "alternative"}
+AUTHOR_EDITABLE = {2: "label", 3: "referenceLink"}
+
+SUBSTRING_MARKER = "*"
+# Sorts after every string starting with the same prefix
+LAST_CHARACTER = "\U0010ffff"
+# A prefix matching more distinct values than this share of the rows is scanned for instead
+SCAN_SHARE = 16
+
+
+def _mapping(value):
+    # Checking dict first skips the slower abstract Mapping check for most values
+    return value if isinstance(value, (dict, Mapping)) else {}
+
+
+def _mod_rows(mod_status_data):
+    """Yield (game, mod_id, status, reason, alternative) for each mod, in document order
+
+    A mod listed under two statuses shows the first, as merging sees it;
+    mods that only have a descriptor come last, without a status.
+    """
+    descriptors = mod_status_data.get("Mod Descriptors", {})
+    seen = set()
+    for game, categories in mod_status_data.get("Mod Statuses", {}).items():
+        game_descriptors = _mapping(descriptors.get(game))
+        for status, mod_ids in _mapping(categories).items():
+            for mod_id in mod_ids if isinstance(mod_ids, list) else ():
+                if (game, mod_id) not in seen:
+                    seen.add((game, mod_id))
+                    descriptor = _mapping(game_descriptors.get(mod_id))
+                    yield game, mod_id, status, descriptor.get("reason"), descriptor.get("alternative")
+    for game, game_descriptors in descriptors.items():
+        for mod_id, descriptor in _mapping(game_descriptors).items():
+            if (game, mod_id) not in seen:
+                seen.add((game, mod_id))
+                descriptor = _mapping(descriptor)
+                yield game, mod_id, None, descriptor.get("reason"), descriptor.get("alternative")
+
+
+def _author_rows(author_status_data):
+    """Yield (username, label, details, reference) for each author under each label, in document order"""
+    tooltips = author_status_data.get("Tooltips", {})
+    for label_name, label_data in author_status_data.get("Labels", {}).items():
+        authors = _mapping(label_data).get("authors", [])
+        for username in dict.fromkeys(authors if isinstance(authors, list) else ()):
+            tooltip = _mapping(_mapping(tooltips.get(username)).get(label_name))
+            yield username, label_name, tooltip.get("label"), tooltip.get("referenceLink")
+
+
+class BrowseIndex:
+    """Search index over the rows of a mod or author status document
+
+    Built from the document and the ModStatusIndex or AuthorStatusIndex kept
+    for it, and valid until the document is changed other than through
+    edit().
+    """
+
+    def __init__(self, kind, data, index):
+        self.kind = kind
+        self.data = data
+        self.index = index
+        if kind == "mod":
+            self.columns, self.fields = MOD_COLUMNS, MOD_FIELDS
+            self.key_columns, self.editable = MOD_KEY_COLUMNS, MOD_EDITABLE
+            rows = list(_mod_rows(data))
+        else:
+            self.columns, self.fields = AUTHOR_COLUMNS, AUTHOR_FIELDS
+            self.key_columns, self.editable = AUTHOR_KEY_COLUMNS, AUTHOR_EDITABLE
+            rows = list(_author_rows(data))
+        self.keys = [row[:2] for row in rows]
+
+        # Casefolded text per column; repeated values, like games, statuses
+        # and common reasons, share one folded string
+        self.folded = {}
+        self.text = []
+        for column in range(len(self.columns)):
+            values = [row[column] for row in rows]
+            for value in set(values):
+                self._fold(value)
+            folded = self.folded
+            self.text.append([folded[value] for value in values])
+        self.row_text = ["\t".join(values) for values in zip(*self.text)]
+
+        # Key column -> {folded value: ascending rows}, and its values sorted
+        self.postings = {}
+        self.sorted_values = {}
+        for column in self.key_columns:
+            postings = {}
+            for row, value in enumerate(self.text[column]):
+                postings.setdefault(value, []).append(row)
+            self.postings[column] = postings
+            self.sorted_values[column] = sorted(postings)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _fold(self, value):
+        """Return the shared casefolded text of a cell value"""
+        folded = self.folded.get(value)
+        if folded is None:
+            text = "" if value is None else str(value)
+            folded = self.folded[value] = text.casefold()
+        return folded
+
+    def values(self, row):
+        """Return the cells of a row, read from the document"""
+        if self.kind == "mod":
+            game, mod_id = self.keys[row]
+            status, descriptor = self.index.lookup(game, mod_id) or (None, None)
+            descriptor = _mapping(descriptor)
+            return game, mod_id, status, descriptor.get("reason"), descriptor.get("alternative")
+        username, label_name = self.keys[row]
+        tooltip = self._tooltip(username, label_name)
+        return username, label_name, tooltip.get("label"), tooltip.get("referenceLink")
+
+    def _tooltip(self, username, label_name):
+        return _mapping(_mapping(self.data.get("Tooltips", {}).get(username)).get(label_name))
+
+    def _prefix_rows(self, column, prefix):
+        """Return the rows whose column starts with prefix, in row order"""
+        if column in self.postings:
+            sorted_values = self.sorted_values[column]
+            start = bisect.bisect_left(sorted_values, prefix)
+            end = bisect.bisect_left(sorted_values, prefix + LAST_CHARACTER, start)
+            if end - start == 1:
+                return list(self.postings[column][sorted_values[start]])
+            if (end - start) * SCAN_SHARE < len(self.keys):
+                postings = self.postings[column]
+                return sorted(row for value in sorted_values[start:end] for row in postings[value])
+        return [row for row, value in enumerate(self.text[column]) if value.startswith(prefix)]
+
+    def _parse(self, term):
+        """Split a query term into (column or None for any, casefolded needle, prefix match)"""
+        field, sep, needle = term.partition(":")
+        column = self.fields.get(field.casefold()) if sep else None
+        if column is None:
+            return None, term.casefold(), False
+        if needle.startswith(SUBSTRING_MARKER):
+            return column, needle[len(SUBSTRING_MARKER):].casefold(), False
+        return column, needle.casefold(), True
+
+    def search(self, query):
+        """Return the rows matching a query, in document order
+
+        A prefix term on a key column is looked up first; every other term
+        then only scans the rows still matching.
+        """
+        terms = [term for term in map(self._parse, query.split()) if term[1]]
+        terms.sort(key=lambda term: not (term[2] and term[0] in self.postings))
+        rows = None
+        for column, needle, prefix in terms:
+            texts = self.row_text if column is None else self.text[column]
+            if rows is None:
+                rows = (self._prefix_rows(column, needle) if prefix
+                        else [row for row, text in enumerate(texts) if needle in text])
+            elif prefix:
+                rows = [row for row in rows if texts[row].startswith(needle)]
+            else:
+                rows = [row for row in rows if needle in texts[row]]
+        return list(range(len(self.keys))) if rows is None else rows
+
+    def edit(self, row, column, text):
+        """Change one cell through the status index and re-index its row
+
+        An empty value is stored as null. Returns False if the value did not
+        change; raises ValueError if the column cannot be edited that way.
+        """
+        if column not in self.editable:
+            raise ValueError(f"{self.columns[column]} cannot be edited")
+        value = text.strip() or None
+        if value == self.values(row)[column]:
+            return False
+
+        key = self.editable[column]
+        if self.kind == "mod":
+            game, mod_id = self.keys[row]
+            status, descriptor = self.index.lookup(game, mod_id) or (None, None)
+            descriptor = dict(_mapping(descriptor))
+            if key == "status":
+                if value is None:
+                    raise ValueError("A mod needs a status")
+                status = value
+            else:
+                descriptor[key] = value
+            self.index.update(game, mod_id, status, descriptor)
+        else:
+            username, label_name = self.keys[row]
+            tooltip = {"label": None, "referenceLink": None}
+            tooltip.update(self._tooltip(username, label_name))
+            tooltip[key] = value
+            self.index.set_tooltip(username, label_name, tooltip)
+
+        self._index_row(row, column)
+        return True
+
+    def _index_row(self, row, column):
+        """Re-index one cell of a row after it was edited"""
+        old = self.text[column][row]
+        new = self.text[column][row] = self._fold(self.values(row)[column])
+        self.row_text[row] = "\t".join(texts[row] for texts in self.text)
+        if column not in self.postings or new == old:
+            return
+        postings = self.postings[column]
+        sorted_values = self.sorted_values[column]
+        old_rows = postings[old]
+        del old_rows[bisect.bisect_left(old_rows, row)]
+        if not old_rows:
+            del postings[old]
+            del sorted_values[bisect.bisect_left(sorted_values, old)]
+        if new not in postings:
+            postings[new] = []
+            bisect.insort(sorted_values, new)
+        bisect.insort(postings[new], row)
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""Versioned delta patches between successive saves of a status document.
+
+Every save of a status file gets a version number. Next to the file, e.g. in
+Resources/mod-status-deltas/ for Resources/mod-status.json, the log keeps:
+
+    head.json                 {"format", "baseline", "head", "sha256", "size"}
+    baseline-000000.json      the full document at the baseline version
+    delta-000001.json ...     {"format", "from", "to", "sha256", "changes"}
+
+A delta lists the changes that turn version N-1 into version N as operations
+on paths into the document: "add" a key at the end of a dict, "replace" or
+"remove" a key, or "append" values to a list. Applying the deltas after the
+baseline in order reproduces the status file byte for byte; sha256 is the
+hash of the full file after each version. A client that has version N only
+needs deltas N+1 through head; one older than the baseline needs the full
+file.
+
+compact() folds old deltas into a new baseline and verify() proves that the
+baseline plus the deltas still reproduce the status file.
+"""
+import json
+import logging
+import os
+from collections.abc import Mapping
+
+import status_json
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+HEAD_NAME = "head.json"
+
+_MISSING = object()
+
+
+class DeltaLogError(Exception):
+    """Raised when a delta log is missing pieces or does not apply cleanly"""
+
+
+def delta_directory(status_path):
+    """Return the delta log directory kept next to a status file"""
+    return os.path.splitext(status_path)[0] + "-deltas"
+
+
+def diff_values(old, new, path, changes):
+    """Append the changes turning old into new at path to changes
+
+    Dicts are compared key by key as long as their surviving keys keep their
+    order and new keys come last, which is how merges grow them; lists that
+    only grew at the end become an "append". Anything else is replaced whole.
+    """
+    if type(old) is type(new) and not isinstance(old, Mapping) and old == new:
+        return
+
+    if isinstance(old, Mapping) and isinstance(new, Mapping):
+        kept = [key for key in old if key in new]
+        new_keys = list(new)
+        if new_keys[:len(kept)] != kept:
+            changes.append({"op": "replace", "path": path, "value": new})
+            return
+
+        for key in old:
+            if key not in new:
+                changes.append({"op": "remove", "path": path + [key]})
+        for key in kept:
+            diff_values(old[key], new[key], path + [key], changes)
+        for key in new_keys[len(kept):]:
+            changes.append({"op": "add", "path": path + [key], "value": new[key]})
+        return
+
+    if isinstance(old, list) and isinstance(new, list) and len(new) > len(old) and new[:len(old)] == old:
+        changes.append({"op": "append", "path": path, "values": new[len(old):]})
+        return
+
+    changes.append({"op": "replace", "path": path, "value": new})
+
+
+def apply_changes(document, changes):
+    """Apply a delta's changes to a decoded document and return the result"""
+    for change in changes:
+        op = change["op"]
+        path = change["path"]
+        if not path:
+            if op != "replace":
+                raise DeltaLogError(f"Cannot {op} the whole document")
+            document = json.loads(json.dumps(change["value"]))
+            continue
+
+        parent = document
+        try:
+            for key in path[:-1]:
+                parent = parent[key]
+        except (KeyError, TypeError):
+            raise DeltaLogError(f"Path {path} does not exist") from None
+        key = path[-1]
+        if not isinstance(parent, dict):
+            raise DeltaLogError(f"Path {path} is not inside an object")
+
+        if op == "add":
+            if key in parent:
+                raise DeltaLogError(f"Cannot add {path}: it already exists")
+            parent[key] = change["value"]
+        elif op == "replace":
+            if key not in parent:
+                raise DeltaLogError(f"Cannot replace {path}: it does not exist")
+            parent[key] = change["value"]
+        elif op == "remove":
+            if key not in parent:
+                raise DeltaLogError(f"Cannot remove {path}: it does not exist")
+            del parent[key]
+        elif op == "append":
+            if not isinstance(parent.get(key), list):
+                raise DeltaLogError(f"Cannot append to {path}: it is not a list")
+            parent[key].extend(change["values"])
+        else:
+            raise DeltaLogError(f"Unknown operation {op!r}")
+    return document
+
+
+class DeltaLog:
+    """The versioned delta log of one status file"""
+
+    def __init__(self, status_path):
+        self.status_path = status_path
+        self.directory = delta_directory(status_path)
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    @staticmethod
+    def baseline_name(version):
+        return f"baseline-{version:06d}.json"
+
+    @staticmethod
+    def delta_name(version):
+        return f"delta-{version:06d}.json"
+
+    def read_head(self):
+        """Return the head record, or None if the log has not been started"""
+        try:
+            with open(self._path(HEAD_NAME), 'r', encoding='utf-8') as f:
+                head = json.load(f)
+        except FileNotFoundError:
+            return None
+        except json.JSONDecodeError as e:
+            raise DeltaLogError(f"Could not read {self._path(HEAD_NAME)}: {str(e)}") from None
+        if head.get("format") != FORMAT_VERSION:
+            raise DeltaLogError(f"Unsupported delta log format {head.get('format')!r}")
+        return head
+
+    def _write_json(self, name, value):
+        status_json.atomic_write_text(self._path(name), status_json.dumps(value))
+
+    def _write_head(self, baseline, version, text):
+        self._write_json(HEAD_NAME, {
+            "format": FORMAT_VERSION,
+            "baseline": baseline,
+            "head": version,
+            "sha256": status_json.text_sha256(text),
+            "size": len(text.encode("utf-8")),
+        })
+
+    def read_delta(self, version):
+        """Load the delta that produces a version"""
+        try:
+            with open(self._path(self.delta_name(version)), 'r', encoding='utf-8') as f:
+                delta = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            raise DeltaLogError(f"Could not read the delta for version {version}: {str(e)}") from None
+        if delta.get("from") != version - 1 or delta.get("to") != version:
+            raise DeltaLogError(f"{self.delta_name(version)} does not lead from version {version - 1} to {version}")
+        return delta
+
+    def reconstruct(self, head=None, version=None):
+        """Rebuild the document at a version (the head by default) from the log"""
+        if head is None:
+            head = self.read_head()
+            if head is None:
+                raise DeltaLogError(f"No delta log in {self.directory}")
+        if version is None:
+            version = head["head"]
+        if not head["baseline"] <= version <= head["head"]:
+            raise DeltaLogError(f"Version {version} is outside {head['baseline']}..{head['head']}")
+
+        try:
+            with open(self._path(self.baseline_name(head["baseline"])), 'r', encoding='utf-8') as f:
+                document = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            raise DeltaLogError(f"Could not read the baseline: {str(e)}") from None
+        for delta_version in range(head["baseline"] + 1, version + 1):
+            document = apply_changes(document, self.read_delta(delta_version)["changes"])
+        return document
+
+    def prepare(self, status_file, changed):
+        """Capture what a save is about to overwrite; called before writing
+
+        When the file on disk is the log's head and the changed entries are
+        known, only the previous text of those entries is decoded. Otherwise
+        the whole previous document is compared at record time.
+        """
+        head = self.read_head()
+        if (head is not None and changed is not None and status_file.fragments_complete
+                and status_file.sha256 == head["sha256"]):
+            previous = {}
+            for key in changed:
+                fragment = status_file.fragments.get(key)
+                previous[key] = _MISSING if fragment is None else json.loads(fragment)
+            return head, dict(status_file.sections), previous
+
+        if head is None:
+            # Start the log from whatever the save replaces
+            try:
+                with open(self.status_path, 'r', encoding='utf-8') as f:
+                    return None, None, json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                return None, None, _MISSING
+
+        if status_file.sha256 != head["sha256"]:
+            logger.info("%s changed outside the delta log; the next delta compares whole documents",
+                        self.status_path)
+        return head, None, None
+
+    def _entry_changes(self, sections, previous, data):
+        """List the changes for the changed entries, or None if that is not enough
+
+        sections maps each old section to its text if it was not split into
+        entries. Entries outside previous are taken to be unchanged.
+        """
+        if list(data)[:len(sections)] != list(sections):
+            return None
+
+        changes = []
+        for (section, key), old in previous.items():
+            # Sections that stopped being dicts are replaced whole below
+            if old is not _MISSING and isinstance(data[section], Mapping) and key not in data[section]:
+                changes.append({"op": "remove", "path": [section, key]})
+
+        for section, entries in data.items():
+            if section not in sections:
+                changes.append({"op": "add", "path": [section], "value": entries})
+                continue
+            old_text = sections[section]
+            if old_text is not None or not isinstance(entries, Mapping) or not entries:
+                if old_text is None or status_json.dumps(entries) != old_text:
+                    changes.append({"op": "replace", "path": [section], "value": entries})
+                continue
+
+            # Walk the section so new entries are added in document order
+            adding = False
+            for key in entries:
+                if (section, key) not in previous:
+                    if adding:
+                        # An old entry after a new one: adds would land in the wrong place
+                        return None
+                    continue
+                old = previous[(section, key)]
+                if old is _MISSING:
+                    adding = True
+                    changes.append({"op": "add", "path": [section, key], "value": entries[key]})
+                else:
+                    if adding:
+                        return None
+                    diff_values(old, entries[key], [section, key], changes)
+        return changes
+
+    def record(self, pending, data, text):
+        """Write the delta for a save that just wrote text; called after writing"""
+        head, sections, previous = pending
+        os.makedirs(self.directory, exist_ok=True)
+
+        if head is None:
+            if previous is _MISSING:
+                # A brand new file is its own baseline
+                self._write_json(self.baseline_name(0), data)
+                self._write_head(0, 0, text)
+                return
+            self._write_json(self.baseline_name(0), previous)
+            head = {"baseline": 0, "head": 0, "sha256": None}
+
+        if status_json.text_sha256(text) == head["sha256"]:
+            return
+
+        changes = None
+        if sections is not None:
+            changes = self._entry_changes(sections, previous, data)
+        if changes is None:
+            old_document = previous if sections is None and previous is not None else self.reconstruct(head)
+            changes = []
+            diff_values(old_document, data, [], changes)
+
+        version = head["head"] + 1
+        # The delta goes first so the head never points at a missing file
+        self._write_json(self.delta_name(version), {
+            "format": FORMAT_VERSION,
+            "from": version - 1,
+            "to": version,
+            "sha256": status_json.text_sha256(text),
+            "changes": changes,
+        })
+        self._write_head(head["baseline"], version, text)
+        logger.info("Recorded version %d of %s with %d changes", version, self.status_path, len(changes))
+
+    def verify(self):
+        """Check that the baseline plus every delta reproduces the status file
+
+        Returns the head version; raises DeltaLogError if anything does not
+        match.
+        """
+        head = self.read_head()
+        if head is None:
+            raise DeltaLogError(f"No delta log in {self.directory}")
+
+        text = status_json.dumps(self.reconstruct(head))
+        with open(self.status_path, 'rb') as f:
+            on_disk = f.read()
+        if text.encode("utf-8") != on_disk:
+            raise DeltaLogError(f"Baseline {head['baseline']} plus deltas through {head['head']} "
+                                f"do not reproduce {self.status_path}")
+        if status_json.text_sha256(text) != head["sha256"]:
+            raise DeltaLogError(f"{self.status_path} matches the deltas but not the head's hash")
+        return head["head"]
+
+    def compact(self, keep=0):
+        """Fold all but the last keep deltas into a new baseline
+
+        Returns the new baseline version.
+        """
+        head = self.read_head()
+        if head is None:
+            raise DeltaLogError(f"No delta log in {self.directory}")
+        baseline = max(head["head"] - keep, head["baseline"])
+        if baseline == head["baseline"]:
+            return baseline
+
+        # Write the new baseline and point the head at it before removing anything. The head
+        # keeps the hash of its version, so a file edited since is still seen as changed
+        self._write_json(self.baseline_name(baseline), self.reconstruct(head, baseline))
+        self._write_json(HEAD_NAME, dict(head, baseline=baseline))
+
+        os.remove(self._path(self.baseline_name(head["baseline"])))
+        for version in range(head["baseline"] + 1, baseline + 1):
+            try:
+                os.remove(self._path(self.delta_name(version)))
+            except FileNotFoundError:
+                pass
+        logger.info("Compacted %s to baseline %d", self.directory, baseline)
+        return baseline
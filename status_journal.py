@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""Append-only journal of the merge operations applied to a status document.
+
+Every save that merges reports appends one batch to a journal kept next to
+the status file, e.g. in Resources/mod-status-journal/ for
+Resources/mod-status.json, before the file itself is written:
+
+    journal.jsonl             one {"batch", "time", "operations", "sha256"} per line,
+                              each followed by {"committed": batch} once the file is written
+    checkpoint.json           {"format", "batch", "offset", "sha256"}
+    checkpoint-document.json  the status file as of the checkpoint's batch
+
+An operation is one change made by a merge, recorded with whatever it
+replaced: "set" a key (with its "old" value if it had one), "delete" a key,
+"append" or "insert" a value into a list, or "remove" one from it. Each can
+be inverted on its own, so undoing a batch only touches what the batch did;
+the undo is journaled as a new batch with the inverse operations and an
+"undo" field naming the batch it reverts. The journal only ever grows.
+
+The checkpoint document plus the batches after offset rebuild the status
+file; sha256 is the hash of the file after each batch. recover() does that
+when the last batch was journaled but never marked committed, i.e. the file
+was not written, and a new checkpoint every CHECKPOINT_INTERVAL batches
+keeps that replay short. A file that differs from the last committed batch
+otherwise, e.g. reverted with git, was changed outside the journal and
+becomes the new checkpoint.
+
+The journal is per-machine state and is not meant to be committed.
+"""
+import copy
+import json
+import logging
+import os
+import time
+from collections.abc import Mapping
+
+import status_json
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+JOURNAL_NAME = "journal.jsonl"
+CHECKPOINT_NAME = "checkpoint.json"
+CHECKPOINT_DOCUMENT_NAME = "checkpoint-document.json"
+CHECKPOINT_INTERVAL = 50
+
+_MISSING = object()
+
+
+class JournalError(Exception):
+    """Raised when the journal is unreadable or a batch cannot be undone"""
+
+
+def journal_directory(status_path):
+    """Return the journal directory kept next to a status file"""
+    return os.path.splitext(status_path)[0] + "-journal"
+
+
+def database_journal(database_path, document):
+    """Return the merge journal of a document kept in a SQLite database"""
+    return MergeJournal(None, f"{os.path.splitext(database_path)[0]}-{document}-journal")
+
+
+def _parent(document, path):
+    """Return the container holding the last key of path"""
+    parent = document
+    try:
+        for key in path[:-1]:
+            parent = parent[key]
+    except (KeyError, IndexError, TypeError):
+        raise JournalError(f"Path {path} does not exist") from None
+    return parent
+
+
+def _get(document, path):
+    """Return the value at path, or _MISSING"""
+    if not path:
+        return document
+    parent = _parent(document, path)
+    try:
+        return parent[path[-1]]
+    except (KeyError, IndexError, TypeError):
+        return _MISSING
+
+
+def apply_operation(document, operation):
+    """Apply one journaled operation to a decoded document"""
+    op = operation["op"]
+    path = operation["path"]
+    parent = _parent(document, path)
+    key = path[-1]
+    if op == "set":
+        parent[key] = operation["value"]
+    elif op == "delete":
+        if key not in parent:
+            raise JournalError(f"Cannot delete {path}: it does not exist")
+        del parent[key]
+    elif op in ("append", "insert", "remove"):
+        values = parent.get(key) if hasattr(parent, "get") else None
+        if not isinstance(values, list):
+            raise JournalError(f"Cannot {op} at {path}: it is not a list")
+        if op == "append":
+            values.append(operation["value"])
+        elif op == "insert":
+            values.insert(operation["index"], operation["value"])
+        else:
+            del values[operation["index"]]
+    else:
+        raise JournalError(f"Unknown operation {op!r}")
+
+
+def invert_operation(document, operation):
+    """Return the operation undoing one applied to document earlier
+
+    Raises JournalError if a later change got in the way, e.g. the value a
+    batch set has since been replaced.
+    """
+    op = operation["op"]
+    path = operation["path"]
+    current = _get(document, path)
+    if op == "set":
+        if current is _MISSING or current != operation["value"]:
+            raise JournalError(f"{path} was changed after the batch")
+        if "old" in operation:
+            return {"op": "set", "path": path, "value": operation["old"], "old": operation["value"]}
+        return {"op": "delete", "path": path, "old": operation["value"]}
+    if op == "delete":
+        if current is not _MISSING:
+            raise JournalError(f"{path} was set again after the batch")
+        return {"op": "set", "path": path, "value": operation["old"]}
+    if not isinstance(current, list):
+        raise JournalError(f"{path} is no longer a list")
+    if op in ("append", "insert"):
+        value = operation["value"]
+        index = operation.get("index", len(current) - 1)
+        if not (0 <= index < len(current) and current[index] == value):
+            # Later batches moved it; take the last copy
+            if value not in current:
+                raise JournalError(f"{value!r} was removed from {path} after the batch")
+            index = len(current) - 1 - current[::-1].index(value)
+        return {"op": "remove", "path": path, "index": index, "value": value}
+    if op == "remove":
+        index = min(operation["index"], len(current))
+        return {"op": "insert", "path": path, "index": index, "value": operation["value"]}
+    raise JournalError(f"Unknown operation {op!r}")
+
+
+def _copy_touched(document, operations):
+    """Copy the sections and entries of document that operations touch"""
+    copied = {}
+    sections = {operation["path"][0] for operation in operations if len(operation["path"]) == 1}
+    for section in sections:
+        if section in document:
+            copied[section] = copy.deepcopy(dict(document[section]) if isinstance(document[section], Mapping)
+                                            else document[section])
+    for operation in operations:
+        section, key = operation["path"][:2] if len(operation["path"]) > 1 else (operation["path"][0], None)
+        if section in sections or section not in document:
+            continue
+        entries = copied.setdefault(section, {})
+        if key not in entries and key in document[section]:
+            entries[key] = copy.deepcopy(document[section][key])
+    return copied
+
+
+def changed_entries(operations):
+    """Return the (section, key) pairs operations touch, or None if they touch whole sections"""
+    changed = set()
+    for operation in operations:
+        path = operation["path"]
+        if len(path) < 2:
+            return None
+        changed.add((path[0], path[1]))
+    return changed
+
+
+class MergeJournal:
+    """The merge journal of one status file
+
+    A journal with no status_path only records batches for undo, e.g. for a
+    document kept in SQLite, whose saves are transactions of their own.
+    """
+
+    def __init__(self, status_path, directory=None):
+        self.status_path = status_path
+        self.directory = directory or journal_directory(status_path)
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def read_checkpoint(self):
+        """Return the checkpoint record, or None if the journal has not been started"""
+        try:
+            with open(self._path(CHECKPOINT_NAME), 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except FileNotFoundError:
+            return None
+        except json.JSONDecodeError as e:
+            raise JournalError(f"Could not read {self._path(CHECKPOINT_NAME)}: {str(e)}") from None
+        if checkpoint.get("format") != FORMAT_VERSION:
+            raise JournalError(f"Unsupported journal format {checkpoint.get('format')!r}")
+        return checkpoint
+
+    def read_batches(self, offset=0):
+        """Return the batches recorded from a byte offset of the journal on
+
+        A last line cut short by a crash is ignored; the next append
+        replaces it.
+        """
+        return [line for line in self._read_lines(offset) if "batch" in line]
+
+    def _read_lines(self, offset=0):
+        """Return the batches and commit markers recorded from a byte offset of the journal on"""
+        batches = []
+        try:
+            with open(self._path(JOURNAL_NAME), 'rb') as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        logger.warning("Ignoring an incomplete batch at the end of %s", self._path(JOURNAL_NAME))
+                        break
+                    try:
+                        batches.append(json.loads(line))
+                    except json.JSONDecodeError as e:
+                        raise JournalError(f"Could not read {self._path(JOURNAL_NAME)}: {str(e)}") from None
+        except FileNotFoundError:
+            pass
+        return batches
+
+    def _tail(self):
+        """Return (offset just past the last complete line, that line) of the journal"""
+        try:
+            with open(self._path(JOURNAL_NAME), 'rb') as f:
+                size = f.seek(0, os.SEEK_END)
+                end = None
+                tail = b""
+                position = size
+                while position:
+                    start = max(0, position - 65536)
+                    f.seek(start)
+                    tail = f.read(position - start) + tail
+                    position = start
+                    if end is None:
+                        newline = tail.rfind(b"\n")
+                        if newline == -1:
+                            continue
+                        end = position + newline + 1
+                        tail = tail[:newline + 1]
+                    previous = tail.rfind(b"\n", 0, len(tail) - 1)
+                    if previous != -1:
+                        return end, tail[previous + 1:]
+                if end is not None:
+                    return end, tail
+        except FileNotFoundError:
+            pass
+        return 0, b""
+
+    def _journal_end(self):
+        """Return the offset just past the last complete line of the journal"""
+        return self._tail()[0]
+
+    def _last_line(self):
+        """Return the last complete line of the journal, a batch or a commit marker, or None"""
+        line = self._tail()[1]
+        if not line:
+            return None
+        try:
+            return json.loads(line)
+        except json.JSONDecodeError as e:
+            raise JournalError(f"Could not read {self._path(JOURNAL_NAME)}: {str(e)}") from None
+
+    def last_batch_number(self):
+        """Return the number of the last batch, 0 if there is none"""
+        line = self._last_line()
+        if line is None:
+            return 0
+        try:
+            return line["committed"] if "committed" in line else line["batch"]
+        except KeyError as e:
+            raise JournalError(f"Could not read {self._path(JOURNAL_NAME)}: missing {str(e)}") from None
+
+    def record(self, operations, sha256=None, undo=None):
+        """Append a batch of operations, durably, and return its number
+
+        sha256 is the hash of the status file once the batch is saved, and
+        undo the number of the batch it reverts, if it is an undo.
+        """
+        batch = {
+            "batch": self.last_batch_number() + 1,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "operations": operations,
+            "sha256": sha256,
+        }
+        if undo is not None:
+            batch["undo"] = undo
+        self._append(batch)
+        logger.info("Journaled batch %d with %d operations for %s", batch["batch"], len(operations),
+                    self.status_path)
+        return batch["batch"]
+
+    def _append(self, record):
+        """Append one line to the journal, durably"""
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"),
+                          default=status_json._encode_mapping) + "\n"
+        end = self._journal_end()
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(JOURNAL_NAME), 'ab') as f:
+            if f.tell() != end:
+                # Drop a line left incomplete by a crash
+                f.truncate(end)
+                f.seek(end)
+            f.write(line.encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def commit(self):
+        """Mark the last batch committed, once the status file holding it has been written"""
+        line = self._last_line()
+        if line is not None and "batch" in line:
+            self._append({"committed": line["batch"]})
+
+    def checkpoint(self, text):
+        """Make the status file text, as of the last batch, the new starting point for replay"""
+        os.makedirs(self.directory, exist_ok=True)
+        status_json.atomic_write_text(self._path(CHECKPOINT_DOCUMENT_NAME), text)
+        status_json.atomic_write_text(self._path(CHECKPOINT_NAME), status_json.dumps({
+            "format": FORMAT_VERSION,
+            "batch": self.last_batch_number(),
+            "offset": self._journal_end(),
+            "sha256": status_json.text_sha256(text),
+        }))
+
+    def prepare(self):
+        """Start the journal from the status file on disk before its first batch is recorded"""
+        if self.read_checkpoint() is not None:
+            return
+        try:
+            with open(self.status_path, 'r', encoding='utf-8') as f:
+                self.checkpoint(f.read())
+        except FileNotFoundError:
+            # A new file: the checkpoint is taken once it is written
+            pass
+
+    def saved(self, text):
+        """Mark the batch just saved committed, and take a checkpoint if replay would otherwise grow too long"""
+        self.commit()
+        checkpoint = self.read_checkpoint()
+        if checkpoint is None or len(self.read_batches(checkpoint["offset"])) >= CHECKPOINT_INTERVAL:
+            self.checkpoint(text)
+
+    def replay(self, checkpoint=None):
+        """Rebuild the document from the checkpoint and the batches after it
+
+        Returns (document, expected sha256 of its text).
+        """
+        if checkpoint is None:
+            checkpoint = self.read_checkpoint()
+            if checkpoint is None:
+                raise JournalError(f"No journal in {self.directory}")
+        try:
+            with open(self._path(CHECKPOINT_DOCUMENT_NAME), 'r', encoding='utf-8') as f:
+                document = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            raise JournalError(f"Could not read the checkpoint document: {str(e)}") from None
+
+        sha256 = checkpoint["sha256"]
+        for batch in self.read_batches(checkpoint["offset"]):
+            for operation in batch["operations"]:
+                apply_operation(document, operation)
+            sha256 = batch["sha256"]
+        return document, sha256
+
+    def recover(self):
+        """Bring the status file up to date with the journal
+
+        Only a last batch that was journaled but never marked committed is
+        replayed, and only while the file still has the state from before
+        it, or is missing or unreadable: its save was cut short. A file
+        that differs otherwise was changed outside the journal, e.g.
+        reverted with git, and becomes the new checkpoint. Returns True if
+        the file was rewritten.
+        """
+        checkpoint = self.read_checkpoint() if self.status_path is not None else None
+        if checkpoint is None:
+            return False
+        lines = self._read_lines(checkpoint["offset"])
+        batches = [line for line in lines if "batch" in line]
+        expected = batches[-1]["sha256"] if batches else checkpoint["sha256"]
+        try:
+            with open(self.status_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except FileNotFoundError:
+            text = None
+        sha256 = None if text is None else status_json.text_sha256(text)
+        uncommitted = bool(batches) and "batch" in lines[-1]
+        if expected is None or sha256 == expected:
+            if uncommitted and expected is not None:
+                # The file was written, only its marker was not
+                self.commit()
+            return False
+
+        before = batches[-2]["sha256"] if len(batches) > 1 else checkpoint["sha256"]
+        if not (uncommitted and sha256 == before):
+            readable = text is not None
+            if readable:
+                try:
+                    json.loads(text)
+                except json.JSONDecodeError:
+                    readable = False
+            if readable:
+                logger.info("%s changed outside the journal; checkpointing it", self.status_path)
+                self.checkpoint(text)
+                return False
+            if not uncommitted:
+                logger.error("%s is missing or unreadable, and its journal has no unfinished save to "
+                             "recover it from", self.status_path)
+                return False
+
+        try:
+            document, sha256 = self.replay(checkpoint)
+        except JournalError as e:
+            logger.error("Could not recover %s from its journal: %s", self.status_path, str(e))
+            return False
+        text = status_json.dumps(document)
+        if status_json.text_sha256(text) != sha256:
+            logger.error("Could not recover %s: replaying its journal does not reproduce the last save",
+                         self.status_path)
+            return False
+        status_json.atomic_write_text(self.status_path, text)
+        self.commit()
+        logger.warning("Recovered %s from its journal", self.status_path)
+        return True
+
+    def undoable_batch(self):
+        """Return the number of the latest batch that is neither an undo nor undone, or None"""
+        undone = set()
+        for batch in reversed(self.read_batches()):
+            if "undo" in batch:
+                undone.add(batch["undo"])
+            elif batch["batch"] not in undone:
+                return batch["batch"]
+        return None
+
+    def undo(self, document, number):
+        """Invert a batch's operations on document, newest first
+
+        Returns the inverse operations, to be saved as a new batch with
+        undo=number. If the batch cannot be undone, raises JournalError and
+        leaves document as it was.
+        """
+        target = None
+        for batch in self.read_batches():
+            if batch["batch"] == number:
+                target = batch
+            elif batch.get("undo") == number:
+                raise JournalError(f"Batch {number} was already undone by batch {batch['batch']}")
+        if target is None:
+            raise JournalError(f"There is no batch {number} in {self.directory}")
+
+        # Work the inverse out on a copy first, so a conflict halfway leaves nothing to roll back
+        scratch = _copy_touched(document, target["operations"])
+        inverse = []
+        try:
+            for operation in reversed(target["operations"]):
+                undo_operation = invert_operation(scratch, operation)
+                apply_operation(scratch, undo_operation)
+                inverse.append(undo_operation)
+        except JournalError as e:
+            raise JournalError(f"Cannot undo batch {number}: {str(e)}") from None
+        for undo_operation in inverse:
+            apply_operation(document, undo_operation)
+        return inverse
+
+
+def format_history(batches, limit=20):
+    """List the latest batches of a journal for the console"""
+    undone = {batch["undo"]: batch["batch"] for batch in batches if "undo" in batch}
+    lines = []
+    for batch in batches[-limit:]:
+        line = f"{batch['batch']:>6}  {batch['time']}  {len(batch['operations'])} operations"
+        if "undo" in batch:
+            line += f"  (undoes batch {batch['undo']})"
+        if batch["batch"] in undone:
+            line += f"  (undone by batch {undone[batch['batch']]})"
+        lines.append(line)
+    return "\n".join(lines) if lines else "No batches journaled yet."
@@ -0,0 +1,654 @@
+#!/usr/bin/env python3
+"""Atomic, incremental persistence of the status JSON documents.
+
+Both status files are two-level documents: top-level sections ("Mod
+Statuses", "Labels", ...) holding one entry per game, label or author. The
+serialized text of every entry is cached, so a save only re-encodes the
+entries a merge touched and splices the rest back in unchanged. The output is
+byte-for-byte what json.dump(data, f, indent=2, ensure_ascii=False) writes.
+
+A document can also be loaded lazily: its sections become LazySection
+mappings that only decode an entry, such as one game's statuses, the first
+time it is accessed.
+
+The same cached text tells which entries changed when the file is edited
+on disk while it is loaded, e.g. by a git pull: read_disk_changes() only
+decodes the entries whose text differs, and save() refuses to overwrite a
+file that changed since it was last read or written.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+from collections.abc import Mapping, MutableMapping
+
+import status_model
+
+logger = logging.getLogger(__name__)
+
+INDENT = "  "
+ENTRY_INDENT = INDENT * 2
+
+
+def _encode_mapping(value):
+    """Let json encode mappings that are not dicts, such as lazy sections"""
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value):
+    """Serialize a value in the repository's JSON layout"""
+    return json.dumps(value, indent=2, ensure_ascii=False, default=_encode_mapping)
+
+
+_UNLOADED = object()
+
+
+class LazySection(MutableMapping):
+    """A document section whose entries are decoded from JSON text on first access
+
+    Iterating over keys and membership tests never decode anything; reading
+    an entry decodes just that entry, with decode.
+    """
+
+    def __init__(self, fragments, decode=json.loads):
+        self._values = dict.fromkeys(fragments, _UNLOADED)
+        self._fragments = fragments
+        self._decode = decode
+
+    def __getitem__(self, key):
+        value = self._values[key]
+        if value is _UNLOADED:
+            value = self._decode(self._fragments.pop(key))
+            self._values[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        self._values[key] = value
+        self._fragments.pop(key, None)
+
+    def __delitem__(self, key):
+        del self._values[key]
+        self._fragments.pop(key, None)
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return f"LazySection({len(self._fragments)} of {len(self._values)} entries not loaded)"
+
+    def is_loaded(self, key):
+        """Check whether an entry has been decoded yet"""
+        return self._values[key] is not _UNLOADED
+
+    def reorder(self, keys):
+        """Put the entries in the order of keys, which must hold every key once"""
+        self._values = {key: self._values[key] for key in keys}
+
+
+def _compact_decoder(section, strings):
+    """Return a LazySection decoder turning each entry into compact records"""
+    def decode(text):
+        return status_model.compact_entry(section, json.loads(text), strings)
+    return decode
+
+
+def _fsync_directory(directory):
+    """Flush a directory entry to disk where the platform allows it"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        # Directories cannot be opened on Windows
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_text(path, text):
+    """Replace a file's contents without ever leaving it half written
+
+    The text goes to a temporary file next to the target, is flushed to disk
+    and then renamed over the target, so readers see either the old or the
+    new file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(temp_path, os.stat(path).st_mode & 0o777)
+        except FileNotFoundError:
+            pass
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_directory(directory)
+
+
+# Lines that can start or end an entry in the indent=2 layout: section
+# headers and closers at two spaces, entry keys at four
+_BOUNDARY = re.compile(r'\n(?:(  )"|(    )"|  \})')
+
+
+def _scan_sections(text):
+    """Split a document's text into its sections and their entries
+
+    Returns a list of (section, entries, value_text) tuples: entries maps each
+    entry key to its serialized text for sections holding a non-empty dict
+    and is None for any other section, whose text is in value_text. Returns
+    None if the text is not in the indent=2 layout. Values are not decoded.
+    """
+    # Tolerate the trailing newline editors like to add
+    if text.endswith("\n"):
+        text = text[:-1]
+    if not text.startswith("{\n") or not text.endswith("\n}"):
+        return None
+
+    decoder = json.JSONDecoder()
+    sections = []
+    entries = None
+    value_start = None
+    entry_key = None
+    entry_start = 0
+
+    for match in _BOUNDARY.finditer(text):
+        if entry_key is not None:
+            # Whatever boundary comes next ends the current entry
+            fragment = text[entry_start:match.start()]
+            if fragment.endswith(","):
+                fragment = fragment[:-1]
+            entries[entry_key] = fragment
+            entry_key = None
+
+        key_start = match.end() - 1
+        if match.group(2):
+            if entries is None:
+                # Deeper lines of a section that is not a dict of entries
+                continue
+            # An entry key inside the current section
+            try:
+                entry_key, end = decoder.raw_decode(text, key_start)
+            except ValueError:
+                return None
+            if not isinstance(entry_key, str) or text[end:end + 2] != ": ":
+                return None
+            entry_start = end + 2
+            continue
+
+        if value_start is not None:
+            # The previous section's value ends where the next section starts
+            value_text = text[value_start:match.start()]
+            sections[-1] = (sections[-1][0], None, value_text[:-1] if value_text.endswith(",") else value_text)
+            value_start = None
+
+        if match.group(1):
+            # A section header; only sections opening a dict hold entries
+            try:
+                key, end = decoder.raw_decode(text, key_start)
+            except ValueError:
+                return None
+            if not isinstance(key, str) or text[end:end + 2] != ": ":
+                return None
+            if text.startswith(": {\n", end):
+                entries = {}
+                sections.append((key, entries, None))
+            else:
+                entries = None
+                value_start = end + 2
+                sections.append((key, None, None))
+        else:
+            # The end of a section
+            entries = None
+
+    if value_start is not None:
+        sections[-1] = (sections[-1][0], None, text[value_start:-2])
+    return sections
+
+
+def _split_entries(text, data):
+    """Recover the serialized text of each entry from a file's contents
+
+    Only files in the indent=2 layout can be split; every recovered fragment
+    is checked against the parsed data, and None is returned if the layout
+    is not recognized.
+    """
+    sections = _scan_sections(text)
+    if sections is None:
+        return None
+
+    fragments = {}
+    for section, entries, _ in sections:
+        if entries is None:
+            continue
+        for entry_key, fragment in entries.items():
+            try:
+                if json.loads(fragment) != data[section][entry_key]:
+                    return None
+            except (ValueError, KeyError, TypeError):
+                return None
+            fragments[(section, entry_key)] = fragment
+    return fragments
+
+
+def _is_exact_layout(text, sections):
+    """Check that scanned sections reproduce text exactly in the indent=2 layout
+
+    Compares piece by piece in place, so no copy of the document is built.
+    """
+    if text.endswith("\n"):
+        text = text[:-1]
+    position = 0
+
+    def expect(piece):
+        nonlocal position
+        if not text.startswith(piece, position):
+            return False
+        position += len(piece)
+        return True
+
+    if not expect("{"):
+        return False
+    for i, (section, entries, value_text) in enumerate(sections):
+        if not expect(f"{',' if i else ''}\n{INDENT}{dumps(section)}: "):
+            return False
+        if entries is None:
+            if not expect(dumps(json.loads(value_text)).replace("\n", "\n" + INDENT)):
+                return False
+            continue
+
+        if not expect("{"):
+            return False
+        for j, (entry_key, fragment) in enumerate(entries.items()):
+            if not _looks_complete(fragment):
+                return False
+            if not expect(f"{',' if j else ''}\n{ENTRY_INDENT}{dumps(entry_key)}: ") or not expect(fragment):
+                return False
+        if not expect(f"\n{INDENT}}}"):
+            return False
+    return expect("\n}") and position == len(text)
+
+
+def _looks_complete(fragment):
+    """Check that a dict or list fragment closes at entry indentation"""
+    if fragment.startswith("{"):
+        return fragment == "{}" or fragment.endswith(f"\n{ENTRY_INDENT}}}")
+    if fragment.startswith("["):
+        return fragment == "[]" or fragment.endswith(f"\n{ENTRY_INDENT}]")
+    return "\n" not in fragment
+
+
+def text_sha256(text):
+    """Hash a document's text as it is written to disk"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _file_state(path):
+    """Return (mtime, size, inode) of a file, which change whenever it is written, or () if it is missing"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return ()
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def _reorder(mapping, keys):
+    """Put a dict's or LazySection's keys in the order of keys, followed by any keys not in it"""
+    listed = set(keys)
+    order = [key for key in keys if key in mapping] + [key for key in mapping if key not in listed]
+    if list(mapping) == order:
+        return
+    if isinstance(mapping, LazySection):
+        mapping.reorder(order)
+    else:
+        # Popping every value first keeps lazy and compact values as they are
+        values = {key: mapping.pop(key) for key in order}
+        mapping.update(values)
+
+
+class StatusFileChangedError(Exception):
+    """Raised when a status file is saved over changes made on disk since it was last read"""
+
+
+class DiskChanges:
+    """The entries of a status file that changed on disk since it was last loaded or saved
+
+    entries maps each changed (section, key) pair to its new value and
+    removed holds the pairs that are gone; a section that is not split into
+    entries is changed or removed as (section, None). conflicts are the
+    changed pairs that also have changes not saved yet.
+    """
+
+    def __init__(self, text, state):
+        self.text = text
+        self.state = state
+        self.entries = {}
+        self.removed = set()
+        self.conflicts = set()
+        # The sections on disk and their keys (None for unsplit sections), in order
+        self.order = []
+        # The serialized text of every entry on disk, or None if the file is not in the indent=2 layout
+        self.fragments = None
+
+    def changed(self):
+        """Return every changed or removed (section, key) pair"""
+        return set(self.entries) | self.removed
+
+    def __len__(self):
+        return len(self.entries) + len(self.removed)
+
+
+class StatusFile:
+    """A status JSON document on disk, saved atomically and incrementally
+
+    A delta log, if given, is told about every save so it can record what
+    changed; see status_delta.DeltaLog. A merge journal, if given, records
+    the operations of each save before the file is written, and brings the
+    file up to date on load if a save was cut short; see
+    status_journal.MergeJournal.
+    """
+
+    def __init__(self, path, delta_log=None, journal=None):
+        self.path = path
+        self.delta_log = delta_log
+        self.journal = journal
+        self.fragments = {}
+        # Whether fragments holds every entry of the document last read or written
+        self.fragments_complete = False
+        # The sections of the document last read or written, in order, with
+        # the text of those that are not split into entries; and its hash
+        # if there is a delta log
+        self.sections = {}
+        self.sha256 = None
+        # The file's state when it was last read or written; None until then
+        self.disk_state = None
+        # (changed, operations) of a save refused because the file had changed on disk
+        self.unsaved = None
+        # Set when the document was loaded as compact records, sharing these strings
+        self.strings = None
+
+    def _remember(self, text, data, fragments_complete):
+        """Record what is on disk after a load or save"""
+        self.fragments_complete = fragments_complete
+        self.sections = {}
+        if not isinstance(data, Mapping):
+            return
+        for section, entries in data.items():
+            self.sections[section] = None if isinstance(entries, Mapping) and entries else dumps(entries)
+        if self.delta_log is not None:
+            self.sha256 = text_sha256(text)
+
+    def load(self, lazy=False, compact=False):
+        """Load the document and remember the serialized text of each entry
+
+        With lazy=True, sections of entries are returned as LazySection
+        mappings that decode an entry only when it is first read. Files that
+        are not in the indent=2 layout are always loaded in full. With
+        compact=True, entries are decoded into the compact records of
+        status_model.
+        """
+        if self.journal is not None:
+            self.journal.recover()
+        # Taken before reading, so a write racing the read shows up as a change
+        self.disk_state = _file_state(self.path)
+        self.unsaved = None
+        self.strings = status_model.StringTable() if compact else None
+        with open(self.path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        if lazy:
+            data = self._load_lazy(text, compact)
+            if data is not None:
+                self._remember(text, data, True)
+                return data
+            logger.info("%s cannot be loaded lazily; loading it in full", self.path)
+
+        data = json.loads(text)
+        fragments = _split_entries(text, data) if isinstance(data, dict) else None
+        if fragments is None and data:
+            logger.info("%s is not in the standard layout; the next save re-encodes it in full", self.path)
+        self.fragments = fragments or {}
+        self._remember(text, data, fragments is not None)
+        if compact:
+            data = status_model.compact_document(data, self.strings)
+        return data
+
+    def _load_lazy(self, text, compact=False):
+        """Build a lazily decoded document from its text, or return None"""
+        sections = _scan_sections(text)
+        # The entries are split without decoding them; make sure putting
+        # them back together gives the file that was read
+        if sections is None or not _is_exact_layout(text, sections):
+            return None
+
+        data = {}
+        fragments = {}
+        strings = self.strings if compact else None
+        for section, entries, value_text in sections:
+            if entries is None:
+                data[section] = json.loads(value_text)
+                continue
+            if compact:
+                entries = {status_model.intern_name(key): fragment for key, fragment in entries.items()}
+            for entry_key, fragment in entries.items():
+                fragments[(section, entry_key)] = fragment
+            data[section] = LazySection(entries, _compact_decoder(section, strings) if compact else json.loads)
+
+        self.fragments = fragments
+        return data
+
+    def invalidate(self, changed=None):
+        """Forget cached entries: the given (section, key) pairs, or all of them"""
+        if changed is None:
+            self.fragments = {}
+            return
+        for key in changed:
+            self.fragments.pop(key, None)
+
+    def dumps(self, data):
+        """Serialize the document, re-encoding only entries not in the cache"""
+        if not isinstance(data, Mapping) or not data:
+            return dumps(data)
+
+        fragments = self.fragments
+        parts = ["{"]
+        sections = []
+        for section, entries in data.items():
+            header = f"\n{INDENT}{dumps(section)}: "
+            if not isinstance(entries, Mapping) or not entries:
+                sections.append(header + dumps(entries).replace("\n", "\n" + INDENT))
+                continue
+
+            lines = []
+            # Look entries up only when they are not cached, so lazy sections stay undecoded
+            for key in entries:
+                fragment = fragments.get((section, key))
+                if fragment is None:
+                    fragment = dumps(entries[key]).replace("\n", "\n" + ENTRY_INDENT)
+                    fragments[(section, key)] = fragment
+                lines.append(f"\n{ENTRY_INDENT}{dumps(key)}: {fragment}")
+            sections.append(header + "{" + ",".join(lines) + f"\n{INDENT}}}")
+
+        parts.append(",".join(sections))
+        parts.append("\n}")
+        return "".join(parts)
+
+    def save(self, data, changed=None, operations=None, undo=None):
+        """Atomically write the document
+
+        changed is an iterable of (section, key) pairs modified since the last
+        load or save; pass None to re-encode everything. operations are the
+        merge operations behind the changes, journaled as one batch if a
+        journal is attached; undo is the batch they revert, if any.
+
+        Raises StatusFileChangedError, without writing anything, if the file
+        changed on disk since it was last read or written. The changes are
+        then kept, and saved along with the next save once the changes on
+        disk have been applied with apply_disk_changes().
+        """
+        if self.unsaved is not None:
+            unsaved_changed, unsaved_operations = self.unsaved
+            changed = None if changed is None or unsaved_changed is None else unsaved_changed | set(changed)
+            operations = unsaved_operations + list(operations or [])
+        if self.changed_on_disk():
+            self.unsaved = (None if changed is None else set(changed), list(operations or []))
+            raise StatusFileChangedError(f"{self.path} changed on disk since it was loaded; "
+                                         "its changes have to be read in before saving")
+        pending = self.delta_log.prepare(self, changed) if self.delta_log is not None else None
+        self.invalidate(changed)
+        text = self.dumps(data)
+        journaled = self.journal is not None and bool(operations)
+        if journaled:
+            self.journal.prepare()
+            self.journal.record(operations, text_sha256(text), undo)
+        atomic_write_text(self.path, text)
+        if journaled:
+            self.journal.saved(text)
+        if pending is not None:
+            self.delta_log.record(pending, data, text)
+        self.unsaved = None
+        self.disk_state = _file_state(self.path)
+        self._remember(text, data, isinstance(data, Mapping))
+
+    def changed_on_disk(self):
+        """Check whether the file was written by someone else since it was last read or written here"""
+        return self.disk_state is not None and _file_state(self.path) != self.disk_state
+
+    def read_disk_changes(self, data):
+        """Read the file again and work out which entries of the loaded data changed on disk
+
+        If the file was last read or written in the indent=2 layout and still
+        is, the text of each entry is compared with the cached text and only
+        changed entries are decoded. Otherwise the whole file is decoded and
+        compared with data. Nothing is changed until apply_disk_changes().
+        Raises OSError or ValueError if the file cannot be read.
+        """
+        state = _file_state(self.path)
+        with open(self.path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        changes = DiskChanges(text, state)
+        sections = _scan_sections(text) if self.fragments_complete else None
+        if sections is not None and _is_exact_layout(text, sections):
+            self._diff_fragments(changes, sections)
+        else:
+            self._diff_values(changes, data, json.loads(text))
+
+        if self.unsaved is None:
+            return changes
+        unsaved_changed = self.unsaved[0]
+        unsaved_sections = set() if unsaved_changed is None else {section for section, _ in unsaved_changed}
+        conflicts = {(section, key) for section, key in changes.changed()
+                     if unsaved_changed is None or (section, key) in unsaved_changed
+                     or (key is None and section in unsaved_sections)}
+        if conflicts:
+            # Unsaved changes hang together, like a mod's status and its
+            # descriptor, so the disk wins for all of them: every entry that
+            # differs from the file is taken from it
+            changes = DiskChanges(text, state)
+            self._diff_values(changes, data, json.loads(text))
+            changes.conflicts = conflicts
+        return changes
+
+    def _diff_fragments(self, changes, sections):
+        """Find the changed entries by comparing their text with the cached text"""
+        old_fragments = self.fragments
+        fragments = {}
+        for section, entries, value_text in sections:
+            changes.order.append((section, None if entries is None else list(entries)))
+            was_split = section in self.sections and self.sections[section] is None
+            if entries is None:
+                value = json.loads(value_text)
+                if was_split or self.sections.get(section) != dumps(value):
+                    changes.entries[(section, None)] = value
+                continue
+
+            for entry_key, fragment in entries.items():
+                fragments[(section, entry_key)] = fragment
+            if not was_split:
+                # A section that was not split into entries before is replaced whole
+                changes.entries[(section, None)] = {key: json.loads(fragment) for key, fragment in entries.items()}
+                continue
+            for entry_key, fragment in entries.items():
+                if old_fragments.get((section, entry_key)) != fragment:
+                    changes.entries[(section, entry_key)] = json.loads(fragment)
+
+        on_disk = {section for section, _ in changes.order}
+        for section, key in old_fragments:
+            if (section, key) not in fragments and section in on_disk and (section, None) not in changes.entries:
+                changes.removed.add((section, key))
+        changes.removed.update((section, None) for section in self.sections if section not in on_disk)
+        changes.fragments = fragments
+
+    def _diff_values(self, changes, data, new):
+        """Find the changed entries by comparing the decoded file with the loaded data"""
+        if not isinstance(new, dict):
+            raise ValueError(f"{self.path} does not hold a JSON object")
+        for section, entries in new.items():
+            current = data.get(section, _UNLOADED)
+            if isinstance(entries, dict) and entries and isinstance(current, Mapping) and current:
+                changes.order.append((section, list(entries)))
+                for key, value in entries.items():
+                    if key not in current or current[key] != value:
+                        changes.entries[(section, key)] = value
+                changes.removed.update((section, key) for key in current if key not in entries)
+            else:
+                changes.order.append((section, None))
+                if current is _UNLOADED or current != entries:
+                    changes.entries[(section, None)] = entries
+        changes.removed.update((section, None) for section in data if section not in new)
+        changes.fragments = _split_entries(changes.text, new)
+
+    def apply_disk_changes(self, data, changes):
+        """Bring the loaded data up to date with the changes read_disk_changes() found
+
+        Changes not saved yet are kept for the next save, unless they
+        conflict with the changes on disk; then all of them are dropped.
+        """
+        for (section, key), value in changes.entries.items():
+            if self.strings is not None:
+                value = (status_model.compact_document({section: value}, self.strings)[section] if key is None
+                         else status_model.compact_entry(section, value, self.strings))
+                key = status_model.intern_name(key)
+            if key is None:
+                data[section] = value
+            else:
+                if not isinstance(data.get(section), MutableMapping):
+                    data[section] = {}
+                data[section][key] = value
+        for section, key in changes.removed:
+            if key is None:
+                data.pop(section, None)
+            elif isinstance(data.get(section), MutableMapping):
+                data[section].pop(key, None)
+
+        # Keep the order the file has on disk, so the next save only differs where it should
+        _reorder(data, [section for section, _ in changes.order])
+        for section, keys in changes.order:
+            if keys is not None and isinstance(data.get(section), MutableMapping):
+                _reorder(data[section], keys)
+
+        if changes.conflicts:
+            self.unsaved = None
+        self.fragments = changes.fragments or {}
+        self.disk_state = changes.state
+        self._remember(changes.text, data, changes.fragments is not None)
+        # The journal replays from its checkpoint, which has to include the changes
+        if self.journal is not None and self.journal.status_path is not None and self.journal.read_checkpoint():
+            self.journal.checkpoint(changes.text)
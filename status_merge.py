@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""Three-way merge of status files edited on two sides.
+
+When reviewers merge reports into their own copies of mod-status.json or
+author-status.json, git merges the files line by line and regularly
+conflicts, or lists a mod under two statuses. merge_status_files() merges
+them by key instead, given the common base and the two sides:
+
+- a mod's status, per game and mod ID, so a mod is only ever listed once
+- an author's place under a label, per label and username
+- every other value, such as a descriptor's reason or a tooltip's link,
+  key by key down to the leaves
+
+A key changed on one side only takes that side's value; a key both sides
+changed to different values is a conflict, reported with its path and
+resolved to the preferred side. Entries that two of the three files hold
+as the same text, which is most of them, are copied as that text without
+being decoded, so merging large files costs little more than reading them.
+
+The output is deterministic: keys keep the order of our side, with keys
+only their side added after them, and merged label author lists are kept
+sorted, as merging reports leaves them. It can serve as a git merge driver:
+
+    # .gitattributes
+    Resources/*-status.json merge=status
+    # .git/config
+    [merge "status"]
+        driver = python status_updater_cli.py merge-files %O %A %B
+"""
+import json
+import os
+from collections.abc import Mapping
+
+import status_json
+from status_updater_core import author_sort_key
+
+OURS = "ours"
+THEIRS = "theirs"
+
+_MISSING = object()
+
+
+class MergeConflict:
+    """One key both sides changed to different values"""
+
+    def __init__(self, path, base, ours, theirs):
+        self.path = path
+        self.base = base
+        self.ours = ours
+        self.theirs = theirs
+
+    def describe(self):
+        """Describe the conflict on one line"""
+        values = ", ".join(f"{side} {_show(value)}" for side, value in
+                           (("base", self.base), (OURS, self.ours), (THEIRS, self.theirs)))
+        return f"{'/'.join(str(key) for key in self.path)}: {values}"
+
+
+def _show(value):
+    """Show a value in a conflict description"""
+    return "(none)" if value is _MISSING else json.dumps(value, ensure_ascii=False)
+
+
+def _keys(ours, theirs):
+    """Return the keys of our side, then those only their side has"""
+    return list(ours) + [key for key in theirs if key not in ours]
+
+
+def _present(base, ours, theirs):
+    """Merge whether a key exists: a side that changed it wins, and ours if both did"""
+    return theirs if ours == base else ours
+
+
+def _mapping(value):
+    return value if isinstance(value, Mapping) else {}
+
+
+def _first_statuses(game_statuses):
+    """Map each mod ID of a game to the first status listing it, as merging reads it"""
+    # Read backwards, so the first listing is the one left standing
+    return {mod_id: status for status, mod_ids in reversed(_mapping(game_statuses).items())
+            if isinstance(mod_ids, list) for mod_id in reversed(mod_ids)}
+
+
+def _label_authors(label_data):
+    authors = _mapping(label_data).get("authors", [])
+    return authors if isinstance(authors, list) else []
+
+
+def _without_authors(label_data):
+    if label_data is _MISSING:
+        return _MISSING
+    return {key: value for key, value in _mapping(label_data).items() if key != "authors"}
+
+
+class StatusMerge:
+    """Merges the entries of three status documents, collecting the conflicts"""
+
+    def __init__(self, prefer=OURS):
+        self.prefer = prefer
+        self.conflicts = []
+        # Entries copied from one side as they are, and entries merged key by key
+        self.copied = 0
+        self.merged = 0
+        self.entry_mergers = {"Mod Statuses": self.mod_statuses, "Labels": self.label}
+
+    def conflict(self, path, base, ours, theirs):
+        """Record a conflict and return the preferred side's value"""
+        self.conflicts.append(MergeConflict(path, base, ours, theirs))
+        return ours if self.prefer == OURS else theirs
+
+    def value(self, path, base, ours, theirs):
+        """Merge any value, recursing into mappings; _MISSING stands for an absent key"""
+        if ours == theirs:
+            return ours
+        if ours == base:
+            return theirs
+        if theirs == base:
+            return ours
+        if isinstance(ours, Mapping) and isinstance(theirs, Mapping) and (base is _MISSING or isinstance(base, Mapping)):
+            return self.mapping(path, base, ours, theirs, self.value)
+        return self.conflict(path, base, ours, theirs)
+
+    def mapping(self, path, base, ours, theirs, merge_item):
+        """Merge mappings key by key with merge_item(path, base, ours, theirs)"""
+        base, ours, theirs = _mapping(base), _mapping(ours), _mapping(theirs)
+        result = {}
+        for key in _keys(ours, theirs):
+            merged = merge_item(path + [key], base.get(key, _MISSING), ours.get(key, _MISSING),
+                                theirs.get(key, _MISSING))
+            if merged is not _MISSING:
+                result[key] = merged
+        return result
+
+    def mod_statuses(self, path, base, ours, theirs):
+        """Merge one game's status lists by mod ID, listing every mod once"""
+        firsts = [_first_statuses(side) for side in (base, ours, theirs)]
+        # Only mods the two sides list differently are merged one by one
+        statuses = firsts[1].copy()
+        differing = {mod_id for mod_id, _ in firsts[1].items() ^ firsts[2].items()}
+        for mod_id in sorted(differing, key=str):
+            status = self.value(path + [mod_id], *(first.get(mod_id, _MISSING) for first in firsts))
+            if status is _MISSING:
+                statuses.pop(mod_id, None)
+            else:
+                statuses[mod_id] = status
+
+        # Each mod goes where our side lists it, or else after those, where theirs does
+        sides = [_mapping(side) for side in (base, ours, theirs)]
+        lists = {status: [] for status in _keys(sides[1], sides[2])}
+        ours_listed = [(status, mod_ids) for status, mod_ids in sides[1].items() if isinstance(mod_ids, list)]
+        ours_unique = sum(len(mod_ids) for _, mod_ids in ours_listed) == len(firsts[1])
+        placed = set()
+        for side_listed in (ours_listed, sides[2].items()):
+            for status, mod_ids in side_listed:
+                if not isinstance(mod_ids, list):
+                    continue
+                if differing.isdisjoint(mod_ids):
+                    # Unchanged mods keep our place; their side has none of these left to place
+                    if side_listed is ours_listed and ours_unique:
+                        lists[status].extend(mod_ids)
+                        placed.update(mod_ids)
+                    if side_listed is ours_listed or ours_unique:
+                        continue
+                kept = list(dict.fromkeys(mod_id for mod_id in mod_ids
+                                          if statuses.get(mod_id) == status and mod_id not in placed))
+                lists[status].extend(kept)
+                placed.update(kept)
+
+        result = {}
+        for status, mod_ids in lists.items():
+            # An emptied status list stays, unless a side removed it; one only added for mods placed elsewhere goes
+            if mod_ids or (_present(*(status in side for side in sides))
+                           and (status in sides[0] or [] in (sides[1].get(status), sides[2].get(status)))):
+                result[status] = mod_ids
+        if not result and not _present(base is not _MISSING, ours is not _MISSING, theirs is not _MISSING):
+            return _MISSING
+        return result
+
+    def label(self, path, base, ours, theirs):
+        """Merge one label by author, keeping its author list sorted"""
+        author_sets = [set(_label_authors(side)) for side in (base, ours, theirs)]
+        authors = [username for username in dict.fromkeys(_keys(_label_authors(ours), _label_authors(theirs)))
+                   if _present(*(username in author_set for author_set in author_sets))]
+        authors.sort(key=author_sort_key)
+
+        rest = self.value(path, _without_authors(base), _without_authors(ours), _without_authors(theirs))
+        label_exists = _present(base is not _MISSING, ours is not _MISSING, theirs is not _MISSING)
+        if not authors and not label_exists:
+            return _MISSING
+        return {"authors": authors, **_mapping(rest)}
+
+
+def _load(path):
+    """Load a status file lazily, keeping the text of its entries; a missing or empty file is an empty document"""
+    status_file = status_json.StatusFile(path)
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return status_file, {}
+    return status_file, status_file.load(lazy=True)
+
+
+def _entry_text(status_file, section_data, section, key):
+    """Return an entry's serialized text, or None if the section does not have it"""
+    if key not in section_data:
+        return None
+    text = status_file.fragments.get((section, key))
+    if text is None:
+        # Only files in the indent=2 layout keep the text of their entries
+        text = status_json.dumps(section_data[key]).replace("\n", "\n" + status_json.ENTRY_INDENT)
+    return text
+
+
+class MergeResult:
+    """A merged status document, with the conflicts and what was merged how
+
+    data is the document; entries copied as they were are decoded when
+    they are first read, and fragments holds their text so writing the
+    document does not re-encode them.
+    """
+
+    def __init__(self, data, fragments, merge):
+        self.data = data
+        self.fragments = fragments
+        self.conflicts = merge.conflicts
+        self.copied = merge.copied
+        self.merged = merge.merged
+
+    def write(self, path):
+        """Write the merged document atomically"""
+        status_file = status_json.StatusFile(path)
+        status_file.fragments = dict(self.fragments)
+        status_file.save(self.data, set())
+
+
+def merge_status_files(base_path, ours_path, theirs_path, prefer=OURS):
+    """Merge two status files edited from a common base into a MergeResult
+
+    Raises OSError or ValueError if a file cannot be read.
+    """
+    files = [_load(path) for path in (base_path, ours_path, theirs_path)]
+    documents = [data for _, data in files]
+    if not all(isinstance(data, Mapping) for data in documents):
+        raise ValueError("A status file does not hold a JSON object")
+    merge = StatusMerge(prefer)
+    data = {}
+    fragments = {}
+
+    for section in _keys(documents[1], documents[2]):
+        sides = [document.get(section, _MISSING) for document in documents]
+        if not all(side is _MISSING or isinstance(side, Mapping) for side in sides):
+            # A section that is not a mapping of entries is merged as one value
+            sides = [side if side is _MISSING or not isinstance(side, Mapping) else dict(side) for side in sides]
+            merged = merge.value([section], *sides)
+            if merged is not _MISSING:
+                data[section] = merged
+            continue
+        if not _present(*(side is not _MISSING for side in sides)):
+            continue
+
+        merge_entry = merge.entry_mergers.get(section, merge.value)
+        sections = [_mapping(side) for side in sides]
+        texts = {}
+        merged_entries = {}
+        for key in _keys(sections[1], sections[2]):
+            base_text, ours_text, theirs_text = (_entry_text(status_file, section_data, section, key)
+                                                 for (status_file, _), section_data in zip(files, sections))
+            # Whichever side changed the entry, if only one did, wins as it is
+            if ours_text == theirs_text or theirs_text == base_text:
+                text = ours_text
+            elif ours_text == base_text:
+                text = theirs_text
+            else:
+                merged = merge_entry([section, key], *(section_data.get(key, _MISSING) for section_data in sections))
+                merge.merged += 1
+                if merged is not _MISSING:
+                    # Holds the entry's place until the merged value replaces it
+                    texts[key] = "null"
+                    merged_entries[key] = merged
+                continue
+            if text is not None:
+                merge.copied += 1
+                texts[key] = text
+                fragments[(section, key)] = text
+
+        section_data = status_json.LazySection(dict(texts))
+        for key, value in merged_entries.items():
+            section_data[key] = value
+        data[section] = section_data
+    return MergeResult(data, fragments, merge)
+
+
+def format_merge_report(result, path, limit=None):
+    """Describe a merge and its conflicts, listing at most limit of them"""
+    lines = [f"Merged {path}: {result.copied} entries taken from one side, {result.merged} merged key by key, "
+             f"{len(result.conflicts)} conflicts"]
+    shown = result.conflicts if limit is None else result.conflicts[:limit]
+    lines.extend(f"  {conflict.describe()}" for conflict in shown)
+    if len(shown) < len(result.conflicts):
+        lines.append(f"  ... and {len(result.conflicts) - len(shown)} more")
+    return "\n".join(lines)
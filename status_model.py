@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""Compact in-memory records for loaded status data.
+
+A decoded status document holds one dict per mod descriptor and author
+tooltip, and the same strings over and over: every game, status and label
+name, every username listed under several labels, and reasons and links
+copied from report to report. Compacting a document replaces those leaf
+dicts with records that keep their values in __slots__, interns the names and
+mod IDs, and keeps one copy of each repeated value in a StringTable.
+
+Records are read-only mappings. Code that reads a document, and
+status_json.dumps(), treat them like the dicts they replace, so a compacted
+document serializes to exactly the same JSON. Only dicts with the keys of a
+record, in its order, are converted; anything else is kept as it is.
+"""
+import sys
+from collections.abc import Mapping
+
+
+class StringTable:
+    """Keeps one copy of each string put through it"""
+
+    __slots__ = ("strings",)
+
+    def __init__(self):
+        self.strings = {}
+
+    def share(self, value):
+        """Return the stored copy of a string, storing it the first time"""
+        if isinstance(value, str):
+            return self.strings.setdefault(value, value)
+        return value
+
+    def __len__(self):
+        return len(self.strings)
+
+
+class Record(Mapping):
+    """A read-only mapping over the keys named in __slots__
+
+    A key the record does not have leaves its slot unset. Keys iterate in
+    __slots__ order, and records compare equal to dicts with the same items.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, values):
+        for name, value in values.items():
+            setattr(self, name, value)
+
+    def __getitem__(self, key):
+        if key in self.__slots__:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self.__slots__ and hasattr(self, key)
+
+    def get(self, key, default=None):
+        # Mapping.get() would go through __getitem__ and an exception for missing keys
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def __iter__(self):
+        return (name for name in self.__slots__ if hasattr(self, name))
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    @classmethod
+    def fits(cls, value):
+        """Check that a dict has only this record's keys, in its order, so it serializes the same"""
+        if not isinstance(value, dict) or len(value) > len(cls.__slots__):
+            return False
+        names = iter(cls.__slots__)
+        return all(key in names for key in value)
+
+    @classmethod
+    def compact(cls, value, strings):
+        """Return a record for a dict that fits, sharing its strings, or the value as it is"""
+        if not cls.fits(value):
+            return value
+        return cls({key: strings.share(item) for key, item in value.items()})
+
+
+class ModDescriptor(Record):
+    """A "Mod Descriptors" entry of one mod"""
+
+    __slots__ = ("reason", "alternative")
+
+
+class AuthorTooltip(Record):
+    """A "Tooltips" entry of one author under one label"""
+
+    __slots__ = ("label", "referenceLink")
+
+
+class ModReport(Record):
+    """A parsed mod report, as returned by status_updater_core.parse_mod_report()"""
+
+    __slots__ = ("game", "id", "status", "reason", "alternative")
+
+    @classmethod
+    def fits(cls, value):
+        # Reports are never written out, so their keys may come in any order
+        return isinstance(value, dict) and all(key in cls.__slots__ for key in value)
+
+
+def intern_name(name):
+    """Intern a game, status, label or user name, or a mod ID"""
+    return sys.intern(name) if isinstance(name, str) else name
+
+
+def _intern_list(names):
+    if not isinstance(names, list):
+        return names
+    return [intern_name(name) for name in names]
+
+
+def compact_entry(section, value, strings):
+    """Compact one entry of a status document section, e.g. one game's descriptors"""
+    if not isinstance(value, dict):
+        return value
+    if section == "Mod Statuses":
+        return {intern_name(status): _intern_list(mod_ids) for status, mod_ids in value.items()}
+    if section == "Mod Descriptors":
+        return {intern_name(mod_id): ModDescriptor.compact(descriptor, strings)
+                for mod_id, descriptor in value.items()}
+    if section == "Tooltips":
+        return {intern_name(label): AuthorTooltip.compact(tooltip, strings) for label, tooltip in value.items()}
+    if section == "Labels":
+        label = dict(value)
+        if "authors" in label:
+            label["authors"] = _intern_list(label["authors"])
+        return label
+    return value
+
+
+def compact_document(data, strings=None):
+    """Return a compacted copy of a decoded status document
+
+    Sections of entries keep their keys, interned, with each entry
+    compacted; other sections are kept as they are.
+    """
+    if not isinstance(data, dict):
+        return data
+    if strings is None:
+        strings = StringTable()
+    compacted = {}
+    for section, entries in data.items():
+        if isinstance(entries, dict):
+            entries = {intern_name(key): compact_entry(section, value, strings) for key, value in entries.items()}
+        compacted[section] = entries
+    return compacted
+
+
+def compact_reports(reports, strings=None):
+    """Return parsed mod reports as ModReport records, sharing their strings"""
+    if strings is None:
+        strings = StringTable()
+    return [ModReport.compact(report, strings) for report in reports]
+
+
+def expand(value):
+    """Turn records back into plain dicts, recursively, e.g. for code that edits them"""
+    if isinstance(value, Mapping):
+        return {key: expand(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [expand(item) for item in value]
+    return value
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""Incremental parsing of bulk report text for the live preview.
+
+The text is held as segments: the lines of one report up to and including the
+separator that ends it, plus a final segment after the last separator. An
+edit only re-splits and re-parses from the segment it starts in until the
+splitting lines up with the old segments again, so typing into one report of
+thousands costs about as much as parsing that report. Splitting follows the
+same rules as status_updater_core.iter_report_blocks.
+"""
+import bisect
+
+import status_updater_core as core
+
+INVALID_REPORT_PREFIX = "Invalid report"
+
+
+# Characters compared at a time when looking for the edited part of the text
+COMPARE_CHUNK = 4096
+
+
+def _is_blank(line):
+    return not line or line.isspace()
+
+
+def _common_prefix_length(a, b, limit):
+    """Count the leading characters a and b share, up to limit"""
+    low = 0
+    while low + COMPARE_CHUNK <= limit and a[low:low + COMPARE_CHUNK] == b[low:low + COMPARE_CHUNK]:
+        low += COMPARE_CHUNK
+
+    # Binary search inside the first chunk that differs
+    start = low
+    high = min(low + COMPARE_CHUNK, limit)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[start:middle] == b[start:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _common_suffix_length(a, b, limit):
+    """Count the trailing characters a and b share, up to limit"""
+    end_a = len(a)
+    end_b = len(b)
+    low = 0
+    while (low + COMPARE_CHUNK <= limit
+           and a[end_a - low - COMPARE_CHUNK:end_a - low] == b[end_b - low - COMPARE_CHUNK:end_b - low]):
+        low += COMPARE_CHUNK
+
+    start = low
+    high = min(low + COMPARE_CHUNK, limit)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[end_a - middle:end_a - start] == b[end_b - middle:end_b - start]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _iter_segments(lines, start, split_on_blank_lines):
+    """Split lines into segments from a segment start
+
+    Yields (report_end, next_start, split_on_blank_lines) per segment: its
+    report lines are lines[segment_start:report_end] and the next segment
+    starts at next_start. The last segment always ends at len(lines).
+    While the mode is undecided, a blank line run only decides it after some
+    text, as in iter_report_blocks.
+    """
+    blank_line_count = 0
+    seen_text = False
+    for i in range(start, len(lines)):
+        line = lines[i]
+        if not line or line.isspace():
+            blank_line_count += 1
+            if blank_line_count >= 2:
+                if split_on_blank_lines is None and seen_text:
+                    split_on_blank_lines = True
+                if split_on_blank_lines:
+                    yield i, i + 1, split_on_blank_lines
+                    blank_line_count = 0
+            continue
+
+        blank_line_count = 0
+        seen_text = True
+        if "-" in line and not line.strip().strip("-"):
+            if split_on_blank_lines is None:
+                split_on_blank_lines = False
+            yield i, i + 1, split_on_blank_lines
+
+    yield len(lines), len(lines), split_on_blank_lines
+
+
+class IncrementalReportParser:
+    """Keeps bulk report text parsed while it is being edited"""
+
+    def __init__(self, parse_report, is_valid, format_report, describe_problem):
+        self.parse_report = parse_report
+        self.is_valid = is_valid
+        self.format_report = format_report
+        self.describe_problem = describe_problem
+
+        self.text = ""
+        self.lines = [""]
+        self.split_on_blank_lines = None
+        # First line of each segment, and per segment a tuple of
+        # (report or None, valid, preview text, preview line count, problem span or None)
+        self.starts = []
+        self.segments = []
+
+    def reports(self):
+        """Return the valid reports in input order"""
+        return [segment[0] for segment in self.segments if segment[1]]
+
+    def problem_spans(self):
+        """Yield the (first_line, last_line) of every report that failed validation"""
+        for start, segment in zip(self.starts, self.segments):
+            span = segment[4]
+            if span is not None:
+                yield start + span[0], start + span[1]
+
+    def _parse_segment(self, lines, start, end):
+        """Parse and render the report in lines[start:end]"""
+        block = core._trim_block(lines[start:end])
+        if block is None:
+            return None, False, "", 0, None
+
+        report = self.parse_report(block)
+        if self.is_valid(report):
+            preview = self.format_report(report)
+            return report, True, preview, preview.count("\n"), None
+
+        first = start
+        while _is_blank(lines[first]):
+            first += 1
+        last = end - 1
+        while _is_blank(lines[last]):
+            last -= 1
+        preview = f"{INVALID_REPORT_PREFIX}: {self.describe_problem(report)}\n  {block[0]}\n\n"
+        return report, False, preview, preview.count("\n"), (first - start, last - start)
+
+    def update(self, text, max_changed_lines=None, progress=None, progress_step=500):
+        """Bring the parse up to date with the edited text
+
+        Returns (first_line, removed_line_count, previews): the preview text
+        changed from first_line on, where removed_line_count old lines are
+        replaced by the (text, valid) previews in order. Returns None and
+        keeps the old state if more than max_changed_lines lines were edited.
+        progress, if given, is called as progress(done_lines, total_lines)
+        every progress_step reports.
+        """
+        if "\r" in text:
+            text = text.replace("\r\n", "\n")
+        old_text = self.text
+        if self.segments and text == old_text:
+            return 0, 0, []
+
+        # Only whole lines outside the edited characters are reused
+        limit = min(len(text), len(old_text))
+        prefix_length = _common_prefix_length(old_text, text, limit)
+        suffix_length = _common_suffix_length(old_text, text, limit - prefix_length)
+        prefix = text.count("\n", 0, prefix_length)
+        edit_start = text.rfind("\n", 0, prefix_length) + 1
+        edit_end = text.find("\n", len(text) - suffix_length)
+        if edit_end < 0:
+            edit_end = len(text)
+        edited_lines = text[edit_start:edit_end].split("\n")
+        new_stop = prefix + len(edited_lines)
+        old_stop = len(self.lines) - text.count("\n", edit_end)
+        if max_changed_lines is not None and new_stop - prefix > max_changed_lines:
+            return None
+
+        lines = self.lines[:prefix] + edited_lines + self.lines[old_stop:]
+
+        starts = self.starts
+        first = max(bisect.bisect_right(starts, prefix) - 1, 0)
+        restart = starts[first] if starts else 0
+        # The first segment is where the separator mode gets decided
+        split_on_blank_lines = self.split_on_blank_lines if first > 0 else None
+        shift = new_stop - old_stop
+
+        new_starts = []
+        new_segments = []
+        resume = len(starts)
+        old_index = first + 1
+        segment_start = restart
+        for report_end, next_start, split_on_blank_lines in _iter_segments(lines, restart, split_on_blank_lines):
+            new_starts.append(segment_start)
+            new_segments.append(self._parse_segment(lines, segment_start, report_end))
+            segment_start = next_start
+            if progress is not None and not len(new_segments) % progress_step:
+                progress(next_start, len(lines))
+
+            # Past the edit, an old segment starting at the same line means
+            # the rest of the old segments are still valid
+            if next_start < new_stop or next_start == len(lines) or split_on_blank_lines != self.split_on_blank_lines:
+                continue
+            old_start = next_start - shift
+            while old_index < len(starts) and starts[old_index] < old_start:
+                old_index += 1
+            if old_index < len(starts) and starts[old_index] == old_start:
+                resume = old_index
+                break
+
+        old_line_counts = [segment[3] for segment in self.segments[:resume]]
+        first_line = sum(old_line_counts[:first])
+        removed_line_count = sum(old_line_counts[first:])
+
+        if shift:
+            self.starts = starts[:first] + new_starts + [start + shift for start in starts[resume:]]
+        else:
+            self.starts[first:resume] = new_starts
+        self.segments[first:resume] = new_segments
+        self.text = text
+        self.lines = lines
+        self.split_on_blank_lines = split_on_blank_lines
+        if progress is not None:
+            progress(len(lines), len(lines))
+
+        return first_line, removed_line_count, [(segment[2], segment[1]) for segment in new_segments]
+
+
+def mod_report_parser():
+    """Create an incremental parser for mod reports"""
+    return IncrementalReportParser(core.parse_mod_report, core.is_valid_mod_report,
+                                   core.format_mod_report_preview, core.describe_mod_report_problem)
+
+
+def author_report_parser():
+    """Create an incremental parser for author reports"""
+    return IncrementalReportParser(core.parse_author_report, core.is_valid_author_report,
+                                   core.format_author_report_preview, core.describe_author_report_problem)
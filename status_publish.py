@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""Per-game shards of the mod status document for the userscript.
+
+A mod page only reads its own game's "Mod Statuses", "Mod Descriptors" and
+"Keyword Rules", so next to mod-status.json each game gets a shard file
+holding just those entries, in the same layout as the full document. A small
+manifest lists every shard's file name, SHA-256 and size, and carries the
+"global" keyword rules every page needs. Clients fetch the manifest and then
+only the shard for the game they are on; mod-status.json keeps being written
+in full for older clients.
+
+Shards are hashed as the UTF-8, LF-terminated text that is committed and
+served; the repository normalizes line endings to LF. The manifest also
+records the hash of mod-status.json it was published from, so a manifest
+left stale by a hand edit, a git merge or merge-files is detected: the next
+save republishes every game, and verify reports it.
+"""
+import hashlib
+import json
+import logging
+import os
+from urllib.parse import quote
+
+import status_json
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "mod-status-manifest.json"
+SHARD_DIRECTORY_NAME = "mod-status-shards"
+MANIFEST_VERSION = 1
+
+SHARDED_SECTIONS = ("Mod Statuses", "Mod Descriptors", "Keyword Rules")
+GLOBAL_RULES_KEY = "global"
+
+
+def publish_paths(mod_status_path):
+    """Return the (manifest path, shard directory) published next to a mod status file"""
+    directory = os.path.dirname(mod_status_path)
+    return os.path.join(directory, MANIFEST_NAME), os.path.join(directory, SHARD_DIRECTORY_NAME)
+
+
+def shard_file_name(game):
+    """Name a game's shard file; the name is URL- and filesystem-safe"""
+    return quote(game, safe="") + ".json"
+
+
+def iter_games(mod_status_data):
+    """Yield every game with statuses, descriptors or its own keyword rules"""
+    seen = set()
+    for section in SHARDED_SECTIONS:
+        for game in mod_status_data.get(section, {}):
+            if game not in seen and not (section == "Keyword Rules" and game == GLOBAL_RULES_KEY):
+                seen.add(game)
+                yield game
+
+
+def build_shard(mod_status_data, game):
+    """Collect the entries of the mod status document a page for one game reads"""
+    shard = {}
+    for section in SHARDED_SECTIONS:
+        entries = mod_status_data.get(section, {})
+        if game in entries:
+            shard[section] = {game: entries[game]}
+    return shard
+
+
+def _describe(text):
+    """Return the manifest's (sha256, size) for a file's text"""
+    data = text.encode("utf-8")
+    return hashlib.sha256(data).hexdigest(), len(data)
+
+
+def _describe_file(path):
+    """Return the manifest's (sha256, size) for a file on disk, or (None, None) if it is missing"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None, None
+    return hashlib.sha256(data).hexdigest(), len(data)
+
+
+def load_manifest(manifest_path):
+    """Load a published manifest, or return None if there is no usable one"""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if (not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION
+            or not isinstance(manifest.get("shards"), dict)):
+        return None
+    return manifest
+
+
+def publish_shards(mod_status_data, mod_status_path, games=None, previous_sha256=None):
+    """Write the per-game shards and the manifest next to a mod status file
+
+    games limits the rewrite to the given games, e.g. the ones a merge
+    touched; the manifest entries of other games are kept as long as their
+    shard files exist. That is only done if the manifest was published from
+    previous_sha256, the hash of the file the save replaced; otherwise, or
+    with games None, every game is checked. Shards whose content did not
+    change are left alone, and the manifest is written last so it never
+    lists a shard that is not on disk yet. Returns the manifest.
+    """
+    manifest_path, shard_directory = publish_paths(mod_status_path)
+    old_manifest = load_manifest(manifest_path)
+    old_shards = old_manifest["shards"] if old_manifest is not None else {}
+    if games is not None and (previous_sha256 is None or old_manifest is None
+                              or old_manifest.get("source", {}).get("sha256") != previous_sha256):
+        logger.info("%s was not published from the file this save replaced; republishing every game",
+                    manifest_path)
+        games = None
+    os.makedirs(shard_directory, exist_ok=True)
+
+    shards = {}
+    written = 0
+    for game in iter_games(mod_status_data):
+        file_name = shard_file_name(game)
+        shard_path = os.path.join(shard_directory, file_name)
+        old_entry = old_shards.get(game)
+        if (games is not None and game not in games and old_entry is not None
+                and old_entry.get("file") == file_name and os.path.exists(shard_path)):
+            shards[game] = old_entry
+            continue
+
+        text = status_json.dumps(build_shard(mod_status_data, game))
+        sha256, size = _describe(text)
+        entry = {"file": file_name, "sha256": sha256, "size": size}
+        if entry != old_entry or not os.path.exists(shard_path):
+            status_json.atomic_write_text(shard_path, text)
+            written += 1
+        shards[game] = entry
+
+    global_rules = mod_status_data.get("Keyword Rules", {}).get(GLOBAL_RULES_KEY, {})
+    sha256, size = _describe_file(mod_status_path)
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "source": {"sha256": sha256, "size": size},
+        "Keyword Rules": {GLOBAL_RULES_KEY: global_rules},
+        "shards": shards,
+    }
+    if manifest != old_manifest:
+        status_json.atomic_write_text(manifest_path, status_json.dumps(manifest))
+
+    # Drop the shards of games that are gone, now that the manifest no longer lists them
+    for game, entry in old_shards.items():
+        if game not in shards and entry.get("file"):
+            try:
+                os.remove(os.path.join(shard_directory, os.path.basename(entry["file"])))
+            except OSError:
+                pass
+
+    logger.info("Published %d game shards (%d rewritten) to %s", len(shards), written, shard_directory)
+    return manifest
+
+
+def manifest_is_stale(mod_status_path):
+    """Check whether the published manifest was built from another version of the mod status file"""
+    manifest = load_manifest(publish_paths(mod_status_path)[0])
+    if manifest is None:
+        return False
+    sha256, size = _describe_file(mod_status_path)
+    return manifest.get("source") != {"sha256": sha256, "size": size}
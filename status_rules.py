@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""Keyword rules: compilation, bulk evaluation and export.
+
+"Keyword Rules" in mod-status.json map "global" or a game to status types,
+each holding a list of {"pattern", "reason", "alternative"} rules. The
+userscript flags a mod whose lowercased breadcrumbs, title and category
+contain a pattern; the game's rules are checked before the global ones, and
+within a scope status types and rules are checked in document order, so the
+first rule in that order that matches wins.
+
+Here every pattern of every scope is compiled into one Aho-Corasick
+automaton, so a text is scanned once no matter how many rules there are,
+and the winner is the matching rule with the best priority. The same
+priority order is exported as a flat rule table for clients.
+"""
+import json
+import os
+from collections import deque
+
+import status_json
+
+GLOBAL_SCOPE = "global"
+RULE_TABLE_NAME = "keyword-rules.json"
+RULE_TABLE_VERSION = 1
+
+# The userscript shows CAUTION rules as INFORMATIVE
+DISPLAY_TYPES = {"CAUTION": "INFORMATIVE"}
+
+
+def iter_rules(keyword_rules, scope):
+    """Yield a scope's rules in the order the userscript checks them"""
+    for status, rules in keyword_rules.get(scope, {}).items():
+        for rule in rules:
+            if isinstance(rule, dict) and isinstance(rule.get("pattern"), str):
+                yield {
+                    "scope": scope,
+                    "status": status,
+                    "type": DISPLAY_TYPES.get(status, status),
+                    "pattern": rule["pattern"],
+                    "needle": rule["pattern"].lower(),
+                    "reason": rule.get("reason"),
+                    "alternative": rule.get("alternative"),
+                }
+
+
+def build_text(title, breadcrumbs="", category=""):
+    """Combine a mod page's texts the way the userscript searches them"""
+    if not isinstance(breadcrumbs, str):
+        breadcrumbs = " ".join(breadcrumbs)
+    return f"{breadcrumbs} {title} {category}".lower()
+
+
+class KeywordAutomaton:
+    """An Aho-Corasick automaton finding every needle contained in a text"""
+
+    def __init__(self, needles):
+        # Per state: transitions, failure link and the needles ending there
+        self.transitions = [{}]
+        outputs = [[]]
+        for needle_id, needle in enumerate(needles):
+            state = 0
+            for character in needle:
+                next_state = self.transitions[state].get(character)
+                if next_state is None:
+                    next_state = len(self.transitions)
+                    self.transitions[state][character] = next_state
+                    self.transitions.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(needle_id)
+
+        self.failures = [0] * len(self.transitions)
+        queue = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for character, next_state in self.transitions[state].items():
+                queue.append(next_state)
+                failure = self.failures[state]
+                while failure and character not in self.transitions[failure]:
+                    failure = self.failures[failure]
+                self.failures[next_state] = self.transitions[failure].get(character, 0)
+                # States are visited breadth first, so the failure state is complete
+                outputs[next_state].extend(outputs[self.failures[next_state]])
+        self.outputs = [tuple(output) for output in outputs]
+
+    def matches(self, text):
+        """Return the set of needle ids contained in text"""
+        transitions = self.transitions
+        failures = self.failures
+        outputs = self.outputs
+        found = set(outputs[0])
+        state = 0
+        for character in text:
+            while state and character not in transitions[state]:
+                state = failures[state]
+            state = transitions[state].get(character, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
+
+
+class KeywordRuleEngine:
+    """All keyword rules of a mod status document, compiled into one automaton"""
+
+    def __init__(self, keyword_rules):
+        self.rules = []
+        self.scopes = {}
+        scopes = [GLOBAL_SCOPE] + [scope for scope in keyword_rules if scope != GLOBAL_SCOPE]
+        for scope in scopes:
+            self.scopes[scope] = []
+            for order, rule in enumerate(iter_rules(keyword_rules, scope)):
+                rule["order"] = order
+                self.scopes[scope].append(len(self.rules))
+                self.rules.append(rule)
+
+        needle_ids = {}
+        self.needle_rules = []
+        for rule_id, rule in enumerate(self.rules):
+            needle_id = needle_ids.setdefault(rule["needle"], len(needle_ids))
+            if needle_id == len(self.needle_rules):
+                self.needle_rules.append([])
+            self.needle_rules[needle_id].append(rule_id)
+        self.automaton = KeywordAutomaton(list(needle_ids))
+
+    def priority(self, rule_id, game):
+        """Sort key of a rule on a game's pages, or None if it does not apply there"""
+        rule = self.rules[rule_id]
+        if rule["scope"] == game and game != GLOBAL_SCOPE:
+            return 0, rule["order"]
+        if rule["scope"] == GLOBAL_SCOPE:
+            return 1, rule["order"]
+        return None
+
+    def matching_rules(self, game, text):
+        """Return the ids of the rules matching a lowercased text, best priority first"""
+        matched = []
+        for needle_id in self.automaton.matches(text):
+            for rule_id in self.needle_rules[needle_id]:
+                key = self.priority(rule_id, game)
+                if key is not None:
+                    matched.append((key, rule_id))
+        matched.sort()
+        return [rule_id for _, rule_id in matched]
+
+    def match(self, game, text):
+        """Return the rule the userscript would apply, or None"""
+        matched = self.matching_rules(game, text)
+        return self.rules[matched[0]] if matched else None
+
+    def unreachable_rules(self):
+        """Yield (rule_id, shadowing_rule_id) for rules that can never win
+
+        A rule whose pattern contains the pattern of a rule that is checked
+        before it on every page it applies to is always shadowed.
+        """
+        for rule_id, rule in enumerate(self.rules):
+            # A rule always matches its own pattern, so anything sorted before it shadows it
+            best = self.matching_rules(rule["scope"], rule["needle"])[0]
+            if best != rule_id:
+                yield rule_id, best
+
+
+class RuleReport:
+    """Results of evaluating keyword rules against a corpus"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.item_count = 0
+        self.matched_count = 0
+        # Per rule: how often it matched and how often it won
+        self.hits = [0] * len(engine.rules)
+        self.wins = [0] * len(engine.rules)
+        # (game, text, winning rule id, [rule ids with another status it shadowed])
+        self.conflicts = []
+
+    def add(self, game, text):
+        """Evaluate one mod page's text"""
+        self.item_count += 1
+        matched = self.engine.matching_rules(game, text)
+        if not matched:
+            return None
+        self.matched_count += 1
+        for rule_id in matched:
+            self.hits[rule_id] += 1
+        winner = matched[0]
+        self.wins[winner] += 1
+
+        winning_type = self.engine.rules[winner]["type"]
+        shadowed = [rule_id for rule_id in matched[1:] if self.engine.rules[rule_id]["type"] != winning_type]
+        if shadowed:
+            self.conflicts.append((game, text, winner, shadowed))
+        return self.engine.rules[winner]
+
+
+def describe_rule(rule):
+    """Name a rule for reports"""
+    return f"{rule['scope']}/{rule['status']} {rule['pattern']!r}"
+
+
+def iter_corpus(lines, default_game=GLOBAL_SCOPE):
+    """Yield (game, text) for each mod page in a corpus
+
+    Each line is either a JSON object with "title" and optional "game",
+    "breadcrumbs" and "category", or "game<TAB>title", or a bare title for
+    default_game. Blank lines are skipped.
+    """
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line.strip():
+            continue
+        if line.lstrip().startswith("{"):
+            item = json.loads(line)
+            yield (item.get("game", default_game),
+                   build_text(item.get("title", ""), item.get("breadcrumbs", ""), item.get("category", "")))
+        elif "\t" in line:
+            game, title = line.split("\t", 1)
+            yield game, build_text(title)
+        else:
+            yield default_game, build_text(line)
+
+
+def evaluate_corpus(keyword_rules, items):
+    """Evaluate every (game, text) in items and return a RuleReport"""
+    report = RuleReport(KeywordRuleEngine(keyword_rules))
+    for game, text in items:
+        report.add(game, text)
+    return report
+
+
+def format_rule_report(report, max_conflicts=20):
+    """Summarize a RuleReport for the console"""
+    engine = report.engine
+    lines = [f"Evaluated {len(engine.rules)} keyword rules against {report.item_count} mod pages: "
+             f"{report.matched_count} matched."]
+
+    lines.append("")
+    lines.append("Rule hits (matched / applied):")
+    for rule_id, rule in enumerate(engine.rules):
+        lines.append(f"  {describe_rule(rule)}: {report.hits[rule_id]} / {report.wins[rule_id]}")
+
+    unreachable = list(engine.unreachable_rules())
+    if unreachable:
+        lines.append("")
+        lines.append("Rules that can never apply:")
+        for rule_id, other_id in unreachable:
+            lines.append(f"  {describe_rule(engine.rules[rule_id])} is always shadowed by "
+                         f"{describe_rule(engine.rules[other_id])}")
+
+    if report.conflicts:
+        lines.append("")
+        lines.append(f"Precedence conflicts ({len(report.conflicts)} pages matched rules of different types):")
+        for game, text, winner, shadowed in report.conflicts[:max_conflicts]:
+            lines.append(f"  [{game}] {text.strip()}")
+            lines.append(f"    applied {describe_rule(engine.rules[winner])} "
+                         f"over {', '.join(describe_rule(engine.rules[rule_id]) for rule_id in shadowed)}")
+        if len(report.conflicts) > max_conflicts:
+            lines.append(f"  ... and {len(report.conflicts) - max_conflicts} more")
+    return "\n".join(lines)
+
+
+def build_rule_table(keyword_rules):
+    """Build the priority-ordered rule table clients consume
+
+    Each scope lists its rules in the order they are checked, with the
+    pattern already lowercased and the status mapped to the type shown. A
+    client checks its game's list and then the global list and applies the
+    first rule whose needle its lowercased text contains.
+    """
+    engine = KeywordRuleEngine(keyword_rules)
+    table = {"version": RULE_TABLE_VERSION, "global": [], "games": {}}
+    for scope, rule_ids in engine.scopes.items():
+        rules = [{key: engine.rules[rule_id][key]
+                  for key in ("needle", "pattern", "status", "type", "reason", "alternative")}
+                 for rule_id in rule_ids]
+        if scope == GLOBAL_SCOPE:
+            table["global"] = rules
+        else:
+            table["games"][scope] = rules
+    return table
+
+
+def rule_table_path(mod_status_path):
+    """Return where the rule table is exported next to a mod status file"""
+    return os.path.join(os.path.dirname(mod_status_path), RULE_TABLE_NAME)
+
+
+def export_rule_table(keyword_rules, path):
+    """Write the rule table and return it"""
+    table = build_rule_table(keyword_rules)
+    status_json.atomic_write_text(path, status_json.dumps(table))
+    return table
@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""SQLite storage for the status documents.
+
+An alternative to keeping each status document as one JSON file that is
+rewritten on every save: the documents live in one SQLite database, a save
+only rewrites the entries a merge touched in a single transaction, and the
+JSON files the userscript reads are regenerated from the database on demand.
+
+Every document keeps its exact shape and order. The sections table holds the
+order of a document's sections, and the entries table the order of the
+entries (games, labels or authors) inside each dict section. Entries in the
+expected shape are spread over indexed tables:
+
+    mod_statuses, mod_status_categories   "Mod Statuses" of mod-status
+    mod_descriptors                       "Mod Descriptors" of mod-status
+    labels, label_authors                 "Labels" of author-status
+    tooltips                              "Tooltips" of author-status
+
+Anything else, such as "Keyword Rules" or an entry in an unexpected shape, is
+kept as JSON text in the entries or sections table, so exporting always
+reproduces the document that was saved.
+"""
+import json
+import logging
+import sqlite3
+import threading
+from collections.abc import Mapping, MutableMapping
+
+import status_json
+import status_model
+
+logger = logging.getLogger(__name__)
+
+MOD_DOCUMENT = "mod-status"
+AUTHOR_DOCUMENT = "author-status"
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sections (
+    document TEXT NOT NULL,
+    name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    value TEXT,
+    PRIMARY KEY (document, name)
+);
+CREATE TABLE IF NOT EXISTS entries (
+    document TEXT NOT NULL,
+    section TEXT NOT NULL,
+    key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    value TEXT,
+    PRIMARY KEY (document, section, key)
+);
+CREATE INDEX IF NOT EXISTS entries_order ON entries (document, section, position);
+CREATE TABLE IF NOT EXISTS mod_status_categories (
+    game TEXT NOT NULL,
+    status TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (game, status)
+);
+CREATE TABLE IF NOT EXISTS mod_statuses (
+    game TEXT NOT NULL,
+    status TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    mod_id TEXT NOT NULL,
+    PRIMARY KEY (game, status, position)
+);
+CREATE INDEX IF NOT EXISTS mod_statuses_mod ON mod_statuses (game, mod_id);
+CREATE TABLE IF NOT EXISTS mod_descriptors (
+    game TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    mod_id TEXT NOT NULL,
+    descriptor TEXT NOT NULL,
+    PRIMARY KEY (game, position)
+);
+CREATE INDEX IF NOT EXISTS mod_descriptors_mod ON mod_descriptors (game, mod_id);
+CREATE TABLE IF NOT EXISTS labels (
+    name TEXT PRIMARY KEY,
+    details TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS label_authors (
+    label TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    username TEXT NOT NULL,
+    PRIMARY KEY (label, position)
+);
+CREATE INDEX IF NOT EXISTS label_authors_username ON label_authors (username);
+CREATE TABLE IF NOT EXISTS tooltips (
+    username TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    label TEXT NOT NULL,
+    tooltip TEXT NOT NULL,
+    PRIMARY KEY (username, position)
+);
+CREATE INDEX IF NOT EXISTS tooltips_label ON tooltips (label);
+"""
+
+
+def _encode(value):
+    """Encode a value for a JSON text column"""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=status_json._encode_mapping)
+
+
+def _is_string_list(value):
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+# Entries with tables of their own, per document and section: (check, write,
+# read, tables). check(value) tells whether an entry fits the tables,
+# write(cursor, key, value) stores it and read(cursor, key) rebuilds it;
+# tables maps each table to the column holding the entry key.
+
+def _write_mod_statuses(cursor, game, categories):
+    cursor.executemany("INSERT INTO mod_status_categories VALUES (?, ?, ?)",
+                       [(game, status, position) for position, status in enumerate(categories)])
+    cursor.executemany("INSERT INTO mod_statuses VALUES (?, ?, ?, ?)",
+                       [(game, status, position, mod_id)
+                        for status, mod_ids in categories.items() for position, mod_id in enumerate(mod_ids)])
+
+
+def _read_mod_statuses(cursor, game):
+    categories = {}
+    for (status,) in cursor.execute(
+            "SELECT status FROM mod_status_categories WHERE game = ? ORDER BY position", (game,)):
+        categories[status] = []
+    for status, mod_id in cursor.execute(
+            "SELECT status, mod_id FROM mod_statuses WHERE game = ? ORDER BY status, position", (game,)):
+        categories[status].append(mod_id)
+    return categories
+
+
+def _write_mod_descriptors(cursor, game, descriptors):
+    cursor.executemany("INSERT INTO mod_descriptors VALUES (?, ?, ?, ?)",
+                       [(game, position, mod_id, _encode(descriptor))
+                        for position, (mod_id, descriptor) in enumerate(descriptors.items())])
+
+
+def _read_mod_descriptors(cursor, game):
+    return {mod_id: json.loads(descriptor) for mod_id, descriptor in cursor.execute(
+        "SELECT mod_id, descriptor FROM mod_descriptors WHERE game = ? ORDER BY position", (game,))}
+
+
+def _write_label(cursor, name, label):
+    # The other fields keep their order around a null placeholder for the authors
+    details = dict(label)
+    details["authors"] = None
+    cursor.execute("INSERT INTO labels VALUES (?, ?)", (name, _encode(details)))
+    cursor.executemany("INSERT INTO label_authors VALUES (?, ?, ?)",
+                       [(name, position, username) for position, username in enumerate(label["authors"])])
+
+
+def _read_label(cursor, name):
+    (details,) = cursor.execute("SELECT details FROM labels WHERE name = ?", (name,)).fetchone()
+    label = json.loads(details)
+    label["authors"] = [username for (username,) in cursor.execute(
+        "SELECT username FROM label_authors WHERE label = ? ORDER BY position", (name,))]
+    return label
+
+
+def _write_tooltips(cursor, username, tooltips):
+    cursor.executemany("INSERT INTO tooltips VALUES (?, ?, ?, ?)",
+                       [(username, position, label, _encode(tooltip))
+                        for position, (label, tooltip) in enumerate(tooltips.items())])
+
+
+def _read_tooltips(cursor, username):
+    return {label: json.loads(tooltip) for label, tooltip in cursor.execute(
+        "SELECT label, tooltip FROM tooltips WHERE username = ? ORDER BY position", (username,))}
+
+
+TABLE_ENTRIES = {
+    (MOD_DOCUMENT, "Mod Statuses"): (
+        lambda value: isinstance(value, Mapping) and all(_is_string_list(ids) for ids in value.values()),
+        _write_mod_statuses, _read_mod_statuses, {"mod_status_categories": "game", "mod_statuses": "game"}),
+    (MOD_DOCUMENT, "Mod Descriptors"): (
+        lambda value: isinstance(value, Mapping),
+        _write_mod_descriptors, _read_mod_descriptors, {"mod_descriptors": "game"}),
+    (AUTHOR_DOCUMENT, "Labels"): (
+        lambda value: isinstance(value, Mapping) and _is_string_list(value.get("authors")),
+        _write_label, _read_label, {"labels": "name", "label_authors": "label"}),
+    (AUTHOR_DOCUMENT, "Tooltips"): (
+        lambda value: isinstance(value, Mapping),
+        _write_tooltips, _read_tooltips, {"tooltips": "username"}),
+}
+
+
+class SqliteSection(MutableMapping):
+    """A document section whose entries are read from the database on first access
+
+    Entries are turned into compact records as they are read if strings, a
+    status_model.StringTable, is given.
+    """
+
+    def __init__(self, store, section, keys, strings=None):
+        self._store = store
+        self._section = section
+        self._values = dict.fromkeys(keys, status_json._UNLOADED)
+        self._strings = strings
+
+    def __getitem__(self, key):
+        value = self._values[key]
+        if value is status_json._UNLOADED:
+            value = self._store.read_entry(self._section, key)
+            if self._strings is not None:
+                value = status_model.compact_entry(self._section, value, self._strings)
+            self._values[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        self._values[key] = value
+
+    def __delitem__(self, key):
+        del self._values[key]
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return f"SqliteSection({self._section!r}, {len(self._values)} entries)"
+
+
+class SqliteStatusStore:
+    """One status document stored in a SQLite database
+
+    Offers the same load() and save() as status_json.StatusFile. json_path
+    is the document's JSON file: it seeds the database the first time the
+    document is loaded, and export() regenerates it. A merge journal, if
+    given, records the operations of each save once its transaction commits.
+    """
+
+    def __init__(self, database_path, document, json_path, journal=None):
+        self.database_path = database_path
+        self.document = document
+        self.json_path = json_path
+        self.journal = journal
+        self.path = f"{database_path} ({document})"
+        self.connection = None
+        # Saves run on worker threads, so the connection is shared under a lock
+        self.lock = threading.RLock()
+
+    def connect(self):
+        """Open the database, creating its tables if needed"""
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.database_path, check_same_thread=False)
+            with self.connection:
+                self.connection.executescript(SCHEMA)
+                self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        return self.connection
+
+    def close(self):
+        """Close the database connection"""
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+    def is_stored(self):
+        """Check whether the document is in the database yet"""
+        with self.lock:
+            row = self.connect().execute("SELECT 1 FROM sections WHERE document = ? LIMIT 1",
+                                         (self.document,)).fetchone()
+        return row is not None
+
+    def import_json(self):
+        """Replace the stored document with the contents of its JSON file"""
+        data = status_json.StatusFile(self.json_path).load()
+        self.save(data)
+        logger.info("Imported %s into %s", self.json_path, self.path)
+        return data
+
+    def load(self, lazy=False, compact=False):
+        """Load the document, importing its JSON file the first time
+
+        With lazy=True, dict sections are returned as SqliteSection mappings
+        that read an entry only when it is first accessed. With compact=True,
+        entries are read into the compact records of status_model.
+        """
+        if not self.is_stored():
+            self.import_json()
+
+        strings = status_model.StringTable() if compact else None
+        with self.lock:
+            cursor = self.connect().cursor()
+            data = {}
+            for name, value in cursor.execute(
+                    "SELECT name, value FROM sections WHERE document = ? ORDER BY position",
+                    (self.document,)).fetchall():
+                if value is not None:
+                    data[name] = json.loads(value)
+                    continue
+                keys = [status_model.intern_name(key) if compact else key for (key,) in cursor.execute(
+                    "SELECT key FROM entries WHERE document = ? AND section = ? ORDER BY position",
+                    (self.document, name))]
+                section = SqliteSection(self, name, keys, strings)
+                if not lazy:
+                    section = {key: section[key] for key in keys}
+                data[name] = section
+        return data
+
+    def read_entry(self, section, key):
+        """Read one entry of a dict section"""
+        with self.lock:
+            cursor = self.connect().cursor()
+            row = cursor.execute("SELECT value FROM entries WHERE document = ? AND section = ? AND key = ?",
+                                 (self.document, section, key)).fetchone()
+            if row is None:
+                raise KeyError(key)
+            if row[0] is not None:
+                return json.loads(row[0])
+            return TABLE_ENTRIES[(self.document, section)][2](cursor, key)
+
+    def _delete_entry(self, cursor, section, key):
+        """Remove an entry; returns its position, or None if it was not stored"""
+        row = cursor.execute("SELECT position, value FROM entries WHERE document = ? AND section = ? AND key = ?",
+                             (self.document, section, key)).fetchone()
+        if row is None:
+            return None
+        if row[1] is None:
+            for table, column in TABLE_ENTRIES[(self.document, section)][3].items():
+                cursor.execute(f"DELETE FROM {table} WHERE {column} = ?", (key,))
+        cursor.execute("DELETE FROM entries WHERE document = ? AND section = ? AND key = ?",
+                       (self.document, section, key))
+        return row[0]
+
+    def _write_entry(self, cursor, section, key, value, position):
+        table = TABLE_ENTRIES.get((self.document, section))
+        if table is not None and table[0](value):
+            table[1](cursor, key, value)
+            text = None
+        else:
+            text = _encode(value)
+        cursor.execute("INSERT INTO entries VALUES (?, ?, ?, ?, ?)", (self.document, section, key, position, text))
+
+    def _write_section(self, cursor, section, entries):
+        """Replace every entry of a dict section"""
+        # Read lazily loaded entries before their rows are deleted
+        items = [(key, entries[key]) for key in entries]
+        table = TABLE_ENTRIES.get((self.document, section))
+        if table is not None:
+            # The tables only hold this section's entries
+            for table_name in table[3]:
+                cursor.execute(f"DELETE FROM {table_name}")
+        cursor.execute("DELETE FROM entries WHERE document = ? AND section = ?", (self.document, section))
+        for position, (key, value) in enumerate(items):
+            self._write_entry(cursor, section, key, value, position)
+
+    def _update_entries(self, cursor, section, entries, keys):
+        """Rewrite some entries of a section, keeping their places
+
+        Entries that are new go after the existing ones, in document order.
+        """
+        (last,) = cursor.execute("SELECT MAX(position) FROM entries WHERE document = ? AND section = ?",
+                                 (self.document, section)).fetchone()
+        positions = {key: self._delete_entry(cursor, section, key) for key in keys}
+        next_position = 0 if last is None else last + 1
+        for key in entries:
+            if key not in positions:
+                continue
+            position = positions[key]
+            if position is None:
+                position = next_position
+                next_position += 1
+            self._write_entry(cursor, section, key, entries[key], position)
+
+    def save(self, data, changed=None, operations=None, undo=None):
+        """Write the document in one transaction
+
+        changed is an iterable of (section, key) pairs modified since the last
+        load or save; pass None to rewrite everything. New entries go after
+        the existing ones, as they do in the JSON file. operations and undo
+        are journaled as in status_json.StatusFile.save().
+        """
+        with self.lock:
+            connection = self.connect()
+            with connection:
+                cursor = connection.cursor()
+                stored = dict(cursor.execute("SELECT name, value IS NULL FROM sections WHERE document = ?",
+                                             (self.document,)).fetchall())
+                rewrite = set()
+                cursor.execute("DELETE FROM sections WHERE document = ?", (self.document,))
+                for position, (section, value) in enumerate(data.items()):
+                    if isinstance(value, Mapping):
+                        cursor.execute("INSERT INTO sections VALUES (?, ?, ?, NULL)",
+                                       (self.document, section, position))
+                        if changed is None or not stored.get(section):
+                            rewrite.add(section)
+                    else:
+                        cursor.execute("INSERT INTO sections VALUES (?, ?, ?, ?)",
+                                       (self.document, section, position, _encode(value)))
+
+                for section, is_dict in stored.items():
+                    if is_dict and not isinstance(data.get(section), Mapping):
+                        self._write_section(cursor, section, {})
+                for section in rewrite:
+                    self._write_section(cursor, section, data[section])
+                changed_keys = {}
+                for section, key in changed or ():
+                    if section not in rewrite and isinstance(data.get(section), Mapping):
+                        changed_keys.setdefault(section, set()).add(key)
+                for section, keys in changed_keys.items():
+                    self._update_entries(cursor, section, data[section], keys)
+            if self.journal is not None and operations:
+                self.journal.record(operations, None, undo)
+
+    def export(self, status_file=None):
+        """Regenerate the document's JSON file from the database
+
+        The file is written through status_file if given, e.g. to record a
+        delta, and is byte-for-byte what saving the document as JSON writes.
+        """
+        data = self.load(lazy=True)
+        if status_file is None:
+            status_file = status_json.StatusFile(self.json_path)
+        status_file.save(data)
+        return data
+
+    def find_mod(self, game, mod_id):
+        """Return the status categories listing a mod, using the index"""
+        with self.lock:
+            return [status for (status,) in self.connect().execute(
+                "SELECT status FROM mod_statuses WHERE game = ? AND mod_id = ? ORDER BY status",
+                (game, mod_id))]
+
+    def labels_for(self, username):
+        """Return the labels an author is listed under, using the index"""
+        with self.lock:
+            return [label for (label,) in self.connect().execute(
+                "SELECT DISTINCT label FROM label_authors WHERE username = ? ORDER BY label", (username,))]
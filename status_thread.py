@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""Reading reports straight from saved forum thread pages.
+
+The thread copier userscript collects the reports posted in the submissions
+thread: the text of every code block (".codebox pre code") that starts with
+"Game Shortname:" or "Username:", leaving out code blocks quoted inside a
+blockquote and posts the reviewer has hidden. It rewrites placeholder
+hyphens to null and joins the reports with separator lines for the
+clipboard.
+
+This does the same for viewtopic.php pages saved to disk, without a browser
+or the clipboard. Pages are parsed as a stream, and a directory of pages is
+read by a pool of worker processes.
+"""
+import concurrent.futures
+import logging
+import os
+import re
+from html.parser import HTMLParser
+
+logger = logging.getLogger(__name__)
+
+MOD_REPORT_PREFIX = "Game Shortname:"
+AUTHOR_REPORT_PREFIX = "Username:"
+SEPARATOR_LINE = "----------------------------------------"
+PAGE_EXTENSIONS = (".html", ".htm")
+READ_SIZE = 1 << 16
+
+# Elements that never have an end tag
+VOID_ELEMENTS = frozenset([
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source", "track", "wbr",
+])
+
+PLACEHOLDER_HYPHEN = re.compile(r":\s*-(\s|$)")
+
+
+def replace_hyphens_with_null(text):
+    """Replace standalone "-" values with "null", leaving Reason lines alone"""
+    lines = text.split("\n")
+    return "\n".join(line if line.startswith("Reason:") else PLACEHOLDER_HYPHEN.sub(r": null\1", line)
+                     for line in lines)
+
+
+class ThreadPageParser(HTMLParser):
+    """Collects the report code blocks of a thread page fed to it piece by piece
+
+    Finished code blocks are appended to code_blocks as (post id, text).
+    """
+
+    def __init__(self, hidden_posts=()):
+        super().__init__(convert_charrefs=True)
+        self.hidden_posts = set(hidden_posts)
+        self.code_blocks = []
+        # Open elements as (tag, role), where role marks the ones that matter here
+        self.stack = []
+        self.depths = {"codebox": 0, "pre": 0, "blockquote": 0, "hidden": 0}
+        self.post_ids = []
+        self.code_depth = 0
+        self.text = []
+
+    def _role(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = (attrs.get("class") or "").split()
+        if "post" in classes:
+            self.post_ids.append(attrs.get("id"))
+            return "hidden" if attrs.get("id") in self.hidden_posts else "post"
+        if "codebox" in classes:
+            return "codebox"
+        if tag == "blockquote":
+            return "blockquote"
+        if tag == "pre" and self.depths["codebox"]:
+            return "pre"
+        if tag == "code" and self.depths["pre"]:
+            return "code"
+        return None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_ELEMENTS:
+            return
+        role = self._role(tag, attrs)
+        self.stack.append((tag, role))
+        if role == "code":
+            self.code_depth += 1
+            if self.code_depth == 1:
+                self.text = []
+        elif role in self.depths:
+            self.depths[role] += 1
+
+    def handle_endtag(self, tag):
+        # Close anything left open inside the element, as browsers do
+        if not any(open_tag == tag for open_tag, _ in self.stack):
+            return
+        while self.stack:
+            open_tag, role = self.stack.pop()
+            self._close(role)
+            if open_tag == tag:
+                return
+
+    def _close(self, role):
+        if role == "code":
+            self.code_depth -= 1
+            if self.code_depth == 0 and not self.depths["blockquote"] and not self.depths["hidden"]:
+                self.code_blocks.append((self.post_ids[-1] if self.post_ids else None, "".join(self.text)))
+        elif role in ("post", "hidden"):
+            self.post_ids.pop()
+            if role == "hidden":
+                self.depths["hidden"] -= 1
+        elif role in self.depths:
+            self.depths[role] -= 1
+
+    def handle_data(self, data):
+        if self.code_depth:
+            self.text.append(data)
+
+
+def iter_code_blocks(f, hidden_posts=()):
+    """Yield (post id, text) for each report-eligible code block of a page
+
+    Reads the page from a file object in pieces, so the whole page is never
+    held as one string.
+    """
+    parser = ThreadPageParser(hidden_posts)
+    while True:
+        data = f.read(READ_SIZE)
+        if not data:
+            break
+        parser.feed(data)
+        yield from parser.code_blocks
+        parser.code_blocks.clear()
+    parser.close()
+    yield from parser.code_blocks
+
+
+def read_thread_page(path, hidden_posts=()):
+    """Return the (mod reports, author reports) posted on a saved thread page"""
+    mod_reports = []
+    author_reports = []
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for _, text in iter_code_blocks(f, hidden_posts):
+            content = text.strip()
+            if content.startswith(MOD_REPORT_PREFIX):
+                mod_reports.append(replace_hyphens_with_null(content))
+            elif content.startswith(AUTHOR_REPORT_PREFIX):
+                author_reports.append(replace_hyphens_with_null(content))
+    return mod_reports, author_reports
+
+
+def join_reports(reports):
+    """Join reports the way the userscript copies them"""
+    return f"\n\n{SEPARATOR_LINE}\n\n".join(reports)
+
+
+def _natural_key(name):
+    """Sort key putting page 25 before page 100"""
+    return [(0, int(part), "") if part.isdigit() else (1, 0, part) for part in re.split(r"(\d+)", name) if part]
+
+
+def find_thread_pages(paths):
+    """Expand directories into the thread pages they contain
+
+    Pages in a directory are taken in natural name order, so the reports
+    keep the thread's order when pages are saved with their page numbers.
+    """
+    pages = []
+    for path in paths:
+        if os.path.isdir(path):
+            names = sorted((name for name in os.listdir(path) if name.lower().endswith(PAGE_EXTENSIONS)),
+                           key=_natural_key)
+            pages.extend(os.path.join(path, name) for name in names)
+        else:
+            pages.append(path)
+    return pages
+
+
+def read_thread_pages(paths, workers=None, hidden_posts=()):
+    """Yield (path, mod reports, author reports) for each page, in order
+
+    Pages are parsed in worker processes, by default one per CPU; with one
+    worker, or a single page, they are read here.
+    """
+    pages = find_thread_pages(paths)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(pages))
+    if workers <= 1:
+        for path in pages:
+            yield (path,) + read_thread_page(path, hidden_posts)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(read_thread_page, pages, [hidden_posts] * len(pages))
+        for path, (mod_reports, author_reports) in zip(pages, results):
+            logger.debug("Read %d mod and %d author reports from %s", len(mod_reports), len(author_reports), path)
+            yield path, mod_reports, author_reports
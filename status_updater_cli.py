@@ -0,0 +1,579 @@
+#!/usr/bin/env python3
+"""Headless batch ingestion of mod and author reports.
+
+Reads report dumps from files or stdin, merges them into the status JSON and
+writes it back, without touching Qt:
+
+    python status_updater_cli.py mods reports.txt more-reports.txt
+    python status_updater_cli.py authors - < author-reports.txt
+    python status_updater_cli.py mods --thread saved-thread-pages/
+    python status_updater_cli.py publish
+    python status_updater_cli.py verify
+    python status_updater_cli.py compact --keep 10
+    python status_updater_cli.py history mods
+    python status_updater_cli.py undo mods 12
+    python status_updater_cli.py audit authors --fix
+    python status_updater_cli.py merge-files base.json ours.json theirs.json
+    python status_updater_cli.py test-rules titles.jsonl
+    python status_updater_cli.py export-rules
+
+With --database, the status documents are kept in a SQLite database instead
+and the JSON files are regenerated from it by the export command:
+
+    python status_updater_cli.py --database status.sqlite3 mods reports.txt
+    python status_updater_cli.py --database status.sqlite3 export
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import sys
+
+import status_json
+import status_updater_core as core
+
+
+def iter_inputs(paths):
+    """Yield a line iterator for each input, reading '-' from stdin"""
+    for path in paths:
+        if path == "-":
+            yield io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                yield f
+
+
+def iter_report_inputs(args, kind):
+    """Yield the report text or lines of each input of a mods or authors run
+
+    With --thread the inputs are saved thread pages or directories of them,
+    read concurrently; each page's reports are joined the way the thread
+    copier userscript copies them.
+    """
+    if not args.thread:
+        yield from iter_inputs(args.inputs)
+        return
+    import status_thread
+    for path, mod_reports, author_reports in status_thread.read_thread_pages(args.inputs, args.jobs,
+                                                                              args.skip_post):
+        reports = mod_reports if kind == "mod" else author_reports
+        if not reports:
+            print(f"Warning: No {kind} reports found in {path}", file=sys.stderr)
+        yield status_thread.join_reports(reports)
+
+
+def open_status_file(args, kind, path):
+    """Return the storage for the mod or author status document: its JSON file or the database"""
+    if args.database:
+        import status_journal
+        import status_sqlite
+        document = status_sqlite.MOD_DOCUMENT if kind == "mod" else status_sqlite.AUTHOR_DOCUMENT
+        return status_sqlite.SqliteStatusStore(args.database, document, path,
+                                               status_journal.database_journal(args.database, document))
+    import status_delta
+    import status_journal
+    return status_json.StatusFile(path, status_delta.DeltaLog(path), status_journal.MergeJournal(path))
+
+
+def load_status_data(status_file, empty_factory, lazy=False):
+    """Load a status document, starting from an empty one if it is missing"""
+    try:
+        return status_file.load(lazy)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"Warning: Could not load {status_file.path}: {str(e)}", file=sys.stderr)
+        return empty_factory()
+
+
+def run_mods(args, timer):
+    """Parse and merge mod reports"""
+    mod_status_file = open_status_file(args, "mod", args.mod_status)
+    mod_status_data = load_status_data(mod_status_file, core.empty_mod_status_data, lazy=True)
+    mod_index = core.ModStatusIndex(mod_status_data)
+
+    # Reports repeated anywhere in the inputs are collapsed before anything is merged
+    collapser = core.ModReportCollapser(args.duplicates)
+    # With --thread the workers read the pages, and each page's reports are parsed here
+    workers = None if args.thread else args.jobs
+    for lines in iter_report_inputs(args, "mod"):
+        with timer.phase("collapse"):
+            core.collect_mod_reports(lines, collapser, timer, workers)
+    reports = collapser.results()
+    with timer.phase("merge"):
+        processed_mods, skipped_mods = core.merge_mod_reports(mod_status_data, reports, mod_index)
+
+    if not processed_mods and not skipped_mods and not collapser.variants:
+        print("No valid mod reports found. Please check the format.", file=sys.stderr)
+        return 1
+
+    if not args.dry_run:
+        changed = mod_index.pop_changed()
+        previous_sha256 = mod_status_file.sha256
+        with timer.phase("serialize"):
+            try:
+                mod_status_file.save(mod_status_data, changed, mod_index.pop_operations())
+            except status_json.StatusFileChangedError as e:
+                print(f"Error: {str(e)}. Nothing was saved; run the command again.", file=sys.stderr)
+                return 1
+            # With a database the shards are published along with the JSON file by export
+            if not args.database:
+                import status_publish
+                status_publish.publish_shards(mod_status_data, args.mod_status, {game for _, game in changed},
+                                              previous_sha256)
+    with timer.phase("validate"):
+        import status_audit
+        audit = status_audit.audit_mods(mod_status_data, {report["game"] for report in reports})
+    print(core.format_mod_save_summary(processed_mods, skipped_mods, args.mod_status,
+                                       collapser.collapsed_messages(), collapser.conflict_messages())
+          + status_audit.format_audit_note(audit))
+    return 0
+
+
+def run_authors(args, timer):
+    """Parse and merge author reports"""
+    author_status_file = open_status_file(args, "author", args.author_status)
+    author_status_data = load_status_data(author_status_file, core.empty_author_status_data)
+    author_index = core.AuthorStatusIndex(author_status_data)
+
+    collapser = core.AuthorReportCollapser(args.duplicates)
+    # With --thread the workers read the pages, and each page's reports are parsed here
+    workers = None if args.thread else args.jobs
+    for lines in iter_report_inputs(args, "author"):
+        with timer.phase("collapse"):
+            core.collect_author_reports(lines, collapser, timer, workers)
+    reports = collapser.results()
+    with timer.phase("merge"):
+        processed_labels, processed_authors, skipped_labels = core.merge_author_reports(
+            author_status_data, reports, author_index)
+
+    if not processed_labels and not skipped_labels and not collapser.variants:
+        print("No valid author reports found. Please check the format.", file=sys.stderr)
+        return 1
+
+    if not args.dry_run:
+        with timer.phase("serialize"):
+            try:
+                author_status_file.save(author_status_data, author_index.pop_changed(),
+                                        author_index.pop_operations())
+            except status_json.StatusFileChangedError as e:
+                print(f"Error: {str(e)}. Nothing was saved; run the command again.", file=sys.stderr)
+                return 1
+    with timer.phase("validate"):
+        import status_audit
+        audit = status_audit.audit_authors(author_status_data, {report["username"] for report in reports},
+                                           author_index)
+    print(core.format_author_save_summary(processed_labels, processed_authors, skipped_labels, args.author_status,
+                                          collapser.collapsed_messages(), collapser.conflict_messages())
+          + status_audit.format_audit_note(audit))
+    return 0
+
+
+def run_publish(args, timer):
+    """Rewrite the per-game shards and manifest from mod-status.json"""
+    import status_publish
+    try:
+        mod_status_data = status_json.StatusFile(args.mod_status).load()
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"Error: Could not load {args.mod_status}: {str(e)}", file=sys.stderr)
+        return 1
+
+    with timer.phase("serialize"):
+        manifest = status_publish.publish_shards(mod_status_data, args.mod_status)
+    manifest_path, shard_directory = status_publish.publish_paths(args.mod_status)
+    print(f"Published {len(manifest['shards'])} game shards to {shard_directory} and the manifest to {manifest_path}")
+    return 0
+
+
+def run_verify(args, timer):
+    """Check that each status file's delta log reproduces it, and that the shard manifest is current"""
+    import status_delta
+    import status_publish
+    status = 0
+    for path in (args.mod_status, args.author_status):
+        delta_log = status_delta.DeltaLog(path)
+        try:
+            if delta_log.read_head() is None:
+                print(f"{path} has no delta log yet")
+                continue
+            version = delta_log.verify()
+        except (OSError, status_delta.DeltaLogError) as e:
+            print(f"Error: {str(e)}", file=sys.stderr)
+            status = 1
+            continue
+        print(f"{path} matches version {version} of its delta log")
+    if status_publish.manifest_is_stale(args.mod_status):
+        manifest_path = status_publish.publish_paths(args.mod_status)[0]
+        print(f"Error: {manifest_path} was published from another version of {args.mod_status}; "
+              "run publish to update it", file=sys.stderr)
+        status = 1
+    return status
+
+
+def run_compact(args, timer):
+    """Fold old deltas of each status file into a new baseline, skipping files never saved with a delta log"""
+    import status_delta
+    status = 0
+    for path in (args.mod_status, args.author_status):
+        delta_log = status_delta.DeltaLog(path)
+        try:
+            if delta_log.read_head() is None:
+                print(f"{path} has no delta log yet")
+                continue
+            baseline = delta_log.compact(args.keep)
+        except (OSError, status_delta.DeltaLogError) as e:
+            print(f"Error: {str(e)}", file=sys.stderr)
+            status = 1
+            continue
+        print(f"{path}: the delta log now starts at version {baseline}")
+    return status
+
+
+def run_export(args, timer):
+    """Regenerate the status JSON files from the database"""
+    if not args.database:
+        print("Error: export needs --database", file=sys.stderr)
+        return 1
+
+    import status_delta
+    import status_publish
+    import status_sqlite
+
+    for document, path in ((status_sqlite.MOD_DOCUMENT, args.mod_status),
+                           (status_sqlite.AUTHOR_DOCUMENT, args.author_status)):
+        store = status_sqlite.SqliteStatusStore(args.database, document, path)
+        with timer.phase("serialize"):
+            if not store.is_stored():
+                print(f"Warning: {document} is not in {args.database} yet", file=sys.stderr)
+                continue
+            data = store.export(status_json.StatusFile(path, status_delta.DeltaLog(path)))
+            if document == status_sqlite.MOD_DOCUMENT:
+                status_publish.publish_shards(data, path)
+        print(f"Exported {document} from {args.database} to {path}")
+    return 0
+
+
+def load_keyword_rules(path):
+    """Load the "Keyword Rules" of a mod status file, or None after printing why not"""
+    try:
+        mod_status_data = status_json.StatusFile(path).load()
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"Error: Could not load {path}: {str(e)}", file=sys.stderr)
+        return None
+    return mod_status_data.get("Keyword Rules", {})
+
+
+def run_test_rules(args, timer):
+    """Evaluate the keyword rules against a corpus of mod page texts"""
+    keyword_rules = load_keyword_rules(args.mod_status)
+    if keyword_rules is None:
+        return 1
+
+    import status_rules
+    with timer.phase("validate"):
+        engine = status_rules.KeywordRuleEngine(keyword_rules)
+        report = status_rules.RuleReport(engine)
+        for lines in iter_inputs(args.inputs):
+            for game, text in status_rules.iter_corpus(lines, args.game):
+                report.add(game, text)
+    print(status_rules.format_rule_report(report, args.max_conflicts))
+    return 0
+
+
+def run_export_rules(args, timer):
+    """Write the priority-ordered keyword rule table for clients"""
+    keyword_rules = load_keyword_rules(args.mod_status)
+    if keyword_rules is None:
+        return 1
+
+    import status_rules
+    output = args.output or status_rules.rule_table_path(args.mod_status)
+    with timer.phase("serialize"):
+        table = status_rules.export_rule_table(keyword_rules, output)
+    rule_count = len(table["global"]) + sum(len(rules) for rules in table["games"].values())
+    print(f"Exported {rule_count} keyword rules for {len(table['games'])} games to {output}")
+    return 0
+
+
+def journal_target(args):
+    """Return the ("mod" or "author", path) a history, undo or audit command is about"""
+    if args.document == "mods":
+        return "mod", args.mod_status
+    return "author", args.author_status
+
+
+def run_history(args, timer):
+    """List the merge batches journaled for a status document"""
+    import status_journal
+    kind, path = journal_target(args)
+    status_file = open_status_file(args, kind, path)
+    try:
+        batches = status_file.journal.read_batches()
+    except (OSError, status_journal.JournalError) as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 1
+    print(status_journal.format_history(batches, args.limit))
+    return 0
+
+
+def run_undo(args, timer):
+    """Undo one journaled merge batch of a status document"""
+    import status_journal
+    kind, path = journal_target(args)
+    status_file = open_status_file(args, kind, path)
+    try:
+        data = status_file.load(lazy=True)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"Error: Could not load {status_file.path}: {str(e)}", file=sys.stderr)
+        return 1
+
+    try:
+        batch = args.batch if args.batch is not None else status_file.journal.undoable_batch()
+        if batch is None:
+            print("Error: There is no batch to undo", file=sys.stderr)
+            return 1
+        operations = status_file.journal.undo(data, batch)
+    except (OSError, status_journal.JournalError) as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 1
+
+    changed = status_journal.changed_entries(operations)
+    previous_sha256 = status_file.sha256
+    with timer.phase("serialize"):
+        status_file.save(data, changed, operations, batch)
+        if kind == "mod" and not args.database:
+            import status_publish
+            games = {game for _, game in changed} if changed is not None else None
+            status_publish.publish_shards(data, path, games, previous_sha256)
+    print(f"Undid batch {batch} ({len(operations)} operations) in {path}")
+    return 0
+
+
+def run_audit(args, timer):
+    """Check a status document for inconsistencies, fixing them with --fix"""
+    import status_audit
+    kind, path = journal_target(args)
+    status_file = open_status_file(args, kind, path)
+    try:
+        data = status_file.load()
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"Error: Could not load {status_file.path}: {str(e)}", file=sys.stderr)
+        return 1
+
+    with timer.phase("validate"):
+        report = status_audit.audit(kind, data)
+    print(status_audit.format_audit_report(report, path, args.limit))
+    if not report.issues:
+        return 0
+    if not args.fix:
+        return 1
+
+    changed, operations = status_audit.apply_fixes(data, report)
+    previous_sha256 = status_file.sha256
+    with timer.phase("serialize"):
+        status_file.save(data, changed, operations)
+        if kind == "mod" and not args.database:
+            import status_publish
+            games = {game for _, game in changed} if changed is not None else None
+            status_publish.publish_shards(data, path, games, previous_sha256)
+    print(f"\nFixed {len(report.issues)} issues with {len(operations)} changes; "
+          f"they can be undone as batch {status_file.journal.last_batch_number()}")
+    return 0
+
+
+def run_merge_files(args, timer):
+    """Merge two status files edited from a common base, key by key
+
+    A merged mod status file is republished when it is written to a file
+    named like mod-status.json. As a git merge driver the output is git's
+    temporary copy, so run publish once the merge is done.
+    """
+    import status_merge
+    import status_publish
+    output = args.output or args.ours
+    is_mod_status = os.path.basename(output) == os.path.basename(core.MOD_STATUS_PATH)
+    try:
+        with timer.phase("merge"):
+            result = status_merge.merge_status_files(args.base, args.ours, args.theirs, args.prefer)
+        with timer.phase("serialize"):
+            result.write(output)
+            if is_mod_status and "Mod Statuses" in result.data:
+                status_publish.publish_shards(result.data, output)
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not merge the status files: {str(e)}", file=sys.stderr)
+        return 1
+    print(status_merge.format_merge_report(result, output, args.limit))
+    if not is_mod_status and "Mod Statuses" in result.data:
+        print("Run publish once the merged file is in place to update the per-game shards and manifest.")
+    return 1 if result.conflicts else 0
+
+
+def build_parser():
+    """Build the command line argument parser"""
+    # For option choices and defaults; neither module imports more than the core does
+    import status_merge
+    import status_rules
+    parser = argparse.ArgumentParser(description="Merge Nexus Content Curator reports into the status JSON files.")
+    parser.add_argument("-v", "--verbose", action="count", default=0,
+                        help="Log progress (-v) or every report decision (-vv) to stderr")
+    parser.add_argument("--timings", action="store_true",
+                        help="Print the time spent splitting, parsing, validating, merging and serializing")
+    parser.add_argument("--database",
+                        help="Keep the status documents in this SQLite database instead of the JSON files; "
+                             "they are imported from the JSON files the first time")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    mods_parser = subparsers.add_parser("mods", help="Merge mod reports into mod-status.json")
+    mods_parser.add_argument("inputs", nargs="*", default=["-"],
+                             help="Report files to read ('-' or nothing for stdin)")
+    mods_parser.add_argument("--mod-status", default=core.MOD_STATUS_PATH,
+                             help="Path to mod-status.json")
+    mods_parser.add_argument("--dry-run", action="store_true",
+                             help="Parse and merge without writing the JSON file")
+    mods_parser.add_argument("--thread", action="store_true",
+                             help="Read the inputs as saved thread pages (viewtopic.php HTML files or directories "
+                                  "of them) instead of copied reports")
+    mods_parser.add_argument("--skip-post", action="append", default=[], metavar="POST_ID",
+                             help="With --thread, ignore the reports in this post (e.g. p123456), like a post "
+                                  "hidden in the userscript; may be repeated")
+    mods_parser.add_argument("--jobs", type=int,
+                             help="Parse reports, or with --thread read pages, in this many worker processes "
+                                  "(default: parse serially, read pages with one worker per CPU)")
+    mods_parser.add_argument("--duplicates", choices=core.DUPLICATE_POLICIES,
+                             default=core.DEFAULT_MOD_DUPLICATE_POLICY,
+                             help="How to handle a mod reported more than once with different details: keep the "
+                                  "first or last report, or save neither and list them "
+                                  f"(default: {core.DEFAULT_MOD_DUPLICATE_POLICY})")
+    mods_parser.set_defaults(func=run_mods)
+
+    authors_parser = subparsers.add_parser("authors", help="Merge author reports into author-status.json")
+    authors_parser.add_argument("inputs", nargs="*", default=["-"],
+                                help="Report files to read ('-' or nothing for stdin)")
+    authors_parser.add_argument("--author-status", default=core.AUTHOR_STATUS_PATH,
+                                help="Path to author-status.json")
+    authors_parser.add_argument("--dry-run", action="store_true",
+                                help="Parse and merge without writing the JSON file")
+    authors_parser.add_argument("--thread", action="store_true",
+                                help="Read the inputs as saved thread pages (viewtopic.php HTML files or directories "
+                                     "of them) instead of copied reports")
+    authors_parser.add_argument("--skip-post", action="append", default=[], metavar="POST_ID",
+                                help="With --thread, ignore the reports in this post (e.g. p123456), like a post "
+                                     "hidden in the userscript; may be repeated")
+    authors_parser.add_argument("--jobs", type=int,
+                                help="Parse reports, or with --thread read pages, in this many worker processes "
+                                     "(default: parse serially, read pages with one worker per CPU)")
+    authors_parser.add_argument("--duplicates", choices=core.DUPLICATE_POLICIES,
+                                default=core.DEFAULT_AUTHOR_DUPLICATE_POLICY,
+                                help="How to handle an author label reported more than once with different "
+                                     "details: keep the first or last report, or save neither and list them "
+                                     f"(default: {core.DEFAULT_AUTHOR_DUPLICATE_POLICY})")
+    authors_parser.set_defaults(func=run_authors)
+
+    publish_parser = subparsers.add_parser("publish", help="Write the per-game shards and manifest for mod-status.json")
+    publish_parser.add_argument("--mod-status", default=core.MOD_STATUS_PATH,
+                                help="Path to mod-status.json")
+    publish_parser.set_defaults(func=run_publish)
+
+    export_parser = subparsers.add_parser("export", help="Regenerate the status JSON files from --database")
+    export_parser.add_argument("--mod-status", default=core.MOD_STATUS_PATH,
+                               help="Path to mod-status.json")
+    export_parser.add_argument("--author-status", default=core.AUTHOR_STATUS_PATH,
+                               help="Path to author-status.json")
+    export_parser.set_defaults(func=run_export)
+
+    verify_parser = subparsers.add_parser("verify", help="Check that the delta logs reproduce the status files and the shard manifest is current")
+    compact_parser = subparsers.add_parser("compact", help="Fold old deltas into a new baseline")
+    compact_parser.add_argument("--keep", type=int, default=0,
+                                help="Number of recent deltas to keep (default: 0)")
+    for log_parser, func in ((verify_parser, run_verify), (compact_parser, run_compact)):
+        log_parser.add_argument("--mod-status", default=core.MOD_STATUS_PATH,
+                                help="Path to mod-status.json")
+        log_parser.add_argument("--author-status", default=core.AUTHOR_STATUS_PATH,
+                                help="Path to author-status.json")
+        log_parser.set_defaults(func=func)
+
+    history_parser = subparsers.add_parser("history", help="List the merge batches journaled for a status file")
+    history_parser.add_argument("--limit", type=int, default=20,
+                                help="Number of recent batches to list (default: 20)")
+    undo_parser = subparsers.add_parser("undo", help="Undo one merge batch, leaving later batches in place")
+    for journal_parser, func in ((history_parser, run_history), (undo_parser, run_undo)):
+        journal_parser.add_argument("document", choices=["mods", "authors"],
+                                    help="Status file whose journal to use")
+        journal_parser.add_argument("--mod-status", default=core.MOD_STATUS_PATH,
+                                    help="Path to mod-status.json")
+        journal_parser.add_argument("--author-status", default=core.AUTHOR_STATUS_PATH,
+                                    help="Path to author-status.json")
+        journal_parser.set_defaults(func=func)
+    undo_parser.add_argument("batch", nargs="?", type=int,
+                             help="Number of the batch to undo, as listed by history (default: the latest one "
+                                  "not undone yet)")
+
+    audit_parser = subparsers.add_parser("audit", help="Check a status file for inconsistent or stray entries")
+    audit_parser.add_argument("document", choices=["mods", "authors"],
+                              help="Status file to check")
+    audit_parser.add_argument("--fix", action="store_true",
+                              help="Fix the issues found and save the file, as one batch that can be undone")
+    audit_parser.add_argument("--limit", type=int, default=50,
+                              help="Number of issues to list per check (default: 50)")
+    audit_parser.add_argument("--mod-status", default=core.MOD_STATUS_PATH,
+                              help="Path to mod-status.json")
+    audit_parser.add_argument("--author-status", default=core.AUTHOR_STATUS_PATH,
+                              help="Path to author-status.json")
+    audit_parser.set_defaults(func=run_audit)
+
+    merge_files_parser = subparsers.add_parser(
+        "merge-files", help="Three-way merge two copies of a status file by game, mod, label and author")
+    merge_files_parser.add_argument("base", help="The status file both copies were edited from")
+    merge_files_parser.add_argument("ours", help="Our copy, which is overwritten with the result unless --output is given")
+    merge_files_parser.add_argument("theirs", help="Their copy")
+    merge_files_parser.add_argument("--output", help="Write the result here instead of over our copy")
+    merge_files_parser.add_argument("--prefer", choices=[status_merge.OURS, status_merge.THEIRS],
+                                    default=status_merge.OURS,
+                                    help="Side whose value a conflicting key takes; the command exits with 1 if "
+                                         f"there were any (default: {status_merge.OURS})")
+    merge_files_parser.add_argument("--limit", type=int, default=50,
+                                    help="Number of conflicts to list (default: 50)")
+    merge_files_parser.set_defaults(func=run_merge_files)
+
+    test_rules_parser = subparsers.add_parser("test-rules",
+                                              help="Evaluate the keyword rules against mod titles and breadcrumbs")
+    test_rules_parser.add_argument("inputs", nargs="*", default=["-"],
+                                   help="Corpus files: JSON lines with game, title, breadcrumbs and category, "
+                                        "'game<TAB>title' lines or bare titles ('-' or nothing for stdin)")
+    test_rules_parser.add_argument("--game", default=status_rules.GLOBAL_SCOPE,
+                                   help="Game of corpus lines that do not name one (default: only global rules)")
+    test_rules_parser.add_argument("--max-conflicts", type=int, default=20,
+                                   help="Number of precedence conflicts to list (default: 20)")
+    test_rules_parser.add_argument("--mod-status", default=core.MOD_STATUS_PATH,
+                                   help="Path to mod-status.json")
+    test_rules_parser.set_defaults(func=run_test_rules)
+
+    export_rules_parser = subparsers.add_parser("export-rules", help="Write the priority-ordered keyword rule table")
+    export_rules_parser.add_argument("--output",
+                                     help=f"Path of the rule table (default: {status_rules.RULE_TABLE_NAME} "
+                                          "next to mod-status.json)")
+    export_rules_parser.add_argument("--mod-status", default=core.MOD_STATUS_PATH,
+                                     help="Path to mod-status.json")
+    export_rules_parser.set_defaults(func=run_export_rules)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    levels = [logging.WARNING, logging.INFO, logging.DEBUG]
+    logging.basicConfig(level=levels[min(args.verbose, len(levels) - 1)],
+                        format="%(levelname)s: %(message)s")
+
+    if getattr(args, "thread", False) and "-" in args.inputs:
+        print("Error: --thread needs saved thread pages or directories, not stdin", file=sys.stderr)
+        return 2
+
+    timer = core.PhaseTimer()
+    status = args.func(args, timer)
+    if args.timings:
+        print(timer.summary(), file=sys.stderr)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1410 @@
+#!/usr/bin/env python3
+"""Qt-free parsing, merging and saving of mod and author status reports.
+
+Shared by the status updater GUI and the command line front end, so nothing
+in here may import PyQt6.
+"""
+import bisect
+import concurrent.futures
+import contextlib
+import json
+import logging
+import os
+import time
+from collections import deque
+
+import status_json
+
+logger = logging.getLogger(__name__)
+
+MOD_STATUS_PATH = os.path.join("Resources", "mod-status.json")
+AUTHOR_STATUS_PATH = os.path.join("Resources", "author-status.json")
+
+DUPLICATE_MOD_NOTE = "(Duplicate report - same status and reason)"
+DUPLICATE_LABEL_NOTE = "(Duplicate label - same details)"
+
+TIMING_PHASES = ("split", "parse", "validate", "collapse", "merge", "serialize")
+
+
+class PhaseTimer:
+    """Accumulates the time spent in each processing phase
+
+    Phases may nest, e.g. a merge pulling reports from a lazy parser; each
+    phase is only charged for its own time, not that of the phases inside it.
+    """
+
+    def __init__(self):
+        self.totals = dict.fromkeys(TIMING_PHASES, 0.0)
+        self._nested = 0.0
+
+    def add(self, name, seconds):
+        """Charge time measured elsewhere to a phase"""
+        self.totals[name] = self.totals.get(name, 0.0) + seconds
+        self._nested += seconds
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Time the enclosed block as a phase"""
+        outer_nested = self._nested
+        self._nested = 0.0
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.totals[name] = self.totals.get(name, 0.0) + elapsed - self._nested
+            self._nested = outer_nested + elapsed
+
+    def summary(self):
+        """Describe the time spent per phase on one line"""
+        parts = [f"{name} {seconds:.3f}s" for name, seconds in self.totals.items()]
+        parts.append(f"total {sum(self.totals.values()):.3f}s")
+        return "Timings: " + ", ".join(parts)
+
+
+def empty_mod_status_data():
+    """Return an empty mod status document"""
+    return {
+        "Mod Statuses": {},
+        "Mod Descriptors": {},
+        "Keyword Rules": {"global": {}}
+    }
+
+
+def empty_author_status_data():
+    """Return an empty author status document"""
+    return {
+        "Labels": {},
+        "Tooltips": {}
+    }
+
+
+def load_json_file(path):
+    """Load a JSON document from disk"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_json_file(path, data):
+    """Atomically write a JSON document to disk in the repository's layout"""
+    status_json.atomic_write_text(path, status_json.dumps(data))
+
+
+def _trim_block(block):
+    """Strip the surrounding whitespace of a report block, as str.strip() would"""
+    start = 0
+    end = len(block)
+    while start < end and (not block[start] or block[start].isspace()):
+        start += 1
+    while end > start and (not block[end - 1] or block[end - 1].isspace()):
+        end -= 1
+    if start == end:
+        return None
+
+    lines = block[start:end]
+    lines[0] = lines[0].lstrip()
+    lines[-1] = lines[-1].rstrip()
+    return lines
+
+
+def iter_report_blocks(lines, split_on_blank_lines=None):
+    """Lazily split bulk report text into the lines of each report
+
+    Accepts a string or any iterable of lines, such as an open file or stdin,
+    and reads it in a single pass. Lines made only of dashes always separate
+    reports. The separator mode is decided by the first separator seen: if
+    two consecutive blank lines follow some report text before any dash
+    line, runs of two or more blank lines separate reports too; otherwise
+    blank lines are kept as part of the report. Blank lines before the
+    first report never decide the mode. Pass split_on_blank_lines to fix the mode instead,
+    e.g. for a piece cut from the middle of a larger text.
+    """
+    if isinstance(lines, str):
+        lines = lines.replace("\r\n", "\n").split("\n")
+    else:
+        lines = (line.rstrip("\r\n") for line in lines)
+
+    block = []
+    append = block.append
+    blank_line_count = 0
+    seen_text = False
+
+    for line in lines:
+        if not line or line.isspace():
+            blank_line_count += 1
+            if blank_line_count >= 2:
+                if split_on_blank_lines is None and seen_text:
+                    split_on_blank_lines = True
+                if split_on_blank_lines:
+                    report_lines = _trim_block(block)
+                    if report_lines:
+                        yield report_lines
+                    block = []
+                    append = block.append
+                    blank_line_count = 0
+                    continue
+            append(line)
+            continue
+
+        blank_line_count = 0
+        seen_text = True
+        # A separator is a line made only of dashes
+        if "-" in line and not line.strip().strip("-"):
+            if split_on_blank_lines is None:
+                split_on_blank_lines = False
+            report_lines = _trim_block(block)
+            if report_lines:
+                yield report_lines
+            block = []
+            append = block.append
+        else:
+            append(line)
+
+    report_lines = _trim_block(block)
+    if report_lines:
+        yield report_lines
+
+
+# Characters of report text handed to a worker process at a time when parsing in parallel
+PARALLEL_PIECE_SIZE = 1 << 18
+
+
+def _iter_lines(text, start):
+    """Yield (line, end) for each line of text from start on, end being where the line stops"""
+    length = len(text)
+    while start <= length:
+        end = text.find("\n", start)
+        if end == -1:
+            end = length
+        yield text[start:end], end
+        start = end + 1
+
+
+def _separator_mode(text):
+    """Return the separator mode iter_report_blocks() picks for text, or None if it has no separator"""
+    # As there, a blank line run only counts after some text
+    blank_line_count = None
+    for line, _ in _iter_lines(text, 0):
+        if not line or line.isspace():
+            if blank_line_count is not None:
+                blank_line_count += 1
+                if blank_line_count >= 2:
+                    return True
+        elif "-" in line and not line.strip().strip("-"):
+            return False
+        else:
+            blank_line_count = 0
+    return None
+
+
+def _find_cut(text, position, split_on_blank_lines):
+    """Return the end of the first separator line starting after position, or None
+
+    After a dash line, or in blank line mode after the second of a run of
+    blank lines following text, iter_report_blocks() has just finished a
+    report and starts the next one from a clean state.
+    """
+    line_start = text.find("\n", position) + 1
+    if not line_start:
+        return None
+    # The lines before line_start are not looked at, so a blank line run only counts after some text
+    blank_line_count = None
+    for line, end in _iter_lines(text, line_start):
+        if not line or line.isspace():
+            if blank_line_count is not None:
+                blank_line_count += 1
+                if blank_line_count == 2 and split_on_blank_lines:
+                    return end
+        else:
+            if "-" in line and not line.strip().strip("-"):
+                return end
+            blank_line_count = 0
+    return None
+
+
+def _split_text_pieces(text, size, split_on_blank_lines):
+    """Cut report text into pieces of about size characters at separators
+
+    Splitting each piece with iter_report_blocks() in the given mode gives
+    the same blocks, in order, as splitting the whole text.
+    """
+    start = 0
+    while len(text) - start > size:
+        cut = _find_cut(text, start + size, split_on_blank_lines)
+        if cut is None or cut >= len(text):
+            break
+        yield text[start:cut]
+        # Skip the newline ending the separator
+        start = cut + 1
+    yield text[start:]
+
+
+FILLER_CHARACTER = "\u3164"
+
+
+def _optional(value):
+    """Map the placeholders used for empty fields ('-', 'null', filler) to None"""
+    if not value or value == "-" or value.lower() == "null":
+        return None
+    if not value.replace(FILLER_CHARACTER, "").strip():
+        return None
+    return value
+
+
+def _label_list(value):
+    """Split a comma separated list of label names"""
+    return [label.strip() for label in value.split(",")]
+
+
+# Report grammar: field name -> (report key, normalizer or None to keep the value as written)
+MOD_REPORT_FIELDS = {
+    "Game Shortname": ("game", None),
+    "Mod ID": ("id", None),
+    "Status": ("status", None),
+    "Reason": ("reason", None),
+    "Alternative": ("alternative", _optional),
+}
+
+AUTHOR_REPORT_FIELDS = {
+    "Username": ("username", None),
+    "Labels": ("label_list", _label_list),
+}
+
+# Any other unindented author field starts a label section with these properties
+AUTHOR_LABEL_FIELDS = {
+    "Label": ("label", _optional),
+    "Reference": ("referenceLink", _optional),
+}
+
+INDENT_CHARACTERS = " \t"
+
+
+def _split_field(line):
+    """Split an unindented 'Key: value' line, or return None"""
+    if not line or line[0] in INDENT_CHARACTERS:
+        return None
+    key, sep, value = line.partition(":")
+    if not sep:
+        return None
+    return key.strip(), value.strip()
+
+
+def _split_property(line):
+    """Split an indented 'Key: value' line, or return None"""
+    if not line or line[0] not in INDENT_CHARACTERS:
+        return None
+    key, sep, value = line.partition(":")
+    if not sep:
+        return None
+    return key.strip(), value.strip()
+
+
+def _store_field(target, field, value):
+    """Store a raw value under a field table entry, normalizing it"""
+    name, normalize = field
+    target[name] = value if normalize is None else normalize(value)
+
+
+def parse_mod_report(lines):
+    """Parse the lines of a single mod report block into a report dict"""
+    report = {}
+    fields = MOD_REPORT_FIELDS
+    current_field = None
+    current_value = ""
+
+    for line in lines:
+        # Same rule as _split_field(), inlined since this is the hot loop
+        if line and line[0] not in INDENT_CHARACTERS:
+            key, sep, value = line.partition(":")
+            if sep:
+                # Save the previous field and start a new one
+                if current_field is not None:
+                    _store_field(report, current_field, current_value)
+                current_field = fields.get(key.strip())
+                current_value = value.strip()
+                continue
+
+        if current_field is not None:
+            # This is a continuation of the previous value
+            if current_value:
+                current_value += "\n" + line
+            else:
+                current_value = line.strip()
+
+    if current_field is not None:
+        _store_field(report, current_field, current_value)
+
+    return report
+
+
+def is_valid_mod_report(report):
+    """Check that a mod report has the fields needed to save it"""
+    return "game" in report and "id" in report and "status" in report
+
+
+MOD_REQUIRED_FIELDS = ("Game Shortname", "Mod ID", "Status")
+
+
+def describe_mod_report_problem(report):
+    """Explain why a mod report cannot be saved, or return None if it can"""
+    missing = [field for field in MOD_REQUIRED_FIELDS if MOD_REPORT_FIELDS[field][0] not in report]
+    if missing:
+        return f"missing {', '.join(missing)}"
+    return None
+
+
+def _iter_parsed(blocks, parse_report, is_valid, timer):
+    """Lazily parse and validate report blocks, yielding (block, report, valid) for each"""
+    if timer is None:
+        for block in blocks:
+            report = parse_report(block)
+            yield block, report, is_valid(report)
+        return
+
+    clock = time.perf_counter
+    while True:
+        start = clock()
+        block = next(blocks, None)
+        split_end = clock()
+        timer.add("split", split_end - start)
+        if block is None:
+            return
+
+        report = parse_report(block)
+        parse_end = clock()
+        valid = is_valid(report)
+        timer.add("parse", parse_end - split_end)
+        timer.add("validate", clock() - parse_end)
+        yield block, report, valid
+
+
+def _parse_piece(parse_report, is_valid, text, split_on_blank_lines, fingerprints):
+    """Split, parse and validate a piece of report text; runs in a worker process
+
+    Returns (text, report) per block. The report is None if it is invalid;
+    the text is the block's text if the block is invalid or fingerprints is
+    set, and None otherwise, so it only crosses the process boundary when
+    needed.
+    """
+    results = []
+    for block in iter_report_blocks(text, split_on_blank_lines):
+        report = parse_report(block)
+        if is_valid(report):
+            results.append(("\n".join(block) if fingerprints else None, report))
+        else:
+            results.append(("\n".join(block), None))
+    return results
+
+
+def _iter_parsed_parallel(text, parse_report, is_valid, timer, workers, fingerprints=False):
+    """Split, parse and validate report text in a pool of worker processes
+
+    The text is cut into pieces at separators and each piece is handled by a
+    worker, so the results are those of the serial path and are yielded in
+    input order as the (text, report) pairs of _parse_piece(). Only a few
+    pieces per worker are in flight at a time. Time spent waiting for the
+    workers is charged to the parse phase, which then includes validation.
+    """
+    clock = time.perf_counter
+    start = clock()
+    # Pieces are cut at line ends, so each worker can still normalize its own line endings
+    split_on_blank_lines = _separator_mode(text)
+    pieces = _split_text_pieces(text, PARALLEL_PIECE_SIZE, split_on_blank_lines)
+    if timer is not None:
+        timer.add("split", clock() - start)
+
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+    in_flight = deque()
+    try:
+        while True:
+            start = clock()
+            piece = next(pieces, None)
+            if timer is not None:
+                timer.add("split", clock() - start)
+            if piece is not None:
+                in_flight.append(executor.submit(_parse_piece, parse_report, is_valid, piece,
+                                                 split_on_blank_lines, fingerprints))
+                if len(in_flight) < 2 * workers:
+                    continue
+            if not in_flight:
+                return
+
+            start = clock()
+            results = in_flight.popleft().result()
+            if timer is not None:
+                timer.add("parse", clock() - start)
+            yield from results
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def _join_lines(lines):
+    """Return bulk report text or lines as one string"""
+    if isinstance(lines, str):
+        return lines
+    return "\n".join(line.rstrip("\r\n") for line in lines)
+
+
+def _iter_reports(lines, parse_report, is_valid, timer, workers=None):
+    """Lazily split, parse and validate reports, skipping invalid ones
+
+    With more than one worker the text is parsed in worker processes.
+    """
+    if workers is not None and workers > 1:
+        for text, report in _iter_parsed_parallel(_join_lines(lines), parse_report, is_valid, timer, workers):
+            if report is not None:
+                yield report
+            else:
+                logger.debug("Skipping invalid report: %r", text)
+        return
+
+    for block, report, valid in _iter_parsed(iter_report_blocks(lines), parse_report, is_valid, timer):
+        if valid:
+            yield report
+        else:
+            logger.debug("Skipping invalid report: %r", block)
+
+
+def iter_mod_reports(lines, timer=None, workers=None):
+    """Lazily parse bulk mod report text or lines into valid report dicts
+
+    Pass a PhaseTimer to record the time spent splitting, parsing and
+    validating, and a number of workers above one to parse in that many
+    processes; the reports are the same and come in the same order.
+    """
+    return _iter_reports(lines, parse_mod_report, is_valid_mod_report, timer, workers)
+
+
+def parse_mod_reports(lines, timer=None, workers=None):
+    """Parse bulk mod report text or lines into a list of valid report dicts"""
+    return list(iter_mod_reports(lines, timer, workers))
+
+
+def parse_author_report(lines):
+    """Parse the lines of a single author report block into a report dict"""
+    report = {"labels": {}}
+    current_label = None
+
+    for line in lines:
+        field = _split_field(line)
+        if field is not None:
+            key, value = field
+            if key in AUTHOR_REPORT_FIELDS:
+                _store_field(report, AUTHOR_REPORT_FIELDS[key], value)
+            else:
+                # This is a label section
+                current_label = key
+                report["labels"][current_label] = {"label": None, "referenceLink": None}
+            continue
+
+        prop = _split_property(line)
+        if prop is not None and current_label:
+            prop_key, prop_value = prop
+            if prop_key in AUTHOR_LABEL_FIELDS:
+                _store_field(report["labels"][current_label], AUTHOR_LABEL_FIELDS[prop_key], prop_value)
+
+    return report
+
+
+def is_valid_author_report(report):
+    """Check that an author report has the fields needed to save it"""
+    return "username" in report and "label_list" in report and bool(report["labels"])
+
+
+def describe_author_report_problem(report):
+    """Explain why an author report cannot be saved, or return None if it can"""
+    missing = [field for field, (key, _) in AUTHOR_REPORT_FIELDS.items() if key not in report]
+    if not report["labels"]:
+        missing.append("label details")
+    if missing:
+        return f"missing {', '.join(missing)}"
+    return None
+
+
+def iter_author_reports(lines, timer=None, workers=None):
+    """Lazily parse bulk author report text or lines into valid report dicts
+
+    Takes the same timer and workers as iter_mod_reports().
+    """
+    return _iter_reports(lines, parse_author_report, is_valid_author_report, timer, workers)
+
+
+def parse_author_reports(lines, timer=None, workers=None):
+    """Parse bulk author report text or lines into a list of valid report dicts"""
+    return list(iter_author_reports(lines, timer, workers))
+
+
+FIRST_WINS = "first-wins"
+LAST_WINS = "last-wins"
+CONFLICT_REPORT = "conflict-report"
+DUPLICATE_POLICIES = (FIRST_WINS, LAST_WINS, CONFLICT_REPORT)
+# What merging did with repeated reports before they were collapsed: mods
+# kept the first copy, while author tooltips were updated by later copies
+DEFAULT_MOD_DUPLICATE_POLICY = FIRST_WINS
+DEFAULT_AUTHOR_DUPLICATE_POLICY = LAST_WINS
+
+
+class ReportCollapser:
+    """Collapses reports repeated within one batch before it is merged
+
+    Thread exports repeat reports a lot, mostly as quoted reposts. Blocks
+    that are exact copies of an earlier block are recognized by their text
+    and never parsed again; reports for the same key are combined, and
+    copies that disagree are resolved by the policy: keep the first or the
+    last copy, or report the conflict and merge none of them.
+    """
+
+    def __init__(self, policy):
+        if policy not in DUPLICATE_POLICIES:
+            raise ValueError(f"Unknown duplicate policy {policy!r}; expected one of {', '.join(DUPLICATE_POLICIES)}")
+        self.policy = policy
+        # Text of each block seen -> keys of its report's entries, empty if it was invalid
+        self.fingerprints = {}
+        # Text of each block seen more than once -> number of exact copies
+        self.copies = {}
+        # Texts of the blocks yielded by iter_new_blocks() that are not parsed yet
+        self.pending = deque()
+        self.reports = {}
+        # Per key: how many copies were collapsed, and the differing versions
+        self.repeats = {}
+        self.variants = {}
+
+    def iter_new_blocks(self, blocks):
+        """Yield the report blocks that are not exact copies of earlier ones
+
+        Copies are counted against the first block with the same text, whose
+        report may still be parsing when they are seen.
+        """
+        fingerprints = self.fingerprints
+        copies = self.copies
+        for block in blocks:
+            fingerprint = "\n".join(block)
+            if fingerprint in fingerprints:
+                copies[fingerprint] = copies.get(fingerprint, 0) + 1
+                continue
+            fingerprints[fingerprint] = ()
+            self.pending.append(fingerprint)
+            yield block
+
+    def collect(self, lines, parse_report, is_valid, timer=None, workers=None):
+        """Parse and add every report block that is not an exact copy
+
+        With more than one worker the text is parsed in worker processes,
+        which parse copies too; only the first of them is added.
+        """
+        fingerprints = self.fingerprints
+        if workers is not None and workers > 1:
+            copies = self.copies
+            for text, report in _iter_parsed_parallel(_join_lines(lines), parse_report, is_valid, timer, workers,
+                                                      fingerprints=True):
+                if text in fingerprints:
+                    copies[text] = copies.get(text, 0) + 1
+                elif report is not None:
+                    fingerprints[text] = self.add(report)
+                else:
+                    fingerprints[text] = ()
+                    logger.debug("Skipping invalid report: %r", text)
+            return
+
+        blocks = self.iter_new_blocks(iter_report_blocks(lines))
+        for block, report, valid in _iter_parsed(blocks, parse_report, is_valid, timer):
+            # Blocks come back in the order they were yielded
+            fingerprint = self.pending.popleft()
+            if valid:
+                fingerprints[fingerprint] = self.add(report)
+            else:
+                logger.debug("Skipping invalid report: %r", block)
+
+    def add(self, report):
+        """Add a valid report, collapsing it into an earlier one for the same key
+
+        Returns the keys of the report's entries.
+        """
+        return self._add(report)
+
+    def _resolve(self, key, old, new):
+        """Pick between two differing versions of an entry and remember both"""
+        variants = self.variants.setdefault(key, [old])
+        if new not in variants:
+            variants.append(new)
+        return new if self.policy == LAST_WINS else old
+
+    @staticmethod
+    def _name(key):
+        return f"{key[0]}/{key[1]}"
+
+    def collapsed_messages(self):
+        """Describe the entries that were repeated within the batch"""
+        repeats = dict(self.repeats)
+        for fingerprint, count in self.copies.items():
+            for key in self.fingerprints[fingerprint]:
+                repeats[key] = repeats.get(key, 0) + count
+
+        messages = []
+        for key, count in repeats.items():
+            if key in self.variants:
+                continue
+            copies = "copy" if count == 1 else "copies"
+            messages.append(f"{self._name(key)} ({count} repeated {copies} in this batch)")
+        if self.policy != CONFLICT_REPORT:
+            kept = "first" if self.policy == FIRST_WINS else "last"
+            for key, variants in self.variants.items():
+                messages.append(f"{self._name(key)} (kept the {kept} of {len(variants)} differing versions)")
+        return messages
+
+    def conflict_messages(self):
+        """Describe the entries left out because their copies disagree"""
+        if self.policy != CONFLICT_REPORT:
+            return []
+        messages = []
+        for key, variants in self.variants.items():
+            lines = [self._name(key)] + [f"    {self._describe(variant)}" for variant in variants]
+            messages.append("\n".join(lines))
+        return messages
+
+
+class ModReportCollapser(ReportCollapser):
+    """Collapses mod reports repeating a game and mod ID"""
+
+    def __init__(self, policy=DEFAULT_MOD_DUPLICATE_POLICY):
+        super().__init__(policy)
+
+    def _add(self, report):
+        key = (report["game"], report["id"])
+        old = self.reports.get(key)
+        if old is None:
+            self.reports[key] = report
+        else:
+            self.repeats[key] = self.repeats.get(key, 0) + 1
+            if report != old:
+                self.reports[key] = self._resolve(key, old, report)
+        return (key,)
+
+    def results(self):
+        """Return the collapsed reports in the order they first appeared"""
+        if self.policy == CONFLICT_REPORT:
+            return [report for key, report in self.reports.items() if key not in self.variants]
+        return list(self.reports.values())
+
+    @staticmethod
+    def _describe(report):
+        return (f"Status: {report['status']}, Reason: {report.get('reason')}, "
+                f"Alternative: {report.get('alternative')}")
+
+
+class AuthorReportCollapser(ReportCollapser):
+    """Collapses author reports repeating a username, label by label
+
+    Merging a report adds a tooltip where the report first gives details
+    for a label. Details that only a later copy gives go into a follow-up
+    report, placed where that copy was, so tooltips are added in the same
+    order as when every copy was merged.
+    """
+
+    def __init__(self, policy=DEFAULT_AUTHOR_DUPLICATE_POLICY):
+        super().__init__(policy)
+        self.count = 0
+        # username -> (number of its first report, {label: (report number, position) where details first came})
+        self.detail_order = {}
+
+    def _add(self, report):
+        username = report["username"]
+        number = self.count
+        self.count += 1
+        combined = self.reports.get(username)
+        if combined is None:
+            # Copy the containers so the parsed report itself is never changed; details
+            # for labels the report does not list are never merged, so they are dropped
+            self.reports[username] = {**report, "label_list": list(report["label_list"]),
+                                      "labels": {label_name: details for label_name, details in report["labels"].items()
+                                                 if label_name in report["label_list"]}}
+            self.detail_order[username] = (number, {
+                label_name: (number, position) for position, label_name in enumerate(report["label_list"])
+                if label_name in report["labels"]})
+            return tuple((username, label_name) for label_name in report["label_list"])
+
+        detail_order = self.detail_order[username][1]
+        for position, label_name in enumerate(report["label_list"]):
+            details = report["labels"].get(label_name)
+            if details is not None:
+                detail_order.setdefault(label_name, (number, position))
+            if label_name not in combined["label_list"]:
+                combined["label_list"].append(label_name)
+                if details is not None:
+                    combined["labels"][label_name] = details
+                continue
+
+            key = (username, label_name)
+            self.repeats[key] = self.repeats.get(key, 0) + 1
+            old_details = combined["labels"].get(label_name)
+            if details is None:
+                continue
+            if old_details is None:
+                combined["labels"][label_name] = details
+            elif not compare_single_tooltip(old_details, details):
+                combined["labels"][label_name] = self._resolve(key, old_details, details)
+        return tuple((username, label_name) for label_name in report["label_list"])
+
+    def results(self):
+        """Return the collapsed reports in the order their authors first appeared
+
+        Follow-up reports come where the copy first giving their details was.
+        """
+        placed = []
+        for username, report in self.reports.items():
+            if self.policy == CONFLICT_REPORT:
+                conflicted = {label_name for label_name in report["label_list"]
+                              if (username, label_name) in self.variants}
+                if conflicted:
+                    report = {**report, "label_list": [label_name for label_name in report["label_list"]
+                                                       if label_name not in conflicted],
+                              "labels": {label_name: details for label_name, details in report["labels"].items()
+                                         if label_name not in conflicted}}
+                    if not report["label_list"]:
+                        continue
+
+            first, detail_order = self.detail_order[username]
+            later = sorted((detail_order[label_name], label_name) for label_name in report["labels"]
+                           if detail_order[label_name][0] != first)
+            if later:
+                later_names = {label_name for _, label_name in later}
+                placed.append((later[0][0][0], {
+                    "username": username,
+                    "label_list": [label_name for _, label_name in later],
+                    "labels": {label_name: report["labels"][label_name] for _, label_name in later},
+                }))
+                report = {**report, "labels": {label_name: details for label_name, details in report["labels"].items()
+                                               if label_name not in later_names}}
+            placed.append((first, report))
+        placed.sort(key=lambda item: item[0])
+        return [report for _, report in placed]
+
+    @staticmethod
+    def _describe(details):
+        return f"Label: {details.get('label')}, Reference: {details.get('referenceLink')}"
+
+
+def collect_mod_reports(lines, collapser, timer=None, workers=None):
+    """Parse bulk mod report text or lines into a ModReportCollapser
+
+    Exact copies of a report are skipped without being parsed; get the
+    collapsed reports from collapser.results() once every input is in.
+    """
+    collapser.collect(lines, parse_mod_report, is_valid_mod_report, timer, workers)
+
+
+def collect_author_reports(lines, collapser, timer=None, workers=None):
+    """Parse bulk author report text or lines into an AuthorReportCollapser"""
+    collapser.collect(lines, parse_author_report, is_valid_author_report, timer, workers)
+
+
+def collapse_mod_reports(reports, policy=DEFAULT_MOD_DUPLICATE_POLICY):
+    """Collapse repeated mod reports in a list; returns (reports, collapser)"""
+    collapser = ModReportCollapser(policy)
+    for report in reports:
+        collapser.add(report)
+    return collapser.results(), collapser
+
+
+def collapse_author_reports(reports, policy=DEFAULT_AUTHOR_DUPLICATE_POLICY):
+    """Collapse repeated author reports in a list; returns (reports, collapser)"""
+    collapser = AuthorReportCollapser(policy)
+    for report in reports:
+        collapser.add(report)
+    return collapser.results(), collapser
+
+
+def format_mod_report_preview(report):
+    """Render one parsed mod report as preview text"""
+    preview_text = f"Game: {report.get('game', '')}\n"
+    preview_text += f"Mod ID: {report.get('id', '')}\n"
+    preview_text += f"Status: {report.get('status', '')}\n"
+
+    if "reason" in report:
+        preview_text += f"Reason: {report['reason']}\n"
+
+    if "alternative" in report:
+        if report["alternative"]:
+            preview_text += f"Alternative: {report['alternative']}\n"
+        else:
+            preview_text += "Alternative: None\n"
+
+    return preview_text + "\n"
+
+
+def format_mod_preview(reports):
+    """Render parsed mod reports as preview text"""
+    return "".join(format_mod_report_preview(report) for report in reports)
+
+
+def format_author_report_preview(report):
+    """Render one parsed author report as preview text"""
+    preview_text = f"Username: {report['username']}\n"
+    preview_text += f"Labels: {', '.join(report['label_list'])}\n\n"
+
+    for label, details in report["labels"].items():
+        preview_text += f"{label}:\n"
+        preview_text += f"  Label: {details['label']}\n"
+
+        if details["referenceLink"]:
+            preview_text += f"  Reference: {details['referenceLink']}\n"
+        else:
+            preview_text += "  Reference: None\n"
+
+        preview_text += "\n"
+
+    return preview_text + "----------------------------------------\n\n"
+
+
+def format_author_preview(reports):
+    """Render parsed author reports as preview text"""
+    return "".join(format_author_report_preview(report) for report in reports)
+
+
+def _ensure_container(parent, path, key, empty, operations):
+    """Return parent[key], creating it as an empty dict or list and journaling that if it is missing"""
+    if key not in parent:
+        parent[key] = empty()
+        operations.append({"op": "set", "path": path + [key], "value": empty()})
+    return parent[key]
+
+
+def _set_value(parent, path, key, value, operations):
+    """Set parent[key], journaling the value it replaces"""
+    operation = {"op": "set", "path": path + [key], "value": value}
+    if key in parent:
+        operation["old"] = parent[key]
+    parent[key] = value
+    operations.append(operation)
+
+
+class ModStatusIndex:
+    """In-memory index from (game, mod_id) to the mod's status category
+
+    Mirrors the list-based "Mod Statuses" and "Mod Descriptors" sections of a
+    mod status document so existence checks cost constant time. The document
+    itself stays the source of truth for serialization; the index must be
+    updated through add() whenever a mod is added to it.
+
+    Games are indexed the first time a report touches them, so a lazily
+    loaded document only decodes the games that are actually looked at.
+
+    The (section, game) pairs modified through the index are collected in
+    changed so the file can be saved incrementally, and the changes
+    themselves in operations for the merge journal.
+    """
+
+    def __init__(self, mod_status_data):
+        self.mod_status_data = mod_status_data
+        self.statuses = {}
+        self.indexed_games = set()
+        self.changed = set()
+        self.operations = []
+        self.rebuild()
+
+    def rebuild(self):
+        """Forget the indexed games so they are re-read from the document"""
+        self.statuses = {}
+        self.indexed_games = set()
+
+    def reindex(self, changed):
+        """Forget the games of the (section, game) pairs changed in the document outside the index"""
+        games = set()
+        for section, game in changed:
+            if section in ("Mod Statuses", "Mod Descriptors"):
+                if game is None:
+                    # A whole section was replaced
+                    self.rebuild()
+                    return
+                games.add(game)
+        games &= self.indexed_games
+        if games:
+            self.indexed_games -= games
+            self.statuses = {key: status for key, status in self.statuses.items() if key[0] not in games}
+
+    def _index_game(self, game):
+        """Index one game's mods the first time it is needed"""
+        if game in self.indexed_games:
+            return
+        self.indexed_games.add(game)
+
+        statuses = self.statuses
+        categories = self.mod_status_data.get("Mod Statuses", {}).get(game, {})
+        for status_category, mod_ids in categories.items():
+            for mod_id in mod_ids:
+                # The first category listing a mod wins, as it did for the linear scan
+                statuses.setdefault((game, mod_id), status_category)
+
+        # Mods that only have a descriptor still count as existing
+        for mod_id in self.mod_status_data.get("Mod Descriptors", {}).get(game, {}):
+            statuses.setdefault((game, mod_id), None)
+
+    def _index_all_games(self):
+        """Index every game in the document"""
+        for section in ("Mod Statuses", "Mod Descriptors"):
+            for game in self.mod_status_data.get(section, {}):
+                self._index_game(game)
+
+    def __contains__(self, key):
+        self._index_game(key[0])
+        return key in self.statuses
+
+    def __len__(self):
+        self._index_all_games()
+        return len(self.statuses)
+
+    def lookup(self, game, mod_id):
+        """Return (status, descriptor) for a known mod, or None
+
+        Either element may be None when the mod only appears in one section.
+        """
+        self._index_game(game)
+        key = (game, mod_id)
+        if key not in self.statuses:
+            return None
+        descriptor = self.mod_status_data.get("Mod Descriptors", {}).get(game, {}).get(mod_id)
+        return self.statuses[key], descriptor
+
+    def add(self, game, mod_id, status, descriptor):
+        """Add a new mod to both the document and the index"""
+        self._index_game(game)
+        operations = self.operations
+        mod_statuses = _ensure_container(self.mod_status_data, [], "Mod Statuses", dict, operations)
+        mod_descriptors = _ensure_container(self.mod_status_data, [], "Mod Descriptors", dict, operations)
+
+        # The index guarantees the id is not listed anywhere yet, so no list scan is needed
+        game_statuses = _ensure_container(mod_statuses, ["Mod Statuses"], game, dict, operations)
+        _ensure_container(game_statuses, ["Mod Statuses", game], status, list, operations).append(mod_id)
+        operations.append({"op": "append", "path": ["Mod Statuses", game, status], "value": mod_id})
+        game_descriptors = _ensure_container(mod_descriptors, ["Mod Descriptors"], game, dict, operations)
+        _set_value(game_descriptors, ["Mod Descriptors", game], mod_id, descriptor, operations)
+        self.statuses[(game, mod_id)] = status
+        self.changed.add(("Mod Statuses", game))
+        self.changed.add(("Mod Descriptors", game))
+
+    def update(self, game, mod_id, status, descriptor):
+        """Change the status and descriptor of a mod already in the document
+
+        A mod that changes status moves from the end of one category's list
+        to the end of the other's, as if it had been added with its new status.
+        """
+        self._index_game(game)
+        operations = self.operations
+        old_status = self.statuses.get((game, mod_id))
+        if old_status != status:
+            mod_statuses = _ensure_container(self.mod_status_data, [], "Mod Statuses", dict, operations)
+            game_statuses = _ensure_container(mod_statuses, ["Mod Statuses"], game, dict, operations)
+            if old_status is not None:
+                mod_ids = game_statuses[old_status]
+                position = mod_ids.index(mod_id)
+                del mod_ids[position]
+                operations.append({"op": "remove", "path": ["Mod Statuses", game, old_status], "index": position,
+                                   "value": mod_id})
+            _ensure_container(game_statuses, ["Mod Statuses", game], status, list, operations).append(mod_id)
+            operations.append({"op": "append", "path": ["Mod Statuses", game, status], "value": mod_id})
+            self.statuses[(game, mod_id)] = status
+            self.changed.add(("Mod Statuses", game))
+
+        mod_descriptors = _ensure_container(self.mod_status_data, [], "Mod Descriptors", dict, operations)
+        game_descriptors = _ensure_container(mod_descriptors, ["Mod Descriptors"], game, dict, operations)
+        _set_value(game_descriptors, ["Mod Descriptors", game], mod_id, descriptor, operations)
+        self.changed.add(("Mod Descriptors", game))
+
+    def pop_changed(self):
+        """Return and reset the (section, game) pairs modified since the last call"""
+        changed = self.changed
+        self.changed = set()
+        return changed
+
+    def pop_operations(self):
+        """Return and reset the operations applied since the last call, for the merge journal"""
+        operations = self.operations
+        self.operations = []
+        return operations
+
+
+def merge_mod_reports(mod_status_data, reports, index=None):
+    """Merge parsed mod reports into the mod status data
+
+    Pass the ModStatusIndex built for mod_status_data to avoid rebuilding it
+    on every call. Returns a tuple of (processed_mods, skipped_mods) message
+    lists.
+    """
+    if index is None:
+        index = ModStatusIndex(mod_status_data)
+
+    skipped_mods = []
+    processed_mods = []
+
+    for report in reports:
+        game = report["game"]
+        mod_id = report["id"]
+        status = report["status"]
+
+        # Check if mod already exists in any status category or descriptor
+        existing = index.lookup(game, mod_id)
+        if existing is not None:
+            existing_status, existing_descriptor = existing
+            existing_reason = None
+            if existing_descriptor is not None:
+                existing_reason = existing_descriptor.get("reason", "No reason provided")
+
+            skip_message = f"{game}/{mod_id}"
+            if existing_status == status and existing_reason == report.get("reason"):
+                skip_message += f" {DUPLICATE_MOD_NOTE}"
+            else:
+                skip_message += f"\n    Status: {existing_status}\n    Reason: {existing_reason}"
+            skipped_mods.append(skip_message)
+            logger.debug("Skipping mod: %s", skip_message)
+            continue
+
+        processed_mods.append(f"{game}/{mod_id}")
+
+        # Add mod descriptor
+        descriptor = {}
+        if "reason" in report:
+            descriptor["reason"] = report["reason"]
+
+        if "alternative" in report:
+            descriptor["alternative"] = report["alternative"]
+
+        index.add(game, mod_id, status, descriptor)
+
+    return processed_mods, skipped_mods
+
+
+def compare_single_tooltip(existing_tooltip, new_tooltip):
+    """Compare a single tooltip's contents"""
+    if not existing_tooltip and not new_tooltip:
+        return True
+
+    return (existing_tooltip.get("label") == new_tooltip.get("label") and
+            existing_tooltip.get("referenceLink") == new_tooltip.get("referenceLink"))
+
+
+def _clean_tooltip(details):
+    """Build a tooltip entry with any invisible filler characters removed"""
+    label_text = details["label"]
+    reference_link = details["referenceLink"]
+
+    # Remove the invisible character if present
+    if isinstance(label_text, str):
+        label_text = label_text.replace("\u3164", "")
+    if isinstance(reference_link, str):
+        reference_link = reference_link.replace("\u3164", "")
+
+    return {
+        "label": label_text,
+        "referenceLink": reference_link
+    }
+
+
+def author_sort_key(username):
+    """Sort key keeping label author lists in alphabetical order"""
+    return (username.casefold(), username)
+
+
+def _author_list_operations(path, authors, added, ordered, was_sorted):
+    """Journal sorting a label's author list that had usernames appended to it
+
+    If the list was sorted before the usernames were appended, each one is
+    an insert at its final position; otherwise the whole list is replaced.
+    """
+    if not was_sorted:
+        added_set = set(added)
+        before = authors[:len(authors) - len(added)]
+        if [username for username in ordered if username not in added_set] != before:
+            return [{"op": "set", "path": path, "value": list(ordered), "old": before}]
+    positions = sorted(bisect.bisect_left(ordered, author_sort_key(username), key=author_sort_key)
+                       for username in added)
+    return [{"op": "insert", "path": path, "index": index, "value": ordered[index]} for index in positions]
+
+
+class AuthorStatusIndex:
+    """In-memory username <-> label index over an author status document
+
+    Keeps a set of authors per label and the reverse username -> labels map so
+    membership checks cost constant time. Label author lists in the document
+    are kept in sync through add(), and sort_labels() restores the sorted list
+    layout for the labels touched since the last call.
+
+    The (section, key) pairs modified through the index are collected in
+    changed so the file can be saved incrementally, and the changes
+    themselves in operations for the merge journal.
+    """
+
+    def __init__(self, author_status_data):
+        self.author_status_data = author_status_data
+        self.label_authors = {}
+        self.author_labels = {}
+        self.dirty_labels = set()
+        self.added_authors = {}
+        # Labels whose author list in the document is known to be sorted
+        self.sorted_labels = set()
+        self.changed = set()
+        self.operations = []
+        self.rebuild()
+
+    def rebuild(self):
+        """Rebuild the index from the author status document"""
+        label_authors = {}
+        author_labels = {}
+        for label_name, label_data in self.author_status_data.get("Labels", {}).items():
+            authors = set(label_data.get("authors", []))
+            label_authors[label_name] = authors
+            for username in authors:
+                author_labels.setdefault(username, set()).add(label_name)
+
+        self.label_authors = label_authors
+        self.author_labels = author_labels
+        self.dirty_labels = set()
+        self.added_authors = {}
+        self.sorted_labels = set()
+
+    def reindex(self, changed):
+        """Re-read the labels of the (section, label) pairs changed in the document outside the index"""
+        label_names = set()
+        for section, label_name in changed:
+            if section == "Labels":
+                if label_name is None:
+                    # The whole section was replaced
+                    self.rebuild()
+                    return
+                label_names.add(label_name)
+
+        labels = self.author_status_data.get("Labels", {})
+        for label_name in label_names:
+            for username in self.label_authors.pop(label_name, set()):
+                author_labels = self.author_labels[username]
+                author_labels.discard(label_name)
+                if not author_labels:
+                    del self.author_labels[username]
+            self.dirty_labels.discard(label_name)
+            self.added_authors.pop(label_name, None)
+            self.sorted_labels.discard(label_name)
+            if label_name in labels:
+                authors = set(labels[label_name].get("authors", []))
+                self.label_authors[label_name] = authors
+                for username in authors:
+                    self.author_labels.setdefault(username, set()).add(label_name)
+
+    def labels_for(self, username):
+        """Return the set of labels an author is listed under"""
+        return self.author_labels.get(username, set())
+
+    def has_label(self, username, label_name):
+        """Check whether an author is listed under a label"""
+        return username in self.label_authors.get(label_name, ())
+
+    def add(self, username, label_name):
+        """List an author under a label, creating the label if needed
+
+        Returns False if the label had to be created.
+        """
+        operations = self.operations
+        labels = _ensure_container(self.author_status_data, [], "Labels", dict, operations)
+        label_exists = label_name in labels
+        if not label_exists:
+            labels[label_name] = {"authors": []}
+            operations.append({"op": "set", "path": ["Labels", label_name], "value": {"authors": []}})
+            self.label_authors[label_name] = set()
+
+        authors = self.label_authors[label_name]
+        if username not in authors:
+            # Journaled by sort_labels(), once the author's place in the list is known
+            _ensure_container(labels[label_name], ["Labels", label_name], "authors", list, operations).append(username)
+            self.added_authors.setdefault(label_name, []).append(username)
+            authors.add(username)
+            self.author_labels.setdefault(username, set()).add(label_name)
+            self.dirty_labels.add(label_name)
+            self.changed.add(("Labels", label_name))
+
+        return label_exists
+
+    def set_tooltip(self, username, label_name, tooltip):
+        """Store the tooltip shown for an author under a label"""
+        operations = self.operations
+        tooltips = _ensure_container(self.author_status_data, [], "Tooltips", dict, operations)
+        author_tooltips = _ensure_container(tooltips, ["Tooltips"], username, dict, operations)
+        _set_value(author_tooltips, ["Tooltips", username], label_name, tooltip, operations)
+        self.changed.add(("Tooltips", username))
+
+    def pop_changed(self):
+        """Return and reset the (section, key) pairs modified since the last call"""
+        changed = self.changed
+        self.changed = set()
+        return changed
+
+    def pop_operations(self):
+        """Return and reset the operations applied since the last call, for the merge journal"""
+        operations = self.operations
+        self.operations = []
+        return operations
+
+    def sort_labels(self):
+        """Write the touched labels' author lists back in sorted order"""
+        labels = self.author_status_data["Labels"]
+        for label_name in sorted(self.dirty_labels):
+            authors = sorted(self.label_authors[label_name], key=author_sort_key)
+            self.operations.extend(_author_list_operations(
+                ["Labels", label_name, "authors"], labels[label_name]["authors"],
+                self.added_authors.pop(label_name, []), authors, label_name in self.sorted_labels))
+            labels[label_name]["authors"] = authors
+            self.sorted_labels.add(label_name)
+        self.dirty_labels = set()
+
+
+def merge_author_reports(author_status_data, reports, index=None):
+    """Merge parsed author reports into the author status data
+
+    Pass the AuthorStatusIndex built for author_status_data to avoid
+    rebuilding it on every call. Returns a tuple of (processed_labels,
+    processed_authors, skipped_labels).
+    """
+    if index is None:
+        index = AuthorStatusIndex(author_status_data)
+
+    skipped_labels = []
+    processed_authors = []
+    seen_authors = set()
+    processed_labels = []
+    added_labels = set()
+
+    for report in reports:
+        username = report["username"]
+
+        # Snapshot the labels the author had before this report
+        existing_labels = set(index.labels_for(username))
+
+        # Check existing tooltips
+        existing_tooltips = author_status_data.get("Tooltips", {}).get(username, {})
+
+        # Process each label individually
+        for label_name in report["label_list"]:
+            # Check if this label already exists for this author
+            if label_name in existing_labels:
+                # Check if tooltip details are the same
+                if (label_name in existing_tooltips and
+                        label_name in report["labels"] and
+                        compare_single_tooltip(existing_tooltips[label_name], report["labels"][label_name])):
+                    skip_message = f"{username}/{label_name} {DUPLICATE_LABEL_NOTE}"
+                    skipped_labels.append(skip_message)
+                    logger.debug("Skipping label: %s", skip_message)
+                    continue
+                elif label_name in existing_tooltips and label_name in report["labels"]:
+                    # Label exists but with different details - update it
+                    logger.debug("Updating tooltip for %s under %s", username, label_name)
+                    index.set_tooltip(username, label_name, _clean_tooltip(report["labels"][label_name]))
+                    processed_labels.append(f"{username}/{label_name} (Updated details)")
+                    continue
+
+            # Add this label for the author; a follow-up report from AuthorReportCollapser
+            # only adds details to a label already counted
+            if (username, label_name) not in added_labels:
+                added_labels.add((username, label_name))
+                processed_labels.append(f"{username}/{label_name}")
+
+            # Add author to the label
+            logger.debug("Adding %s to label %s", username, label_name)
+            if not index.add(username, label_name):
+                logger.info("Label %s not found; created it for %s", label_name, username)
+
+            # Add tooltip details for this label
+            if label_name in report["labels"]:
+                logger.debug("Adding tooltip for %s under %s", username, label_name)
+                index.set_tooltip(username, label_name, _clean_tooltip(report["labels"][label_name]))
+
+        # Add to processed authors if not already there
+        if username not in seen_authors:
+            seen_authors.add(username)
+            processed_authors.append(username)
+
+    index.sort_labels()
+
+    return processed_labels, processed_authors, skipped_labels
+
+
+def _format_collapse_notes(collapsed, conflicts):
+    """Describe what collapsing repeated reports did, for the save summaries"""
+    message = ""
+    if collapsed:
+        message += f"\n\nCollapsed {len(collapsed)} entries repeated within the batch:"
+        for note in collapsed:
+            message += f"\n{note}"
+    if conflicts:
+        message += f"\n\nNot saved, {len(conflicts)} entries with conflicting reports within the batch:"
+        for note in conflicts:
+            message += f"\n{note}"
+    return message
+
+
+def format_mod_save_summary(processed_mods, skipped_mods, path, collapsed=(), conflicts=()):
+    """Build the result message shown after saving mod reports
+
+    collapsed and conflicts are the messages of a ModReportCollapser, if
+    repeated reports were collapsed before merging.
+    """
+    result_message = f"Successfully saved {len(processed_mods)} mod reports to {path}"
+    result_message += _format_collapse_notes(collapsed, conflicts)
+    if skipped_mods:
+        # Group skipped mods by game
+        skipped_by_game = {}
+        # Also track duplicate reports separately
+        duplicate_by_game = {}
+
+        for mod in skipped_mods:
+            game_id = mod.split('/')[0]
+            mod_id = mod.split('/')[1].split(' ')[0]  # Extract just the mod ID
+
+            # Check if this is a duplicate report
+            if DUPLICATE_MOD_NOTE in mod:
+                duplicate_by_game.setdefault(game_id, []).append(mod_id)
+            else:
+                # Regular skipped mod with different status/reason
+                skipped_by_game.setdefault(game_id, []).append(mod)
+
+        # Format the skipped mods message
+        result_message += f"\n\nSkipped {len(skipped_mods)} existing mods:"
+
+        # First list duplicate reports in a compact format
+        if duplicate_by_game:
+            result_message += "\n\nDuplicate reports (same status and reason):"
+            for game, mod_ids in sorted(duplicate_by_game.items()):
+                result_message += f"\n{game}: {', '.join(mod_ids)}"
+
+        # Then list other skipped mods with different status/reason
+        if skipped_by_game:
+            result_message += "\n\nMods with different status/reason:"
+            for game, mods in sorted(skipped_by_game.items()):
+                result_message += f"\n\n{game}:"
+                for mod in mods:
+                    # Remove the game prefix from each entry since we're grouping by game
+                    mod_entry = mod.replace(f"{game}/", "")
+                    result_message += f"\n  - {mod_entry}"
+
+    return result_message
+
+
+def format_author_save_summary(processed_labels, processed_authors, skipped_labels, path, collapsed=(),
+                               conflicts=()):
+    """Build the result message shown after saving author reports
+
+    collapsed and conflicts are the messages of an AuthorReportCollapser, if
+    repeated reports were collapsed before merging.
+    """
+    result_message = f"Successfully saved {len(processed_labels)} labels for {len(processed_authors)} authors to {path}"
+    result_message += _format_collapse_notes(collapsed, conflicts)
+    if skipped_labels:
+        # Format the skipped labels message
+        result_message += f"\n\nSkipped {len(skipped_labels)} existing labels:"
+
+        # Group by author for better readability
+        skipped_by_author = {}
+        for label in skipped_labels:
+            author = label.split('/')[0]
+            skipped_by_author.setdefault(author, []).append(label.split('/')[1])
+
+        for author, labels in sorted(skipped_by_author.items()):
+            result_message += f"\n{author}: {', '.join(labels)}"
+
+    return result_message
@@ -1,14 +1,203 @@
 #!/usr/bin/env python3
 import sys
-import json
 import os
+import json
+import logging
+import time
+
+# Taken before the Qt imports, so the startup readout covers them
+STARTED_AT = time.perf_counter()
+
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QTabWidget, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QTextEdit, QComboBox, QPushButton, QMessageBox,
-    QGroupBox, QFormLayout, QScrollArea, QSplitter, QFileDialog
+    QGroupBox, QFormLayout, QScrollArea, QSplitter, QFileDialog, QProgressBar,
+    QTableView, QAbstractItemView
+)
+from PyQt6.QtCore import (
+    Qt, QSize, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal, QAbstractTableModel, QModelIndex,
+    QFileSystemWatcher
 )
-from PyQt6.QtCore import Qt, QSize
-from PyQt6.QtGui import QFont, QIcon
+from PyQt6.QtGui import QFont, QIcon, QColor, QTextCharFormat, QTextCursor, QTextFormat
+
+# The storage, publishing and thread page modules are imported where they
+# are first used, once the window is up
+import status_preview
+import status_updater_core as core
+
+logger = logging.getLogger(__name__)
+
+# Lines or reports handled between progress updates from a background job
+PROGRESS_STEP = 500
+
+# Pause in typing before the live preview catches up with the input
+LIVE_PREVIEW_DELAY_MS = 150
+# Edits spanning more lines than this (e.g. a large paste) are parsed in the background
+LIVE_PREVIEW_MAX_LINES = 2000
+
+INVALID_REPORT_COLOR = "#b00020"
+INVALID_REPORT_BACKGROUND = "#ffe0e0"
+
+# Issues listed per check in the details of an audit
+AUDIT_LIST_LIMIT = 200
+
+# Rows handed to the browse table at a time, as it is scrolled down
+BROWSE_FETCH_SIZE = 500
+
+# Pause after a status file changes on disk before it is read in, so a git
+# pull or an editor is done writing it
+WATCH_DELAY_MS = 500
+# Conflicting entries named in the warning about them
+WATCH_CONFLICT_LIMIT = 20
+
+# If set, every startup readout is appended to this file
+STARTUP_LOG_VARIABLE = "STATUS_UPDATER_STARTUP_LOG"
+
+class JobCancelled(Exception):
+    """Raised inside a background job once the user has cancelled it"""
+
+class WorkerSignals(QObject):
+    """Signals a background job uses to report back to the GUI thread"""
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+class Worker(QRunnable):
+    """Runs a job function on the thread pool
+    
+    The job is called as job(worker) and must not touch any widget; it reports
+    progress through worker.report_progress(), which raises JobCancelled once
+    cancellation was requested for a cancellable job.
+    """
+    def __init__(self, job, cancellable=True):
+        super().__init__()
+        self.job = job
+        self.cancellable = cancellable
+        self.cancel_requested = False
+        self.signals = WorkerSignals()
+    
+    def cancel(self):
+        """Ask the job to stop at its next progress report"""
+        if self.cancellable:
+            self.cancel_requested = True
+    
+    def report_progress(self, done, total):
+        """Report progress to the GUI thread, stopping the job if cancelled"""
+        if self.cancel_requested:
+            raise JobCancelled()
+        self.signals.progress.emit(done, total)
+    
+    def iter_with_progress(self, items):
+        """Yield items from a sized sequence while reporting progress"""
+        total = len(items)
+        for i, item in enumerate(items):
+            if i % PROGRESS_STEP == 0:
+                self.report_progress(i, total)
+            yield item
+        self.report_progress(total, total)
+    
+    def run(self):
+        try:
+            result = self.job(self)
+        except JobCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
+class BrowseModel(QAbstractTableModel):
+    """Table of the rows of a status file that match the browse search
+    
+    Only the numbers of the matching rows are held; cells are read from the
+    status document as the view draws them, and rows are handed to the view
+    in batches as it is scrolled down, so a search over every row of a
+    large file costs no more to show than one over a few.
+    """
+    
+    def __init__(self, edit_row):
+        super().__init__()
+        # Called with (browse index, row, column, text) to apply an edit
+        self.edit_row = edit_row
+        self.browse_index = None
+        self.matches = []
+        self.fetched = 0
+    
+    def show_rows(self, browse_index, matches):
+        """Replace the rows shown with the given rows of a BrowseIndex"""
+        self.beginResetModel()
+        self.browse_index = browse_index
+        self.matches = matches
+        self.fetched = min(len(matches), BROWSE_FETCH_SIZE)
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.fetched
+    
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid() or self.browse_index is None:
+            return 0
+        return len(self.browse_index.columns)
+    
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self.fetched < len(self.matches)
+    
+    def fetchMore(self, parent):
+        count = min(BROWSE_FETCH_SIZE, len(self.matches) - self.fetched)
+        if parent.isValid() or count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.fetched, self.fetched + count - 1)
+        self.fetched += count
+        self.endInsertRows()
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return None
+        value = self.browse_index.values(self.matches[index.row()])[index.column()]
+        return "" if value is None else str(value)
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or orientation != Qt.Orientation.Horizontal:
+            return None
+        return self.browse_index.columns[section] if self.browse_index is not None else None
+    
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid() and index.column() in self.browse_index.editable:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+    
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.EditRole or not index.isValid():
+            return False
+        if not self.edit_row(self.browse_index, self.matches[index.row()], index.column(), value):
+            return False
+        self.dataChanged.emit(index, index)
+        return True
+
+class StartupTimer:
+    """Times the steps of a cold start, from the first import to a usable window"""
+    
+    def __init__(self, started):
+        self.started = started
+        self.last = started
+        self.steps = []
+    
+    def mark(self, name):
+        """End a step at the current time"""
+        now = time.perf_counter()
+        self.steps.append((name, now - self.last))
+        self.last = now
+    
+    def total(self):
+        """Return the time from the start to the last step"""
+        return self.last - self.started
+    
+    def summary(self):
+        """Describe the startup steps on one line"""
+        steps = ", ".join(f"{name} {seconds:.3f}s" for name, seconds in self.steps)
+        return f"Started in {self.total():.3f}s ({steps})"
 
 class StatusUpdaterGUI(QMainWindow):
     def __init__(self):
@@ -17,37 +206,108 @@ class StatusUpdaterGUI(QMainWindow):
         self.setMinimumSize(900, 700)
         
         # Initialize file paths
-        self.mod_status_path = os.path.join("Resources", "mod-status.json")
-        self.author_status_path = os.path.join("Resources", "author-status.json")
-        
-        # Load JSON data
-        self.load_json_data()
-        
-        # Setup UI
+        self.mod_status_path = core.MOD_STATUS_PATH
+        self.author_status_path = core.AUTHOR_STATUS_PATH
+        # Keep the documents in a SQLite database instead of the JSON files if set
+        self.database_path = os.environ.get("STATUS_UPDATER_DATABASE")
+        
+        # Background jobs run one at a time on the thread pool
+        self.thread_pool = QThreadPool.globalInstance()
+        self.current_worker = None
+        self.job_controls = []
+        # Status files to load once the running job is done
+        self.pending_loads = []
+        
+        # Each status file is loaded in the background when its tab is first shown
+        self.mod_status_file = None
+        self.mod_status_data = None
+        self.mod_index = None
+        self.author_status_file = None
+        self.author_status_data = None
+        self.author_index = None
+        
+        # Search indexes of the browse tab, built when it first shows a file
+        # and dropped whenever the file changes other than through the tab
+        self.browse_indexes = {"mod": None, "author": None}
+        self.browse_model = None
+        # The browse tab waits for a load or other job to finish before indexing
+        self.browse_pending = False
+        
+        # Status files edited on disk while they are loaded are read in again,
+        # once writing pauses and no job is running
+        self.watch_timer = QTimer(self)
+        self.watch_timer.setSingleShot(True)
+        self.watch_timer.setInterval(WATCH_DELAY_MS)
+        self.watch_timer.timeout.connect(self.check_status_files)
+        self.file_watcher = QFileSystemWatcher(self)
+        self.file_watcher.fileChanged.connect(lambda _: self.watch_timer.start())
+        # Files replaced by a rename drop out of the watch; their directory sees them come back
+        self.file_watcher.directoryChanged.connect(lambda _: self.watch_timer.start())
+        self.watch_pending = False
+        
+        # Setup UI; the tabs are filled in the first time they are selected
         self.setup_ui()
     
-    def load_json_data(self):
-        """Load JSON data from files"""
-        try:
-            with open(self.mod_status_path, 'r', encoding='utf-8') as f:
-                self.mod_status_data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            self.mod_status_data = {
-                "Mod Statuses": {},
-                "Mod Descriptors": {},
-                "Keyword Rules": {"global": {}}
-            }
-            QMessageBox.warning(self, "Warning", f"Could not load mod-status.json: {str(e)}")
-        
-        try:
-            with open(self.author_status_path, 'r', encoding='utf-8') as f:
-                self.author_status_data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            self.author_status_data = {
-                "Labels": {},
-                "Tooltips": {}
-            }
-            QMessageBox.warning(self, "Warning", f"Could not load author-status.json: {str(e)}")
+    def open_status_file(self, kind):
+        """Return the storage for the mod or author status document: its JSON file or the database"""
+        path = getattr(self, f"{kind}_status_path")
+        if self.database_path:
+            import status_journal
+            import status_sqlite
+            document = status_sqlite.MOD_DOCUMENT if kind == "mod" else status_sqlite.AUTHOR_DOCUMENT
+            return status_sqlite.SqliteStatusStore(self.database_path, document, path,
+                                                   status_journal.database_journal(self.database_path, document))
+        import status_delta
+        import status_journal
+        import status_json
+        return status_json.StatusFile(path, status_delta.DeltaLog(path), status_journal.MergeJournal(path))
+    
+    def load_status_data(self, kind):
+        """Load the mod or author status file in the background"""
+        if self.current_worker is not None:
+            self.pending_loads.append(kind)
+            return
+        name = os.path.basename(getattr(self, f"{kind}_status_path"))
+        
+        def job(worker):
+            start = time.perf_counter()
+            status_file = self.open_status_file(kind)
+            error = None
+            try:
+                # Games are only decoded once a report touches them, and kept
+                # as compact records for as long as the window is open
+                data = status_file.load(lazy=(kind == "mod"), compact=True)
+            except (FileNotFoundError, json.JSONDecodeError) as e:
+                data = core.empty_mod_status_data() if kind == "mod" else core.empty_author_status_data()
+                error = str(e)
+            index = core.ModStatusIndex(data) if kind == "mod" else core.AuthorStatusIndex(data)
+            logger.info("Loaded %s in %.3fs", name, time.perf_counter() - start)
+            return status_file, data, index, error
+        
+        def loaded(result):
+            status_file, data, index, error = result
+            setattr(self, f"{kind}_status_file", status_file)
+            setattr(self, f"{kind}_status_data", data)
+            setattr(self, f"{kind}_index", index)
+            if error is not None:
+                QMessageBox.warning(self, "Warning", f"Could not load {name}: {error}")
+            self.fill_insert_combo(kind)
+            self.status_data_changed(kind)
+            self.watch_status_files()
+            # Catch changes made between reading the file and watching it
+            self.watch_timer.start()
+        
+        self.start_job(f"Loading {name}...", job, loaded,
+                       lambda message: QMessageBox.critical(self, "Error", f"Failed to load {name}: {message}"),
+                       cancellable=False)
+    
+    def status_data_loaded(self, kind):
+        """Check that a status file is loaded before it is saved to, warning if not"""
+        if getattr(self, f"{kind}_status_data") is not None:
+            return True
+        QMessageBox.warning(self, "Warning", f"{os.path.basename(getattr(self, f'{kind}_status_path'))} "
+                                             "is not loaded. Please select it again.")
+        return False
     
     def setup_ui(self):
         """Setup the main UI components"""
@@ -57,21 +317,22 @@ class StatusUpdaterGUI(QMainWindow):
         main_layout = QVBoxLayout(central_widget)
         
         # Create tab widget
-        tab_widget = QTabWidget()
-        main_layout.addWidget(tab_widget)
+        self.tab_widget = QTabWidget()
+        main_layout.addWidget(self.tab_widget)
         
-        # Create tabs
+        # Create tabs, left empty until they are first selected
         mod_tab = QWidget()
         author_tab = QWidget()
+        self.browse_tab = QWidget()
         
-        tab_widget.addTab(mod_tab, "Mod Reports")
-        tab_widget.addTab(author_tab, "Author Reports")
-        
-        # Setup mod tab
-        self.setup_mod_tab(mod_tab)
-        
-        # Setup author tab
-        self.setup_author_tab(author_tab)
+        self.tab_widget.addTab(mod_tab, "Mod Reports")
+        self.tab_widget.addTab(author_tab, "Author Reports")
+        self.tab_widget.addTab(self.browse_tab, "Browse")
+        self.tabs = {"mod": mod_tab, "author": author_tab}
+        # The browse tab shows the files of the other two and loads none of its own
+        self.tab_setups = {mod_tab: (self.setup_mod_tab, "mod"), author_tab: (self.setup_author_tab, "author"),
+                           self.browse_tab: (self.setup_browse_tab, None)}
+        self.tab_widget.currentChanged.connect(self.tab_changed)
         
         # Add file path display and change buttons
         file_paths_group = QGroupBox("File Paths")
@@ -83,6 +344,7 @@ class StatusUpdaterGUI(QMainWindow):
         self.mod_path_label.setReadOnly(True)
         mod_path_button = QPushButton("Change")
         mod_path_button.clicked.connect(lambda: self.change_file_path("mod"))
+        self.job_controls.append(mod_path_button)
         mod_path_layout.addWidget(self.mod_path_label)
         mod_path_layout.addWidget(mod_path_button)
         
@@ -92,6 +354,7 @@ class StatusUpdaterGUI(QMainWindow):
         self.author_path_label.setReadOnly(True)
         author_path_button = QPushButton("Change")
         author_path_button.clicked.connect(lambda: self.change_file_path("author"))
+        self.job_controls.append(author_path_button)
         author_path_layout.addWidget(self.author_path_label)
         author_path_layout.addWidget(author_path_button)
         
@@ -100,6 +363,81 @@ class StatusUpdaterGUI(QMainWindow):
         file_paths_group.setLayout(file_paths_layout)
         
         main_layout.addWidget(file_paths_group)
+        
+        # Background job progress
+        self.job_label = QLabel()
+        self.job_progress = QProgressBar()
+        self.job_progress.setMaximumWidth(200)
+        self.job_cancel_button = QPushButton("Cancel")
+        self.job_cancel_button.clicked.connect(self.cancel_job)
+        self.startup_label = QLabel()
+        status_bar = self.statusBar()
+        status_bar.addWidget(self.job_label, 1)
+        status_bar.addPermanentWidget(self.startup_label)
+        status_bar.addPermanentWidget(self.job_progress)
+        status_bar.addPermanentWidget(self.job_cancel_button)
+        self.job_progress.hide()
+        self.job_cancel_button.hide()
+    
+    def build_tab(self, tab):
+        """Fill a tab in the first time it is selected, and load its status file"""
+        if tab not in self.tab_setups:
+            return
+        setup, kind = self.tab_setups.pop(tab)
+        first_control = len(self.job_controls)
+        setup(tab)
+        # Controls made while a job runs start out disabled, like the others
+        if self.current_worker is not None:
+            for control in self.job_controls[first_control:]:
+                control.setEnabled(False)
+        if kind is not None:
+            self.fill_insert_combo(kind)
+            self.load_status_data(kind)
+    
+    def tab_changed(self, index):
+        """Build a tab the first time it is selected, and bring the browse tab up to date when it is"""
+        tab = self.tab_widget.widget(index)
+        self.build_tab(tab)
+        if tab is self.browse_tab:
+            self.refresh_browse()
+    
+    def finish_startup(self, timer):
+        """Build the visible tab once the window has been painted, and show the startup readout"""
+        timer.mark("first paint")
+        self.build_tab(self.tab_widget.currentWidget())
+        timer.mark("first tab")
+        
+        summary = timer.summary()
+        logger.info("%s", summary)
+        self.startup_label.setText(f"Started in {timer.total():.2f}s")
+        self.startup_label.setToolTip(summary)
+        startup_log = os.environ.get(STARTUP_LOG_VARIABLE)
+        if startup_log:
+            try:
+                with open(startup_log, 'a', encoding='utf-8') as f:
+                    f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')}\t{summary}\n")
+            except OSError as e:
+                logger.warning("Could not write the startup readout to %s: %s", startup_log, str(e))
+    
+    def fill_insert_combo(self, kind):
+        """List the games or labels of the loaded status file in the combo that inserts them"""
+        if kind == "mod":
+            combo = getattr(self, "game_combo", None)
+            data = self.mod_status_data
+            section = "Mod Statuses"
+            defaults = ["baldursgate3", "skyrimspecialedition", "newvegas"]
+        else:
+            combo = getattr(self, "label_combo", None)
+            data = self.author_status_data
+            section = "Labels"
+            defaults = ["Bug Ignorer", "Flight Risk", "Copystriker", "Paywaller", "Incident", "Troon", "Pride Flag Modder"]
+        # The tab is not built yet
+        if combo is None:
+            return
+        
+        names = sorted(data[section].keys()) if data is not None and section in data else []
+        combo.clear()
+        combo.addItems(names or defaults)
     
     def setup_mod_tab(self, tab):
         """Setup the mod reports tab"""
@@ -127,6 +465,7 @@ class StatusUpdaterGUI(QMainWindow):
         bulk_layout.addWidget(bulk_label)
         
         self.mod_bulk_input = QTextEdit()
+        self.mod_bulk_input.setAcceptRichText(False)
         self.mod_bulk_input.setPlaceholderText("Game Shortname: baldursgate3\n"
                                               "Mod ID: 12345\n"
                                               "Status: BROKEN\n"
@@ -148,14 +487,8 @@ class StatusUpdaterGUI(QMainWindow):
         # Game options
         game_layout = QHBoxLayout()
         game_label = QLabel("Common Games:")
+        # Filled with the games of mod-status.json once it is loaded
         self.game_combo = QComboBox()
-        
-        # Get unique game names from mod status data
-        games = set()
-        if "Mod Statuses" in self.mod_status_data:
-            games.update(self.mod_status_data["Mod Statuses"].keys())
-        
-        self.game_combo.addItems(sorted(games) if games else ["baldursgate3", "skyrimspecialedition", "newvegas"])
         self.game_combo.setToolTip("Click to insert game at cursor position")
         self.game_combo.activated.connect(self.insert_game)
         game_layout.addWidget(game_label)
@@ -166,6 +499,17 @@ class StatusUpdaterGUI(QMainWindow):
         parse_button = QPushButton("Parse and Preview")
         parse_button.clicked.connect(self.parse_mod_reports)
         bulk_layout.addWidget(parse_button)
+        self.job_controls.append(parse_button)
+        
+        # Reports read straight from saved thread pages skip the input box
+        import_layout = QHBoxLayout()
+        import_button = QPushButton("Import Thread Pages...")
+        import_button.clicked.connect(lambda: self.import_thread_pages("mod"))
+        import_layout.addWidget(import_button)
+        self.job_controls.append(import_button)
+        self.mod_import_label = QLabel()
+        import_layout.addWidget(self.mod_import_label, 1)
+        bulk_layout.addLayout(import_layout)
         
         bulk_group.setLayout(bulk_layout)
         input_layout.addWidget(bulk_group)
@@ -176,11 +520,28 @@ class StatusUpdaterGUI(QMainWindow):
         save_button = QPushButton("Save to JSON")
         save_button.clicked.connect(self.save_mod_reports)
         buttons_layout.addWidget(save_button)
+        self.job_controls.append(save_button)
+        
+        undo_button = QPushButton("Undo Last Save")
+        undo_button.clicked.connect(lambda: self.undo_last_save("mod"))
+        buttons_layout.addWidget(undo_button)
+        self.job_controls.append(undo_button)
+        
+        audit_button = QPushButton("Audit")
+        audit_button.clicked.connect(lambda: self.audit_status_file("mod"))
+        buttons_layout.addWidget(audit_button)
+        self.job_controls.append(audit_button)
         
         clear_button = QPushButton("Clear")
         clear_button.clicked.connect(lambda: self.mod_bulk_input.clear())
         buttons_layout.addWidget(clear_button)
         
+        buttons_layout.addWidget(QLabel("Repeated reports:"))
+        self.mod_duplicate_combo = QComboBox()
+        self.mod_duplicate_combo.addItems(core.DUPLICATE_POLICIES)
+        self.mod_duplicate_combo.setCurrentText(core.DEFAULT_MOD_DUPLICATE_POLICY)
+        buttons_layout.addWidget(self.mod_duplicate_combo)
+        
         input_layout.addLayout(buttons_layout)
         
         # Preview section
@@ -192,6 +553,7 @@ class StatusUpdaterGUI(QMainWindow):
         
         self.mod_preview = QTextEdit()
         self.mod_preview.setReadOnly(True)
+        self.mod_preview.setUndoRedoEnabled(False)
         preview_inner_layout.addWidget(self.mod_preview)
         
         preview_group.setLayout(preview_inner_layout)
@@ -202,8 +564,14 @@ class StatusUpdaterGUI(QMainWindow):
         splitter.addWidget(preview_widget)
         splitter.setSizes([450, 450])
         
-        # Store parsed reports
+        # Store parsed reports, and those imported from thread pages
         self.parsed_mod_reports = []
+        self.imported_mod_reports = []
+        
+        # Re-parse the input as it is edited, once typing pauses
+        self.mod_live_parser = status_preview.mod_report_parser()
+        self.mod_preview_timer = self.create_preview_timer(self.refresh_mod_preview)
+        self.mod_bulk_input.textChanged.connect(self.mod_preview_timer.start)
     
     def setup_author_tab(self, tab):
         """Setup the author reports tab"""
@@ -231,6 +599,7 @@ class StatusUpdaterGUI(QMainWindow):
         bulk_layout.addWidget(bulk_label)
         
         self.author_bulk_input = QTextEdit()
+        self.author_bulk_input.setAcceptRichText(False)
         self.author_bulk_input.setPlaceholderText("Username: ExampleUser\n"
                                                  "Labels: Bug Ignorer, Flight Risk\n\n"
                                                  "Bug Ignorer:\n"
@@ -244,15 +613,8 @@ class StatusUpdaterGUI(QMainWindow):
         # Label options
         label_layout = QHBoxLayout()
         label_text = QLabel("Available Labels:")
+        # Filled with the labels of author-status.json once it is loaded
         self.label_combo = QComboBox()
-        
-        # Get unique label names from author status data
-        labels = []
-        if "Labels" in self.author_status_data:
-            labels = list(self.author_status_data["Labels"].keys())
-        
-        self.label_combo.addItems(sorted(labels) if labels else 
-                                ["Bug Ignorer", "Flight Risk", "Copystriker", "Paywaller", "Incident", "Troon", "Pride Flag Modder"])
         self.label_combo.setToolTip("Click to insert label at cursor position")
         self.label_combo.activated.connect(self.insert_label)
         label_layout.addWidget(label_text)
@@ -263,6 +625,17 @@ class StatusUpdaterGUI(QMainWindow):
         parse_button = QPushButton("Parse and Preview")
         parse_button.clicked.connect(self.parse_author_reports)
         bulk_layout.addWidget(parse_button)
+        self.job_controls.append(parse_button)
+        
+        # Reports read straight from saved thread pages skip the input box
+        import_layout = QHBoxLayout()
+        import_button = QPushButton("Import Thread Pages...")
+        import_button.clicked.connect(lambda: self.import_thread_pages("author"))
+        import_layout.addWidget(import_button)
+        self.job_controls.append(import_button)
+        self.author_import_label = QLabel()
+        import_layout.addWidget(self.author_import_label, 1)
+        bulk_layout.addLayout(import_layout)
         
         bulk_group.setLayout(bulk_layout)
         input_layout.addWidget(bulk_group)
@@ -273,11 +646,28 @@ class StatusUpdaterGUI(QMainWindow):
         save_button = QPushButton("Save to JSON")
         save_button.clicked.connect(self.save_author_reports)
         buttons_layout.addWidget(save_button)
+        self.job_controls.append(save_button)
+        
+        undo_button = QPushButton("Undo Last Save")
+        undo_button.clicked.connect(lambda: self.undo_last_save("author"))
+        buttons_layout.addWidget(undo_button)
+        self.job_controls.append(undo_button)
+        
+        audit_button = QPushButton("Audit")
+        audit_button.clicked.connect(lambda: self.audit_status_file("author"))
+        buttons_layout.addWidget(audit_button)
+        self.job_controls.append(audit_button)
         
         clear_button = QPushButton("Clear")
         clear_button.clicked.connect(lambda: self.author_bulk_input.clear())
         buttons_layout.addWidget(clear_button)
         
+        buttons_layout.addWidget(QLabel("Repeated reports:"))
+        self.author_duplicate_combo = QComboBox()
+        self.author_duplicate_combo.addItems(core.DUPLICATE_POLICIES)
+        self.author_duplicate_combo.setCurrentText(core.DEFAULT_AUTHOR_DUPLICATE_POLICY)
+        buttons_layout.addWidget(self.author_duplicate_combo)
+        
         input_layout.addLayout(buttons_layout)
         
         # Preview section
@@ -289,6 +679,7 @@ class StatusUpdaterGUI(QMainWindow):
         
         self.author_preview = QTextEdit()
         self.author_preview.setReadOnly(True)
+        self.author_preview.setUndoRedoEnabled(False)
         preview_inner_layout.addWidget(self.author_preview)
         
         preview_group.setLayout(preview_inner_layout)
@@ -299,8 +690,57 @@ class StatusUpdaterGUI(QMainWindow):
         splitter.addWidget(preview_widget)
         splitter.setSizes([450, 450])
         
-        # Store parsed reports
+        # Store parsed reports, and those imported from thread pages
         self.parsed_author_reports = []
+        self.imported_author_reports = []
+        
+        # Re-parse the input as it is edited, once typing pauses
+        self.author_live_parser = status_preview.author_report_parser()
+        self.author_preview_timer = self.create_preview_timer(self.refresh_author_preview)
+        self.author_bulk_input.textChanged.connect(self.author_preview_timer.start)
+    
+    def setup_browse_tab(self, tab):
+        """Setup the tab browsing, searching and editing the loaded status files"""
+        layout = QVBoxLayout(tab)
+        
+        # File and search
+        search_layout = QHBoxLayout()
+        self.browse_kind_combo = QComboBox()
+        self.browse_kind_combo.addItems(["Mod Statuses", "Author Labels"])
+        self.browse_kind_combo.currentIndexChanged.connect(lambda _: self.refresh_browse())
+        search_layout.addWidget(self.browse_kind_combo)
+        self.browse_search = QLineEdit()
+        self.browse_search.setPlaceholderText("Search, e.g. skyrim, game:skyrim id:123, reason:*crash, "
+                                              "user:name label:paywaller")
+        self.browse_search.setClearButtonEnabled(True)
+        self.browse_search.textChanged.connect(lambda _: self.search_browse())
+        search_layout.addWidget(self.browse_search, 1)
+        self.browse_count_label = QLabel()
+        search_layout.addWidget(self.browse_count_label)
+        layout.addLayout(search_layout)
+        
+        help_label = QLabel("Terms must all match. field:text matches the start of a column, field:*text "
+                            "anywhere in it, and a bare term anywhere in the row. Double-click a status, reason, "
+                            "alternative, details or reference to edit it; each edit is saved on its own and "
+                            "Undo Last Save reverts it.")
+        help_label.setWordWrap(True)
+        layout.addWidget(help_label)
+        
+        # Rows are read from the status file as they are drawn
+        self.browse_model = BrowseModel(self.edit_browse_row)
+        self.browse_view = QTableView()
+        self.browse_view.setModel(self.browse_model)
+        self.browse_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.browse_view.setWordWrap(False)
+        self.browse_view.verticalHeader().hide()
+        self.browse_view.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.browse_view)
+        # Edits are saved by a job, so none are made while another runs
+        self.job_controls.append(self.browse_view)
+        
+        # Browsing needs both status files
+        for kind in ("mod", "author"):
+            self.build_tab(self.tabs[kind])
     
     def insert_status(self):
         """Insert selected status at cursor position"""
@@ -320,592 +760,648 @@ class StatusUpdaterGUI(QMainWindow):
         cursor = self.author_bulk_input.textCursor()
         cursor.insertText(label)
     
+    def start_job(self, description, job, on_finished, on_failed, cancellable=True):
+        """Run job(worker) on the thread pool and deliver its result to on_finished"""
+        if self.current_worker is not None:
+            return
+        
+        worker = Worker(job, cancellable)
+        worker.signals.progress.connect(self.update_job_progress)
+        worker.signals.finished.connect(lambda result: self.finish_job(on_finished, result))
+        worker.signals.failed.connect(lambda message: self.finish_job(on_failed, message))
+        worker.signals.cancelled.connect(lambda: self.finish_job(None, None))
+        self.current_worker = worker
+        
+        for control in self.job_controls:
+            control.setEnabled(False)
+        self.job_label.setText(description)
+        self.job_progress.setRange(0, 0)
+        self.job_progress.show()
+        self.job_cancel_button.setVisible(cancellable)
+        self.job_cancel_button.setEnabled(True)
+        
+        self.thread_pool.start(worker)
+    
+    def update_job_progress(self, done, total):
+        """Show the progress of the running background job"""
+        self.job_progress.setRange(0, total)
+        self.job_progress.setValue(done)
+    
+    def cancel_job(self):
+        """Cancel the running background job"""
+        if self.current_worker is not None:
+            self.current_worker.cancel()
+            self.job_cancel_button.setEnabled(False)
+            self.job_label.setText("Cancelling...")
+    
+    def finish_job(self, callback, value):
+        """Reset the job controls and hand the job's outcome to callback"""
+        self.current_worker = None
+        for control in self.job_controls:
+            control.setEnabled(True)
+        self.job_label.clear()
+        self.job_progress.hide()
+        self.job_cancel_button.hide()
+        
+        if callback is not None:
+            callback(value)
+        if self.pending_loads and self.current_worker is None:
+            self.load_status_data(self.pending_loads.pop(0))
+        if self.browse_pending and self.current_worker is None:
+            self.refresh_browse()
+        if self.watch_pending and self.current_worker is None:
+            self.check_status_files()
+    
+    def create_preview_timer(self, refresh):
+        """Create the timer that holds a live preview refresh back until typing pauses"""
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.setInterval(LIVE_PREVIEW_DELAY_MS)
+        timer.timeout.connect(refresh)
+        return timer
+    
+    def refresh_live_preview(self, bulk_input, preview, live_parser):
+        """Re-parse the edited reports and patch their part of the preview
+        
+        Returns False without touching anything if the edit is too big to
+        handle on the GUI thread.
+        """
+        start = time.perf_counter()
+        patch = live_parser.update(bulk_input.toPlainText(), LIVE_PREVIEW_MAX_LINES)
+        if patch is None:
+            return False
+        
+        self.patch_preview(preview, patch)
+        self.highlight_problems(bulk_input, live_parser)
+        logger.debug("Live preview refreshed in %.1f ms", (time.perf_counter() - start) * 1000)
+        return True
+    
+    def flush_live_preview(self, preview_timer, bulk_input, preview, live_parser):
+        """Parse an edit still waiting for the preview delay, so a save gets the reports of the current text
+        
+        Returns True if the reports changed.
+        """
+        if bulk_input.toPlainText() == live_parser.text:
+            return False
+        preview_timer.stop()
+        patch = live_parser.update(bulk_input.toPlainText())
+        self.patch_preview(preview, patch)
+        self.highlight_problems(bulk_input, live_parser)
+        return True
+    
+    def patch_preview(self, preview, patch):
+        """Replace the changed lines of a preview with freshly rendered reports"""
+        first_line, removed_line_count, previews = patch
+        document = preview.document()
+        
+        def line_position(line):
+            block = document.findBlockByNumber(line)
+            return block.position() if block.isValid() else document.characterCount() - 1
+        
+        valid_format = QTextCharFormat()
+        invalid_format = QTextCharFormat()
+        invalid_format.setForeground(QColor(INVALID_REPORT_COLOR))
+        
+        cursor = QTextCursor(document)
+        cursor.beginEditBlock()
+        cursor.setPosition(line_position(first_line))
+        cursor.setPosition(line_position(first_line + removed_line_count), QTextCursor.MoveMode.KeepAnchor)
+        cursor.removeSelectedText()
+        for text, valid in previews:
+            cursor.insertText(text, valid_format if valid else invalid_format)
+        cursor.endEditBlock()
+    
+    def highlight_problems(self, bulk_input, live_parser):
+        """Mark the reports in the input that failed validation"""
+        document = bulk_input.document()
+        selections = []
+        for first_line, last_line in live_parser.problem_spans():
+            last_block = document.findBlockByNumber(last_line)
+            cursor = QTextCursor(document.findBlockByNumber(first_line))
+            cursor.setPosition(last_block.position() + last_block.length() - 1, QTextCursor.MoveMode.KeepAnchor)
+        
+            selection = QTextEdit.ExtraSelection()
+            selection.cursor = cursor
+            selection.format.setBackground(QColor(INVALID_REPORT_BACKGROUND))
+            selection.format.setProperty(QTextFormat.Property.FullWidthSelection, True)
+            selections.append(selection)
+        bulk_input.setExtraSelections(selections)
+    
     def parse_mod_reports(self):
-        """Parse the bulk mod reports input"""
-        bulk_text = self.mod_bulk_input.toPlainText().strip()
-        if not bulk_text:
+        """Parse the whole bulk mod reports input in the background"""
+        if not self.mod_bulk_input.toPlainText().strip():
             QMessageBox.warning(self, "Warning", "Please enter mod reports to parse.")
             return
         
-        # Split by separator lines (multiple dashes) to get individual reports
-        raw_reports = []
-        current_report = []
-        
-        lines = bulk_text.split("\n")
-        for line in lines:
-            # Check if this is a separator line (multiple dashes)
-            if line.strip() and all(c == '-' for c in line.strip()):
-                if current_report:
-                    raw_reports.append("\n".join(current_report))
-                    current_report = []
-            else:
-                current_report.append(line)
-        
-        # Add the last report if there is one
-        if current_report:
-            raw_reports.append("\n".join(current_report))
-        
-        # If no reports were found using separator lines, try the double blank line method
-        if not raw_reports:
-            # Split by double blank lines to get individual reports
-            raw_reports = []
-            current_report = []
-            blank_line_count = 0
-            
-            for line in lines:
-                if not line.strip():
-                    blank_line_count += 1
-                    if blank_line_count >= 2:  # Two or more consecutive blank lines separate reports
-                        if current_report:
-                            raw_reports.append("\n".join(current_report))
-                            current_report = []
-                        blank_line_count = 0
-                    else:
-                        current_report.append(line)  # Keep single blank lines within a report
-                else:
-                    blank_line_count = 0
-                    current_report.append(line)
-            
-            if current_report:
-                raw_reports.append("\n".join(current_report))
-        
-        # If still no reports were found, try the original method (split by \n\n)
-        if not raw_reports:
-            raw_reports = bulk_text.split("\n\n")
-            raw_reports = [report for report in raw_reports if report.strip()]
-        
-        self.parsed_mod_reports = []
-        preview_text = ""
-        
-        for raw_report in raw_reports:
-            if not raw_report.strip():
-                continue
-                
-            lines = raw_report.strip().split("\n")
-            report = {}
-            current_key = None
-            current_value = ""
-            
-            for line in lines:
-                # Check if this is a new key-value pair
-                if ":" in line and not line.startswith(" ") and not line.startswith("\t"):
-                    # Save the previous key-value pair if there was one
-                    if current_key:
-                        if current_key == "Game Shortname":
-                            report["game"] = current_value
-                        elif current_key == "Mod ID":
-                            report["id"] = current_value
-                        elif current_key == "Status":
-                            report["status"] = current_value
-                        elif current_key == "Reason":
-                            report["reason"] = current_value
-                        elif current_key == "Alternative":
-                            if current_value and current_value != "-" and current_value.lower() != "null":
-                                report["alternative"] = current_value
-                            else:
-                                report["alternative"] = None
-                    
-                    # Start a new key-value pair
-                    key, value = line.split(":", 1)
-                    current_key = key.strip()
-                    current_value = value.strip()
-                else:
-                    # This is a continuation of the previous value
-                    if current_key:
-                        if current_value:
-                            current_value += "\n" + line
-                        else:
-                            current_value = line.strip()
-            
-            # Save the last key-value pair
-            if current_key:
-                if current_key == "Game Shortname":
-                    report["game"] = current_value
-                elif current_key == "Mod ID":
-                    report["id"] = current_value
-                elif current_key == "Status":
-                    report["status"] = current_value
-                elif current_key == "Reason":
-                    report["reason"] = current_value
-                elif current_key == "Alternative":
-                    if current_value and current_value != "-" and current_value.lower() != "null":
-                        report["alternative"] = current_value
-                    else:
-                        report["alternative"] = None
-            
-            # Validate report
-            if "game" in report and "id" in report and "status" in report:
-                self.parsed_mod_reports.append(report)
-                
-                # Add to preview
-                preview_text += f"Game: {report.get('game', '')}\n"
-                preview_text += f"Mod ID: {report.get('id', '')}\n"
-                preview_text += f"Status: {report.get('status', '')}\n"
-                
-                if "reason" in report:
-                    preview_text += f"Reason: {report['reason']}\n"
-                
-                if "alternative" in report:
-                    if report["alternative"]:
-                        preview_text += f"Alternative: {report['alternative']}\n"
-                    else:
-                        preview_text += "Alternative: None\n"
-                
-                preview_text += "\n"
-        
+        self.start_mod_parse(announce=True)
+    
+    def start_mod_parse(self, announce):
+        """Rebuild the live mod preview from scratch in the background"""
+        bulk_text = self.mod_bulk_input.toPlainText()
+        
+        def job(worker):
+            start = time.perf_counter()
+            live_parser = status_preview.mod_report_parser()
+            patch = live_parser.update(bulk_text, progress=worker.report_progress, progress_step=PROGRESS_STEP)
+            logger.info("Parsed %d mod reports in %.3fs", len(live_parser.reports()), time.perf_counter() - start)
+            return live_parser, patch
+        
+        self.start_job("Parsing mod reports...", job,
+                       lambda result: self.mod_reports_parsed(result, announce),
+                       lambda message: QMessageBox.warning(self, "Warning", f"Failed to parse mod reports: {message}"))
+    
+    def mod_reports_parsed(self, result, announce):
+        """Show the mod reports parsed in the background"""
+        self.mod_live_parser, patch = result
+        self.mod_preview.clear()
+        self.patch_preview(self.mod_preview, patch)
+        self.highlight_problems(self.mod_bulk_input, self.mod_live_parser)
+        self.parsed_mod_reports = self.mod_live_parser.reports()
+        
+        # Catch up with anything typed while the parse was running
+        if self.mod_bulk_input.toPlainText() != self.mod_live_parser.text:
+            self.mod_preview_timer.start()
+        
+        if not announce:
+            return
         if not self.parsed_mod_reports:
             QMessageBox.warning(self, "Warning", "No valid mod reports found. Please check the format.")
             return
         
-        self.mod_preview.setText(preview_text)
         QMessageBox.information(self, "Success", f"Successfully parsed {len(self.parsed_mod_reports)} mod reports.")
     
+    def refresh_mod_preview(self):
+        """Bring the mod preview up to date with the edited input"""
+        if self.current_worker is not None:
+            # Try again once the running job is done with the input
+            self.mod_preview_timer.start()
+            return
+        
+        if self.refresh_live_preview(self.mod_bulk_input, self.mod_preview, self.mod_live_parser):
+            self.parsed_mod_reports = self.mod_live_parser.reports()
+        else:
+            self.start_mod_parse(announce=False)
+    
     def parse_author_reports(self):
-        """Parse the bulk author reports input"""
-        bulk_text = self.author_bulk_input.toPlainText().strip()
-        if not bulk_text:
+        """Parse the whole bulk author reports input in the background"""
+        if not self.author_bulk_input.toPlainText().strip():
             QMessageBox.warning(self, "Warning", "Please enter author reports to parse.")
             return
         
-        # Debug print
-        print("Parsing author reports:")
-        print(f"Raw input: {repr(bulk_text)}")
-        
-        # Split by separator lines (multiple dashes) to get individual reports
-        raw_reports = []
-        current_report = []
-        
-        lines = bulk_text.split("\n")
-        for line in lines:
-            # Check if this is a separator line (multiple dashes)
-            if line.strip() and all(c == '-' for c in line.strip()):
-                if current_report:
-                    raw_reports.append("\n".join(current_report))
-                    current_report = []
-            else:
-                current_report.append(line)
-        
-        # Add the last report if there is one
-        if current_report:
-            raw_reports.append("\n".join(current_report))
-        
-        # If no reports were found using separator lines, try the double blank line method
-        if not raw_reports:
-            # Split by double blank lines to get individual reports
-            raw_reports = []
-            current_report = []
-            blank_line_count = 0
-            
-            for line in lines:
-                if not line.strip():
-                    blank_line_count += 1
-                    if blank_line_count >= 2:  # Two or more consecutive blank lines separate reports
-                        if current_report:
-                            raw_reports.append("\n".join(current_report))
-                            current_report = []
-                        blank_line_count = 0
-                    else:
-                        current_report.append(line)  # Keep single blank lines within a report
-                else:
-                    blank_line_count = 0
-                    current_report.append(line)
-            
-            if current_report:
-                raw_reports.append("\n".join(current_report))
-        
-        # If still no reports were found, try the original method
-        if not raw_reports:
-            # Original parsing logic as fallback
-            raw_reports = []
-            current_report = ""
-            
-            for line in bulk_text.split("\n"):
-                if line.strip():
-                    current_report += line + "\n"
-                elif current_report:
-                    raw_reports.append(current_report.strip())
-                    current_report = ""
-            
-            if current_report:
-                raw_reports.append(current_report.strip())
-        
-        print(f"Found {len(raw_reports)} raw reports")
-        
-        self.parsed_author_reports = []
-        preview_text = ""
-        
-        for raw_report in raw_reports:
-            lines = raw_report.split("\n")
-            report = {"labels": {}}
-            current_label = None
-            username = None
-            label_list = None
-            
-            print(f"Processing report: {raw_report}")
-            
-            for i, line in enumerate(lines):
-                line_text = line.strip()
-                if not line_text:
-                    continue
-                    
-                print(f"Line {i}: {repr(line)}")
-                
-                # Check if this is a main key-value line (not indented)
-                if ":" in line_text and not line.startswith(" ") and not line.startswith("\t"):
-                    key, value = line_text.split(":", 1)
-                    key = key.strip()
-                    value = value.strip()
-                    print(f"Found main key-value: {key} = {value}")
-                    
-                    if key == "Username":
-                        report["username"] = value
-                        username = value
-                    elif key == "Labels":
-                        labels = [label.strip() for label in value.split(",")]
-                        report["label_list"] = labels
-                        label_list = labels
-                        print(f"Label list: {report['label_list']}")
-                    else:
-                        # This is a label section
-                        current_label = key
-                        report["labels"][current_label] = {"label": None, "referenceLink": None}
-                        print(f"Found label section: {current_label}")
-                
-                # Check if this is an indented property line
-                elif line.startswith(" ") or line.startswith("\t"):
-                    if ":" in line_text and current_label:
-                        prop_key, prop_value = line_text.split(":", 1)
-                        prop_key = prop_key.strip()
-                        prop_value = prop_value.strip()
-                        print(f"Found indented property: {prop_key} = {prop_value}")
-                        
-                        if prop_key == "Label":
-                            if prop_value and prop_value.lower() != "null":
-                                report["labels"][current_label]["label"] = prop_value
-                            else:
-                                report["labels"][current_label]["label"] = None
-                            print(f"Set label description for {current_label}: {prop_value}")
-                        
-                        elif prop_key == "Reference":
-                            if prop_value and prop_value != "-" and prop_value.lower() != "null":
-                                report["labels"][current_label]["referenceLink"] = prop_value
-                            else:
-                                report["labels"][current_label]["referenceLink"] = None
-                            print(f"Set reference link for {current_label}: {prop_value}")
-            
-            # Validate report
-            print(f"Final report: {report}")
-            print(f"Has username: {'username' in report}")
-            print(f"Has label_list: {'label_list' in report}")
-            print(f"Has labels: {bool(report['labels'])}")
-            
-            if "username" in report and "label_list" in report and report["labels"]:
-                self.parsed_author_reports.append(report)
-                print("Report is valid and added to parsed_author_reports")
-                
-                # Add to preview
-                preview_text += f"Username: {report['username']}\n"
-                preview_text += f"Labels: {', '.join(report['label_list'])}\n\n"
-                
-                for label, details in report["labels"].items():
-                    preview_text += f"{label}:\n"
-                    preview_text += f"  Label: {details['label']}\n"
-                    
-                    if details["referenceLink"]:
-                        preview_text += f"  Reference: {details['referenceLink']}\n"
-                    else:
-                        preview_text += "  Reference: None\n"
-                    
-                    preview_text += "\n"
-                
-                preview_text += "----------------------------------------\n\n"
-            else:
-                print("Report is invalid and will be skipped")
-        
+        self.start_author_parse(announce=True)
+    
+    def start_author_parse(self, announce):
+        """Rebuild the live author preview from scratch in the background"""
+        bulk_text = self.author_bulk_input.toPlainText()
+        
+        def job(worker):
+            start = time.perf_counter()
+            live_parser = status_preview.author_report_parser()
+            patch = live_parser.update(bulk_text, progress=worker.report_progress, progress_step=PROGRESS_STEP)
+            logger.info("Parsed %d author reports in %.3fs", len(live_parser.reports()), time.perf_counter() - start)
+            return live_parser, patch
+        
+        self.start_job("Parsing author reports...", job,
+                       lambda result: self.author_reports_parsed(result, announce),
+                       lambda message: QMessageBox.warning(self, "Warning", f"Failed to parse author reports: {message}"))
+    
+    def author_reports_parsed(self, result, announce):
+        """Show the author reports parsed in the background"""
+        self.author_live_parser, patch = result
+        self.author_preview.clear()
+        self.patch_preview(self.author_preview, patch)
+        self.highlight_problems(self.author_bulk_input, self.author_live_parser)
+        self.parsed_author_reports = self.author_live_parser.reports()
+        
+        # Catch up with anything typed while the parse was running
+        if self.author_bulk_input.toPlainText() != self.author_live_parser.text:
+            self.author_preview_timer.start()
+        
+        if not announce:
+            return
         if not self.parsed_author_reports:
             QMessageBox.warning(self, "Warning", "No valid author reports found. Please check the format.")
             return
         
-        self.author_preview.setText(preview_text)
         QMessageBox.information(self, "Success", f"Successfully parsed {len(self.parsed_author_reports)} author reports.")
     
+    def refresh_author_preview(self):
+        """Bring the author preview up to date with the edited input"""
+        if self.current_worker is not None:
+            # Try again once the running job is done with the input
+            self.author_preview_timer.start()
+            return
+        
+        if self.refresh_live_preview(self.author_bulk_input, self.author_preview, self.author_live_parser):
+            self.parsed_author_reports = self.author_live_parser.reports()
+        else:
+            self.start_author_parse(announce=False)
+    
     def save_mod_reports(self):
-        """Save the parsed mod reports to the JSON file"""
-        if not self.parsed_mod_reports:
+        """Merge the parsed mod reports and save them in the background"""
+        if self.flush_live_preview(self.mod_preview_timer, self.mod_bulk_input, self.mod_preview, self.mod_live_parser):
+            self.parsed_mod_reports = self.mod_live_parser.reports()
+        if not self.parsed_mod_reports and not self.imported_mod_reports:
             QMessageBox.warning(self, "Warning", "No mod reports to save. Please parse reports first.")
             return
+        if not self.status_data_loaded("mod"):
+            return
         
-        # Track skipped and processed mods
-        skipped_mods = []
-        processed_mods = []
-        
-        # Update the JSON data
-        for report in self.parsed_mod_reports:
-            game = report["game"]
-            mod_id = report["id"]
-            status = report["status"]
-            
-            # Check if mod already exists in any status category
-            mod_exists = False
-            existing_status = None
-            existing_reason = None
-            
-            if game in self.mod_status_data["Mod Statuses"]:
-                for status_category, mod_ids in self.mod_status_data["Mod Statuses"][game].items():
-                    if mod_id in mod_ids:
-                        mod_exists = True
-                        existing_status = status_category
-                        if game in self.mod_status_data["Mod Descriptors"] and mod_id in self.mod_status_data["Mod Descriptors"][game]:
-                            existing_reason = self.mod_status_data["Mod Descriptors"][game][mod_id].get("reason", "No reason provided")
-                        break
-            
-            # Also check if mod exists in Mod Descriptors
-            if not mod_exists and game in self.mod_status_data["Mod Descriptors"] and mod_id in self.mod_status_data["Mod Descriptors"][game]:
-                mod_exists = True
-                existing_reason = self.mod_status_data["Mod Descriptors"][game][mod_id].get("reason", "No reason provided")
-            
-            if mod_exists:
-                skip_message = f"{game}/{mod_id}"
-                if existing_status == status and existing_reason == report.get("reason"):
-                    skip_message += " (Duplicate report - same status and reason)"
-                else:
-                    skip_message += f"\n    Status: {existing_status}\n    Reason: {existing_reason}"
-                skipped_mods.append(skip_message)
-                print(f"Skipping mod: {skip_message}")
-                continue
-            
-            processed_mods.append(f"{game}/{mod_id}")
-            
-            # Ensure game exists in both sections
-            if game not in self.mod_status_data["Mod Statuses"]:
-                self.mod_status_data["Mod Statuses"][game] = {}
-            
-            if game not in self.mod_status_data["Mod Descriptors"]:
-                self.mod_status_data["Mod Descriptors"][game] = {}
-            
-            # Ensure status category exists
-            if status not in self.mod_status_data["Mod Statuses"][game]:
-                self.mod_status_data["Mod Statuses"][game][status] = []
-            
-            # Add mod ID to status category if not already there
-            if mod_id not in self.mod_status_data["Mod Statuses"][game][status]:
-                self.mod_status_data["Mod Statuses"][game][status].append(mod_id)
-            
-            # Add or update mod descriptor
-            descriptor = {}
-            if "reason" in report:
-                descriptor["reason"] = report["reason"]
-            
-            if "alternative" in report:
-                descriptor["alternative"] = report["alternative"]
-            
-            self.mod_status_data["Mod Descriptors"][game][mod_id] = descriptor
-        
-        # Save the updated data
-        try:
-            with open(self.mod_status_path, 'w', encoding='utf-8') as f:
-                # Use custom encoder to handle None values properly
-                json.dump(self.mod_status_data, f, indent=2, ensure_ascii=False, 
-                         default=lambda o: None if o is None or (isinstance(o, str) and (o.lower() == "null" or o == "\u3164")) else o)
-            
-            # Prepare result message
-            result_message = f"Successfully saved {len(processed_mods)} mod reports to {self.mod_status_path}"
-            if skipped_mods:
-                # Group skipped mods by game
-                skipped_by_game = {}
-                # Also track duplicate reports separately
-                duplicate_by_game = {}
-                
-                for mod in skipped_mods:
-                    game_id = mod.split('/')[0]
-                    mod_id = mod.split('/')[1].split(' ')[0]  # Extract just the mod ID
-                    
-                    # Check if this is a duplicate report
-                    if "(Duplicate report - same status and reason)" in mod:
-                        if game_id not in duplicate_by_game:
-                            duplicate_by_game[game_id] = []
-                        duplicate_by_game[game_id].append(mod_id)
-                    else:
-                        # Regular skipped mod with different status/reason
-                        if game_id not in skipped_by_game:
-                            skipped_by_game[game_id] = []
-                        skipped_by_game[game_id].append(mod)
-                
-                # Format the skipped mods message
-                result_message += f"\n\nSkipped {len(skipped_mods)} existing mods:"
-                
-                # First list duplicate reports in a compact format
-                if duplicate_by_game:
-                    result_message += "\n\nDuplicate reports (same status and reason):"
-                    for game, mod_ids in sorted(duplicate_by_game.items()):
-                        result_message += f"\n{game}: {', '.join(mod_ids)}"
-                
-                # Then list other skipped mods with different status/reason
-                if skipped_by_game:
-                    result_message += "\n\nMods with different status/reason:"
-                    for game, mods in sorted(skipped_by_game.items()):
-                        result_message += f"\n\n{game}:"
-                        for mod in mods:
-                            # Remove the game prefix from each entry since we're grouping by game
-                            mod_entry = mod.replace(f"{game}/", "")
-                            result_message += f"\n  - {mod_entry}"
-            
+        reports = self.imported_mod_reports + self.parsed_mod_reports
+        policy = self.mod_duplicate_combo.currentText()
+        input_text = self.mod_bulk_input.toPlainText()
+        
+        # Merging edits the data in place, so once started the job runs to completion
+        def job(worker):
+            timer = core.PhaseTimer()
+            with timer.phase("collapse"):
+                collapsed_reports, collapser = core.collapse_mod_reports(reports, policy)
+            with timer.phase("merge"):
+                processed_mods, skipped_mods = core.merge_mod_reports(
+                    self.mod_status_data, worker.iter_with_progress(collapsed_reports), self.mod_index)
+            changed = self.mod_index.pop_changed()
+            previous_sha256 = self.mod_status_file.sha256
+            with timer.phase("serialize"):
+                self.mod_status_file.save(self.mod_status_data, changed, self.mod_index.pop_operations())
+                # With a database the shards are published when the JSON file is exported
+                if not self.database_path:
+                    import status_publish
+                    status_publish.publish_shards(self.mod_status_data, self.mod_status_path,
+                                                  {game for _, game in changed}, previous_sha256)
+            with timer.phase("validate"):
+                import status_audit
+                audit = status_audit.audit_mods(self.mod_status_data,
+                                                {report["game"] for report in collapsed_reports})
+            logger.info("Saved %d mod reports. %s", len(processed_mods), timer.summary())
+            return (core.format_mod_save_summary(processed_mods, skipped_mods, self.mod_status_path,
+                                                 collapser.collapsed_messages(), collapser.conflict_messages())
+                    + status_audit.format_audit_note(audit))
+        
+        def saved(result_message):
+            self.status_data_changed("mod")
             QMessageBox.information(self, "Success", result_message)
             self.parsed_mod_reports = []
-            self.mod_preview.clear()
-            self.mod_bulk_input.clear()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to save mod reports: {str(e)}")
+            self.imported_mod_reports = []
+            self.mod_import_label.clear()
+            # Keep anything typed while the save was running; clearing the
+            # input empties the live preview
+            if self.mod_bulk_input.toPlainText() == input_text:
+                self.mod_bulk_input.clear()
+        
+        self.start_job("Saving mod reports...", job, saved,
+                       lambda message: QMessageBox.critical(self, "Error", f"Failed to save mod reports: {message}"),
+                       cancellable=False)
     
     def save_author_reports(self):
-        """Save the parsed author reports to the JSON file"""
-        if not self.parsed_author_reports:
+        """Merge the parsed author reports and save them in the background"""
+        if self.flush_live_preview(self.author_preview_timer, self.author_bulk_input, self.author_preview,
+                                   self.author_live_parser):
+            self.parsed_author_reports = self.author_live_parser.reports()
+        if not self.parsed_author_reports and not self.imported_author_reports:
             QMessageBox.warning(self, "Warning", "No author reports to save. Please parse reports first.")
             return
+        if not self.status_data_loaded("author"):
+            return
         
-        # Track skipped and processed authors
-        skipped_labels = []  # Track skipped labels instead of authors
-        processed_authors = []
-        processed_labels = []  # Track processed labels
-        
-        # Update the JSON data
-        for report in self.parsed_author_reports:
-            username = report["username"]
-            print(f"Processing report for username: {username}")
-            
-            # Check if author already exists in any label
-            author_exists = False
-            existing_labels = []
-            existing_tooltips = {}
-            
-            # Check existing labels
-            for label_name, label_data in self.author_status_data.get("Labels", {}).items():
-                if "authors" in label_data and username in label_data["authors"]:
-                    author_exists = True
-                    existing_labels.append(label_name)
-            
-            # Check existing tooltips
-            if username in self.author_status_data.get("Tooltips", {}):
-                author_exists = True
-                existing_tooltips = self.author_status_data["Tooltips"][username]
-            
-            # Process each label individually
-            for label_name in report["label_list"]:
-                # Check if this label already exists for this author
-                if label_name in existing_labels:
-                    # Check if tooltip details are the same
-                    if (label_name in existing_tooltips and 
-                        label_name in report["labels"] and 
-                        self._compare_single_tooltip(existing_tooltips[label_name], report["labels"][label_name])):
-                        skip_message = f"{username}/{label_name} (Duplicate label - same details)"
-                        skipped_labels.append(skip_message)
-                        print(f"Skipping label: {skip_message}")
-                        continue
-                    elif label_name in existing_tooltips and label_name in report["labels"]:
-                        # Label exists but with different details - update it
-                        print(f"Updating tooltip for {username} under {label_name}")
-                        # Clean up any potential invisible characters
-                        label_text = report["labels"][label_name]["label"]
-                        reference_link = report["labels"][label_name]["referenceLink"]
-                        
-                        # Remove the invisible character if present
-                        if isinstance(label_text, str):
-                            label_text = label_text.replace("\u3164", "")
-                        if isinstance(reference_link, str):
-                            reference_link = reference_link.replace("\u3164", "")
-                        
-                        self.author_status_data["Tooltips"][username][label_name] = {
-                            "label": label_text,
-                            "referenceLink": reference_link
-                        }
-                        processed_labels.append(f"{username}/{label_name} (Updated details)")
-                        continue
-                
-                # Add this label for the author
-                processed_labels.append(f"{username}/{label_name}")
-                
-                # Add author to the label
-                print(f"Adding {username} to label: {label_name}")
-                
-                if label_name in self.author_status_data["Labels"]:
-                    if "authors" not in self.author_status_data["Labels"][label_name]:
-                        self.author_status_data["Labels"][label_name]["authors"] = []
-                    
-                    if username not in self.author_status_data["Labels"][label_name]["authors"]:
-                        self.author_status_data["Labels"][label_name]["authors"].append(username)
-                        print(f"Added {username} to {label_name} authors list")
-                else:
-                    print(f"Warning: Label {label_name} not found in author_status_data")
-                    # Create the label if it doesn't exist
-                    self.author_status_data["Labels"][label_name] = {"authors": [username]}
-                    print(f"Created new label {label_name} and added {username}")
-                
-                # Add tooltip details for this label
-                if label_name in report["labels"]:
-                    if "Tooltips" not in self.author_status_data:
-                        self.author_status_data["Tooltips"] = {}
-                        
-                    if username not in self.author_status_data["Tooltips"]:
-                        self.author_status_data["Tooltips"][username] = {}
-                    
-                    print(f"Adding tooltip for {username} under {label_name}")
-                    # Clean up any potential invisible characters
-                    label_text = report["labels"][label_name]["label"]
-                    reference_link = report["labels"][label_name]["referenceLink"]
-                    
-                    # Remove the invisible character if present
-                    if isinstance(label_text, str):
-                        label_text = label_text.replace("\u3164", "")
-                    if isinstance(reference_link, str):
-                        reference_link = reference_link.replace("\u3164", "")
-                    
-                    self.author_status_data["Tooltips"][username][label_name] = {
-                        "label": label_text,
-                        "referenceLink": reference_link
-                    }
-            
-            # Add to processed authors if not already there
-            if username not in processed_authors:
-                processed_authors.append(username)
-        
-        # Save the updated data
-        try:
-            with open(self.author_status_path, 'w', encoding='utf-8') as f:
-                # Use custom encoder to handle None values properly and prevent invisible characters
-                json.dump(self.author_status_data, f, indent=2, ensure_ascii=False,
-                         default=lambda o: None if o is None or (isinstance(o, str) and (o.lower() == "null" or o == "\u3164")) else o)
-            
-            # Prepare result message
-            result_message = f"Successfully saved {len(processed_labels)} labels for {len(processed_authors)} authors to {self.author_status_path}"
-            if skipped_labels:
-                # Format the skipped labels message
-                result_message += f"\n\nSkipped {len(skipped_labels)} existing labels:"
-                
-                # Group by author for better readability
-                skipped_by_author = {}
-                for label in skipped_labels:
-                    author = label.split('/')[0]
-                    if author not in skipped_by_author:
-                        skipped_by_author[author] = []
-                    skipped_by_author[author].append(label.split('/')[1])
-                
-                for author, labels in sorted(skipped_by_author.items()):
-                    result_message += f"\n{author}: {', '.join(labels)}"
-            
+        reports = self.imported_author_reports + self.parsed_author_reports
+        policy = self.author_duplicate_combo.currentText()
+        input_text = self.author_bulk_input.toPlainText()
+        
+        # Merging edits the data in place, so once started the job runs to completion
+        def job(worker):
+            timer = core.PhaseTimer()
+            with timer.phase("collapse"):
+                collapsed_reports, collapser = core.collapse_author_reports(reports, policy)
+            with timer.phase("merge"):
+                processed_labels, processed_authors, skipped_labels = core.merge_author_reports(
+                    self.author_status_data, worker.iter_with_progress(collapsed_reports), self.author_index)
+            with timer.phase("serialize"):
+                self.author_status_file.save(self.author_status_data, self.author_index.pop_changed(),
+                                             self.author_index.pop_operations())
+            with timer.phase("validate"):
+                import status_audit
+                audit = status_audit.audit_authors(self.author_status_data,
+                                                   {report["username"] for report in collapsed_reports},
+                                                   self.author_index)
+            logger.info("Saved %d author labels. %s", len(processed_labels), timer.summary())
+            return (core.format_author_save_summary(
+                processed_labels, processed_authors, skipped_labels, self.author_status_path,
+                collapser.collapsed_messages(), collapser.conflict_messages())
+                    + status_audit.format_audit_note(audit))
+        
+        def saved(result_message):
+            self.status_data_changed("author")
             QMessageBox.information(self, "Success", result_message)
             self.parsed_author_reports = []
-            self.author_preview.clear()
-            self.author_bulk_input.clear()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to save author reports: {str(e)}")
+            self.imported_author_reports = []
+            self.author_import_label.clear()
+            # Keep anything typed while the save was running; clearing the
+            # input empties the live preview
+            if self.author_bulk_input.toPlainText() == input_text:
+                self.author_bulk_input.clear()
+        
+        self.start_job("Saving author reports...", job, saved,
+                       lambda message: QMessageBox.critical(self, "Error", f"Failed to save author reports: {message}"),
+                       cancellable=False)
     
-    def _compare_single_tooltip(self, existing_tooltip, new_tooltip):
-        """Helper method to compare a single tooltip's contents"""
-        if not existing_tooltip and not new_tooltip:
-            return True
-            
-        return (existing_tooltip.get("label") == new_tooltip.get("label") and
-                existing_tooltip.get("referenceLink") == new_tooltip.get("referenceLink"))
+    def undo_last_save(self, kind):
+        """Undo the latest journaled save of the mod or author status file in the background"""
+        import status_journal
+        if not self.status_data_loaded(kind):
+            return
+        status_file = getattr(self, f"{kind}_status_file")
+        data = getattr(self, f"{kind}_status_data")
+        index = getattr(self, f"{kind}_index")
+        path = getattr(self, f"{kind}_status_path")
+        try:
+            batch = status_file.journal.undoable_batch()
+        except (OSError, status_journal.JournalError) as e:
+            QMessageBox.warning(self, "Warning", f"Could not read the save journal: {str(e)}")
+            return
+        if batch is None:
+            QMessageBox.information(self, "Undo", "There is no save to undo.")
+            return
+        answer = QMessageBox.question(self, "Undo", f"Undo save {batch} of {os.path.basename(path)}? "
+                                                    "Saves made after it are kept.")
+        if answer != QMessageBox.StandardButton.Yes:
+            return
+        
+        # Only the undone save's own changes are reverted; the job refuses if later saves touched them
+        def job(worker):
+            operations = status_file.journal.undo(data, batch)
+            changed = status_journal.changed_entries(operations)
+            previous_sha256 = status_file.sha256
+            status_file.save(data, changed, operations, batch)
+            if kind == "mod" and not self.database_path:
+                import status_publish
+                status_publish.publish_shards(data, path, {game for _, game in changed} if changed is not None else None,
+                                              previous_sha256)
+            index.rebuild()
+            return f"Undid save {batch} ({len(operations)} changes) of {path}"
+        
+        def undone(message):
+            self.status_data_changed(kind)
+            QMessageBox.information(self, "Success", message)
+        
+        self.start_job("Undoing save...", job, undone,
+                       lambda message: QMessageBox.critical(self, "Error", f"Failed to undo the save: {message}"),
+                       cancellable=False)
+    
+    def audit_status_file(self, kind):
+        """Check the mod or author status file for inconsistencies in the background, offering to fix them"""
+        import status_audit
+        if not self.status_data_loaded(kind):
+            return
+        data = getattr(self, f"{kind}_status_data")
+        path = getattr(self, f"{kind}_status_path")
+        
+        def audited(report):
+            details = status_audit.format_audit_report(report, path, AUDIT_LIST_LIMIT)
+            if not report.issues:
+                QMessageBox.information(self, "Audit", details)
+                return
+            box = QMessageBox(QMessageBox.Icon.Warning, "Audit",
+                              f"Found {len(report)} issues in {os.path.basename(path)}. Fix them? "
+                              "Undo Last Save reverts the fixes.",
+                              QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, self)
+            box.setDetailedText(details)
+            if box.exec() == QMessageBox.StandardButton.Yes:
+                self.fix_audit_issues(kind, report)
+        
+        self.start_job("Auditing...", lambda worker: status_audit.audit(kind, data), audited,
+                       lambda message: QMessageBox.critical(self, "Error", f"Failed to audit {path}: {message}"),
+                       cancellable=False)
+    
+    def fix_audit_issues(self, kind, report):
+        """Fix the issues an audit found and save the status file in the background"""
+        import status_audit
+        status_file = getattr(self, f"{kind}_status_file")
+        data = getattr(self, f"{kind}_status_data")
+        index = getattr(self, f"{kind}_index")
+        path = getattr(self, f"{kind}_status_path")
+        
+        def job(worker):
+            changed, operations = status_audit.apply_fixes(data, report)
+            previous_sha256 = status_file.sha256
+            status_file.save(data, changed, operations)
+            if kind == "mod" and not self.database_path:
+                import status_publish
+                status_publish.publish_shards(data, path, {game for _, game in changed} if changed is not None else None,
+                                              previous_sha256)
+            index.rebuild()
+            return f"Fixed {len(report)} issues ({len(operations)} changes) in {path}"
+        
+        def fixed(message):
+            self.status_data_changed(kind)
+            QMessageBox.information(self, "Success", message)
+        
+        self.start_job("Fixing audit issues...", job, fixed,
+                       lambda message: QMessageBox.critical(self, "Error", f"Failed to fix the issues: {message}"),
+                       cancellable=False)
+    
+    def browse_kind(self):
+        """Return the kind of status file picked in the browse tab"""
+        return "mod" if self.browse_kind_combo.currentIndex() == 0 else "author"
+    
+    def refresh_browse(self):
+        """Show the status file picked in the browse tab, indexing it in the background first if needed"""
+        self.browse_pending = False
+        if self.browse_model is None:
+            return
+        kind = self.browse_kind()
+        if self.browse_indexes[kind] is not None:
+            self.search_browse()
+            return
+        
+        self.browse_model.show_rows(None, [])
+        data = getattr(self, f"{kind}_status_data")
+        index = getattr(self, f"{kind}_index")
+        name = os.path.basename(getattr(self, f"{kind}_status_path"))
+        if data is None or self.current_worker is not None:
+            # Indexed once the file is loaded, or the running job is done with it
+            self.browse_count_label.setText(f"Waiting for {name}...")
+            self.browse_pending = True
+            return
+        
+        def job(worker):
+            import status_browse
+            start = time.perf_counter()
+            browse_index = status_browse.BrowseIndex(kind, data, index)
+            logger.info("Indexed %d rows of %s in %.3fs", len(browse_index), name, time.perf_counter() - start)
+            return browse_index
+        
+        def indexed(browse_index):
+            self.browse_indexes[kind] = browse_index
+            # The combo may have been switched to the other file meanwhile
+            self.refresh_browse()
+        
+        self.browse_count_label.setText(f"Indexing {name}...")
+        self.start_job(f"Indexing {name}...", job, indexed,
+                       lambda message: QMessageBox.critical(self, "Error", f"Failed to index {name}: {message}"),
+                       cancellable=False)
+    
+    def search_browse(self):
+        """Show the rows of the indexed status file that match the browse search"""
+        browse_index = self.browse_indexes[self.browse_kind()]
+        if browse_index is None:
+            return
+        start = time.perf_counter()
+        matches = browse_index.search(self.browse_search.text())
+        elapsed = time.perf_counter() - start
+        self.browse_model.show_rows(browse_index, matches)
+        self.browse_count_label.setText(f"{len(matches)} of {len(browse_index)} rows ({elapsed * 1000:.0f} ms)")
+    
+    def status_data_changed(self, kind):
+        """Drop the browse index of a status file that was loaded, merged into, undone or fixed"""
+        self.browse_indexes[kind] = None
+        if self.browse_model is None or self.browse_kind() != kind:
+            return
+        if self.tab_widget.currentWidget() is self.browse_tab:
+            self.refresh_browse()
+        else:
+            # Re-indexed when the tab is next selected
+            self.browse_model.show_rows(None, [])
+    
+    def edit_browse_row(self, browse_index, row, column, text):
+        """Apply an edit made in the browse table and save it in the background as its own batch"""
+        if self.current_worker is not None:
+            return False
+        try:
+            if not browse_index.edit(row, column, text):
+                return False
+        except ValueError as e:
+            QMessageBox.warning(self, "Warning", str(e))
+            return False
+        
+        kind = browse_index.kind
+        status_file = getattr(self, f"{kind}_status_file")
+        data = getattr(self, f"{kind}_status_data")
+        index = getattr(self, f"{kind}_index")
+        path = getattr(self, f"{kind}_status_path")
+        changed = index.pop_changed()
+        operations = index.pop_operations()
+        
+        def job(worker):
+            previous_sha256 = status_file.sha256
+            status_file.save(data, changed, operations)
+            if kind == "mod" and not self.database_path:
+                import status_publish
+                status_publish.publish_shards(data, path, {game for _, game in changed}, previous_sha256)
+            logger.info("Saved an edit of %s to %s", browse_index.keys[row], path)
+        
+        self.start_job("Saving edit...", job, lambda result: None,
+                       lambda message: QMessageBox.critical(self, "Error", f"Failed to save the edit: {message}"),
+                       cancellable=False)
+        return True
+    
+    def watch_status_files(self):
+        """Watch the loaded status files, and the directories holding them, for changes on disk"""
+        # With a database the JSON files are exports, not what is loaded
+        if self.database_path:
+            return
+        watched = set(self.file_watcher.files()) | set(self.file_watcher.directories())
+        for kind in ("mod", "author"):
+            if getattr(self, f"{kind}_status_data") is None:
+                continue
+            path = getattr(self, f"{kind}_status_path")
+            for watch_path in (path, os.path.dirname(os.path.abspath(path))):
+                if watch_path not in watched and os.path.exists(watch_path):
+                    self.file_watcher.addPath(watch_path)
+                    watched.add(watch_path)
+    
+    def check_status_files(self):
+        """Read in whichever loaded status file changed on disk, once no job is running"""
+        self.watch_status_files()
+        if self.current_worker is not None:
+            self.watch_pending = True
+            return
+        self.watch_pending = False
+        if self.database_path:
+            return
+        for kind in ("mod", "author"):
+            status_file = getattr(self, f"{kind}_status_file")
+            if getattr(self, f"{kind}_status_data") is not None and status_file.changed_on_disk():
+                self.read_disk_changes(kind)
+                return
+    
+    def read_disk_changes(self, kind):
+        """Apply the entries of a status file changed on disk to the loaded data in the background"""
+        status_file = getattr(self, f"{kind}_status_file")
+        data = getattr(self, f"{kind}_status_data")
+        index = getattr(self, f"{kind}_index")
+        name = os.path.basename(getattr(self, f"{kind}_status_path"))
+        
+        def job(worker):
+            start = time.perf_counter()
+            changes = status_file.read_disk_changes(data)
+            status_file.apply_disk_changes(data, changes)
+            index.reindex(changes.changed())
+            logger.info("Read %d entries changed on disk from %s in %.3fs", len(changes), name,
+                        time.perf_counter() - start)
+            return changes
+        
+        def applied(changes):
+            # The other file may have changed as well
+            self.watch_pending = True
+            if not changes:
+                return
+            self.status_data_changed(kind)
+            self.fill_insert_combo(kind)
+            self.statusBar().showMessage(f"Read {len(changes)} entries changed on disk from {name}", 10000)
+            if changes.conflicts:
+                entries = sorted(f"{section}/{key}" if key is not None else section
+                                 for section, key in changes.conflicts)
+                listed = ", ".join(entries[:WATCH_CONFLICT_LIMIT])
+                if len(entries) > WATCH_CONFLICT_LIMIT:
+                    listed += f" and {len(entries) - WATCH_CONFLICT_LIMIT} more"
+                QMessageBox.warning(self, "Warning",
+                                    f"{name} changed on disk in entries with merged reports that were not saved "
+                                    f"yet: {listed}. The file was taken as it is on disk and the unsaved reports "
+                                    "were dropped; save them again to merge them in.")
+        
+        self.start_job(f"Reading changes to {name}...", job, applied,
+                       lambda message: QMessageBox.warning(
+                           self, "Warning", f"Could not read the changes to {name}: {message}. It is read again "
+                                            "when it next changes, and it cannot be saved until then."),
+                       cancellable=False)
+    
+    def import_thread_pages(self, kind):
+        """Read the mod or author reports posted on saved thread pages in the background"""
+        paths, _ = QFileDialog.getOpenFileNames(
+            self, "Select Saved Thread Pages", "", "Thread Pages (*.html *.htm);;All Files (*)"
+        )
+        if not paths:
+            return
+        import status_model
+        import status_thread
+        parse_reports = core.parse_mod_reports if kind == "mod" else core.parse_author_reports
+        
+        def job(worker):
+            start = time.perf_counter()
+            reports = []
+            pages = status_thread.read_thread_pages(paths)
+            for done, (_, mod_reports, author_reports) in enumerate(pages, 1):
+                worker.report_progress(done, len(paths))
+                reports.extend(parse_reports(status_thread.join_reports(mod_reports if kind == "mod" else author_reports)))
+            if kind == "mod":
+                # Imported reports are held until they are merged, so keep them small
+                reports = status_model.compact_reports(reports)
+            logger.info("Imported %d %s reports from %d pages in %.3fs", len(reports), kind, len(paths),
+                        time.perf_counter() - start)
+            return reports
+        
+        def imported(reports):
+            if not reports:
+                QMessageBox.warning(self, "Warning", f"No {kind} reports found in the selected pages.")
+                return
+            setattr(self, f"imported_{kind}_reports", reports)
+            getattr(self, f"{kind}_import_label").setText(f"{len(reports)} reports imported from {len(paths)} pages")
+            QMessageBox.information(self, "Success",
+                                    f"Successfully imported {len(reports)} {kind} reports. They are saved along "
+                                    "with the reports in the input box.")
+        
+        self.start_job("Reading thread pages...", job, imported,
+                       lambda message: QMessageBox.warning(self, "Warning", f"Failed to read thread pages: {message}"))
     
     def change_file_path(self, file_type):
         """Change the file path for mod or author status JSON"""
@@ -916,7 +1412,11 @@ class StatusUpdaterGUI(QMainWindow):
             if file_path:
                 self.mod_status_path = file_path
                 self.mod_path_label.setText(file_path)
-                self.load_json_data()
+                self.mod_status_data = None
+                self.status_data_changed("mod")
+                # Loaded now if its tab is in use, otherwise once the tab is first selected
+                if self.tabs["mod"] not in self.tab_setups:
+                    self.load_status_data("mod")
         elif file_type == "author":
             file_path, _ = QFileDialog.getOpenFileName(
                 self, "Select Author Status JSON File", "", "JSON Files (*.json)"
@@ -924,12 +1424,24 @@ class StatusUpdaterGUI(QMainWindow):
             if file_path:
                 self.author_status_path = file_path
                 self.author_path_label.setText(file_path)
-                self.load_json_data()
+                self.author_status_data = None
+                self.status_data_changed("author")
+                # Loaded now if its tab is in use, otherwise once the tab is first selected
+                if self.tabs["author"] not in self.tab_setups:
+                    self.load_status_data("author")
 
 def main():
+    timer = StartupTimer(STARTED_AT)
+    timer.mark("imports")
+    # Quiet by default; set STATUS_UPDATER_LOG_LEVEL=INFO for job timings or DEBUG for every report
+    logging.basicConfig(level=os.environ.get("STATUS_UPDATER_LOG_LEVEL", "WARNING").upper(),
+                        format="%(levelname)s: %(message)s")
     app = QApplication(sys.argv)
     window = StatusUpdaterGUI()
     window.show()
+    timer.mark("window")
+    # Runs on the first turn of the event loop, once the window has been painted
+    QTimer.singleShot(0, lambda: window.finish_startup(timer))
     sys.exit(app.exec())
 
 if __name__ == "__main__":